@@ -0,0 +1,326 @@
+"""Per-frame cost attribution for StatsProbe logs.
+
+StatsProbe rows carry one service sample each and no timestamp, so rows are
+grouped into frames by the frame service (``sandbox`` by default): a frame is
+one frame-service row plus every row up to the next one. Each frame's cost is
+split into services and, where StatsProbe records them, sub-phases
+(``eco_*_ms`` for the economy, ``stage_rebuild_ms`` for the environment); the
+unattributed remainder of a service becomes its ``other`` phase.
+
+Outputs an icicle view (self-contained HTML with inline SVG) comparing the
+mean frame with the mean p95+ frame against the frame budget, and a JSON table
+of the largest contributors in those spike frames.
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+from scripts.statsprobe_ingest import (
+    ProbeColumns,
+    default_cache_root,
+    gather_csvs,
+    load_tables,
+    rank_index,
+    require_numpy,
+)
+from scripts.telemetry_replay_demo import ARTIFACT_DIR
+
+FRAME_SERVICE = "sandbox"
+FRAME_BUDGET_MS = 16.0
+SPIKE_QUANTILE = 0.95
+SUBPHASES = {
+    "economy": ("eco_in_ms", "eco_apply_ms", "eco_ship_ms", "eco_research_ms", "eco_statbus_ms", "eco_ui_ms"),
+    "environment": ("stage_rebuild_ms",),
+}
+OTHER_PHASE = "other"
+SERVICE_COLORS = {
+    "sandbox": "#4e77d4",
+    "sandbox_render": "#8a6fd1",
+    "economy": "#d49a4e",
+    "environment": "#4ea88a",
+    "automation": "#c45d7a",
+    "power": "#a3a94e",
+}
+FALLBACK_COLOR = "#8c96a8"
+ICICLE_WIDTH = 960
+ICICLE_ROW = 28
+
+
+class FrameCosts:
+    """Per-frame cost columns: ``services[name]`` and ``phases[(service, phase)]`` (ms)."""
+
+    def __init__(self, services: Dict[str, "np.ndarray"], phases: Dict[Tuple[str, str], "np.ndarray"]) -> None:
+        self.services = services
+        self.phases = phases
+        self.total = sum(services.values()) if services else np.zeros(0)
+
+    @property
+    def frames(self) -> int:
+        return len(self.total)
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["FrameCosts"]) -> "FrameCosts":
+        services = sorted({name for part in parts for name in part.services})
+        phases = sorted({key for part in parts for key in part.phases})
+
+        def column(part: "FrameCosts", table: dict, key) -> "np.ndarray":
+            return table.get(key, np.zeros(part.frames))
+
+        return cls(
+            {name: np.concatenate([column(part, part.services, name) for part in parts]) for name in services},
+            {key: np.concatenate([column(part, part.phases, key) for part in parts]) for key in phases},
+        )
+
+
+def frame_costs(table: ProbeColumns, frame_service: str = FRAME_SERVICE) -> Optional[FrameCosts]:
+    """Sum each service's ``tick_ms`` (and sub-phases) per frame of one cached CSV."""
+    labels = table.labels("service")
+    if frame_service not in labels or table.rows == 0:
+        return None
+    codes = np.asarray(table.column("service"))
+    frame_of_row = np.cumsum(codes == labels.index(frame_service)) - 1
+    # Rows logged before the first frame-service sample have no frame.
+    keep = frame_of_row >= 0
+    frame_of_row = frame_of_row[keep]
+    codes = codes[keep]
+    frames = int(frame_of_row[-1]) + 1
+    tick_ms = np.asarray(table.column("tick_ms"))[keep]
+    services: Dict[str, "np.ndarray"] = {}
+    phases: Dict[Tuple[str, str], "np.ndarray"] = {}
+    for code, service in enumerate(labels):
+        rows = codes == code
+        if not rows.any():
+            continue
+        service_frames = frame_of_row[rows]
+        total = np.bincount(service_frames, weights=tick_ms[rows], minlength=frames)
+        services[service] = total
+        columns = [name for name in SUBPHASES.get(service, ()) if name in table]
+        if not columns:
+            continue
+        attributed = np.zeros(frames)
+        for name in columns:
+            values = np.bincount(service_frames, weights=np.asarray(table.column(name))[keep][rows], minlength=frames)
+            phases[(service, name)] = values
+            attributed += values
+        phases[(service, OTHER_PHASE)] = np.maximum(total - attributed, 0.0)
+    return FrameCosts(services, phases)
+
+
+def _node(name: str, frames: "np.ndarray", spike: "np.ndarray", spike_total: float, budget: float) -> Dict:
+    mean = float(frames.mean()) if len(frames) else 0.0
+    spike_mean = float(frames[spike].mean()) if spike.any() else 0.0
+    return {
+        "node": name,
+        "mean_ms": mean,
+        "spike_mean_ms": spike_mean,
+        "spike_delta_ms": spike_mean - mean,
+        "spike_share": spike_mean / spike_total if spike_total else 0.0,
+        "budget_share": spike_mean / budget if budget else 0.0,
+    }
+
+
+def build_breakdown(costs: FrameCosts, budget_ms: float = FRAME_BUDGET_MS, quantile: float = SPIKE_QUANTILE) -> Dict:
+    """Mean and spike-frame attribution tree plus a flat contributor table."""
+    if costs.frames == 0:
+        raise ValueError("No frames to attribute.")
+    ordered = np.partition(costs.total, rank_index(costs.frames, quantile))
+    threshold = float(ordered[rank_index(costs.frames, quantile)])
+    spike = costs.total >= threshold
+    spike_total = float(costs.total[spike].mean())
+    tree = _node("frame", costs.total, spike, spike_total, budget_ms)
+    tree["children"] = []
+    contributors: List[Dict] = []
+    for service in sorted(costs.services, key=lambda name: -float(costs.services[name][spike].mean())):
+        node = _node(service, costs.services[service], spike, spike_total, budget_ms)
+        children = [
+            _node(phase, values, spike, spike_total, budget_ms)
+            for (owner, phase), values in costs.phases.items()
+            if owner == service
+        ]
+        children.sort(key=lambda child: -child["spike_mean_ms"])
+        node["children"] = children
+        tree["children"].append(node)
+        for leaf in children or [node]:
+            entry = dict(leaf)
+            entry.pop("children", None)
+            entry["service"] = service
+            entry["phase"] = leaf["node"] if children else None
+            entry["node"] = f"{service}/{leaf['node']}" if children else service
+            contributors.append(entry)
+    contributors.sort(key=lambda entry: -entry["spike_mean_ms"])
+    return {
+        "frames": costs.frames,
+        "budget_ms": budget_ms,
+        "spike_quantile": quantile,
+        "spike_threshold_ms": threshold,
+        "spike_frames": int(spike.sum()),
+        "frames_over_budget": int((costs.total > budget_ms).sum()),
+        "tree": tree,
+        "contributors": contributors,
+    }
+
+
+def _icicle_svg(tree: Dict, value_key: str, budget_ms: float, scale_ms: float) -> str:
+    px_per_ms = ICICLE_WIDTH / scale_ms
+    height = ICICLE_ROW * 3
+    parts = [
+        f'<svg width="{ICICLE_WIDTH}" height="{height + 14}" viewBox="0 0 {ICICLE_WIDTH} {height + 14}" '
+        f'role="img" aria-label="{value_key} icicle">'
+    ]
+
+    def rect(x: float, depth: int, width: float, label: str, color: str, value: float, total: float) -> None:
+        if width < 0.5:
+            return
+        share = value / total if total else 0.0
+        title = html.escape(f"{label}: {value:.3f} ms ({share * 100.0:.1f}% of frame)")
+        y = depth * ICICLE_ROW
+        parts.append(
+            f'<g><title>{title}</title><rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{ICICLE_ROW - 2}" '
+            f'fill="{color}" fill-opacity="{1.0 - 0.22 * depth:.2f}"/>'
+        )
+        if width > 56:
+            text = html.escape(label.replace("_ms", ""))
+            parts.append(f'<text x="{x + 4:.1f}" y="{y + 17}">{text} {value:.2f}</text>')
+        parts.append("</g>")
+
+    total = tree[value_key]
+    rect(0.0, 0, total * px_per_ms, "frame", FALLBACK_COLOR, total, total)
+    x = 0.0
+    for service in tree["children"]:
+        color = SERVICE_COLORS.get(service["node"], FALLBACK_COLOR)
+        width = service[value_key] * px_per_ms
+        rect(x, 1, width, service["node"], color, service[value_key], total)
+        child_x = x
+        for phase in service["children"]:
+            child_width = phase[value_key] * px_per_ms
+            rect(child_x, 2, child_width, phase["node"], color, phase[value_key], total)
+            child_x += child_width
+        x += width
+    budget_x = budget_ms * px_per_ms
+    parts.append(
+        f'<line class="budget" x1="{budget_x:.1f}" y1="0" x2="{budget_x:.1f}" y2="{height}"/>'
+        f'<text class="budget" x="{min(budget_x, ICICLE_WIDTH - 90):.1f}" y="{height + 12}">'
+        f"budget {budget_ms:g} ms</text>"
+    )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def render_breakdown_html(report: Dict, sources: Sequence[str]) -> str:
+    tree = report["tree"]
+    budget = report["budget_ms"]
+    # Shared scale so the two icicles compare directly; the budget line always fits.
+    scale_ms = max(tree["spike_mean_ms"], tree["mean_ms"], budget) * 1.02
+    rows = "".join(
+        f"<tr><td>{html.escape(entry['node'])}</td><td>{entry['mean_ms']:.3f}</td>"
+        f"<td>{entry['spike_mean_ms']:.3f}</td><td>{entry['spike_delta_ms']:+.3f}</td>"
+        f"<td>{entry['spike_share'] * 100.0:.1f}%</td></tr>"
+        for entry in report["contributors"][:15]
+    )
+    source_list = "".join(f"<li>{html.escape(source)}</li>" for source in sources)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>StatsProbe frame breakdown</title>
+<style>
+	body {{ font-family: "Segoe UI", Roboto, sans-serif; margin: 24px; color: #1f2430; background: #f6f7fb; }}
+	section {{ background: #fff; border-radius: 8px; padding: 16px 20px; margin-bottom: 20px; box-shadow: 0 1px 3px rgba(0,0,0,0.08); }}
+	svg text {{ font-size: 12px; fill: #fff; pointer-events: none; }}
+	svg text.budget {{ fill: #a94442; }}
+	svg line.budget {{ stroke: #a94442; stroke-width: 1.5; stroke-dasharray: 4 3; }}
+	table {{ border-collapse: collapse; }}
+	th, td {{ padding: 4px 10px; border-bottom: 1px solid #e3e6ee; text-align: right; }}
+	th:first-child, td:first-child {{ text-align: left; }}
+	.subtitle {{ color: #5b6375; }}
+</style>
+</head>
+<body>
+<h1>StatsProbe frame breakdown</h1>
+<p class="subtitle">{report['frames']} frames • p{report['spike_quantile'] * 100:.0f} frame {report['spike_threshold_ms']:.2f} ms • {report['frames_over_budget']} frames over the {budget:g} ms budget</p>
+<section>
+	<h2>Mean frame ({tree['mean_ms']:.2f} ms)</h2>
+	{_icicle_svg(tree, "mean_ms", budget, scale_ms)}
+</section>
+<section>
+	<h2>Spike frames, p{report['spike_quantile'] * 100:.0f}+ ({report['spike_frames']} frames, mean {tree['spike_mean_ms']:.2f} ms)</h2>
+	{_icicle_svg(tree, "spike_mean_ms", budget, scale_ms)}
+</section>
+<section>
+	<h2>Top contributors in spike frames</h2>
+	<table><thead><tr><th>Node</th><th>Mean ms</th><th>Spike ms</th><th>Δ ms</th><th>Spike share</th></tr></thead>
+	<tbody>{rows}</tbody></table>
+</section>
+<section>
+	<h2>Sources</h2>
+	<ul>{source_list}</ul>
+</section>
+</body>
+</html>
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Attribute StatsProbe frame cost to services and sub-phases.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="StatsProbe CSV files or directories of tick_*.csv.")
+    parser.add_argument("--cache", type=Path, default=None, help="Column cache directory (see statsprobe_ingest.py).")
+    parser.add_argument(
+        "--frame-service",
+        default=FRAME_SERVICE,
+        help="Service whose samples start a new frame (default: %(default)s).",
+    )
+    parser.add_argument("--budget-ms", type=float, default=FRAME_BUDGET_MS, help="Frame budget (default: %(default)s).")
+    parser.add_argument(
+        "--spike-quantile",
+        type=float,
+        default=SPIKE_QUANTILE,
+        help="Frames at or above this quantile of frame cost count as spikes (default: %(default)s).",
+    )
+    parser.add_argument("--html", type=Path, default=None, help="Icicle view (default: <artifacts>/frame_breakdown.html).")
+    parser.add_argument("--json", type=Path, default=None, help="Contributor table (default: <artifacts>/frame_breakdown.json).")
+    args = parser.parse_args()
+    if not 0.0 < args.spike_quantile < 1.0:
+        parser.error("--spike-quantile must be between 0 and 1.")
+
+    try:
+        require_numpy()
+        csv_paths = gather_csvs(args.inputs)
+    except (RuntimeError, FileNotFoundError) as exc:
+        parser.error(str(exc))
+    tables, _ = load_tables(csv_paths, args.cache or default_cache_root(args.inputs), tool="statsprobe_breakdown")
+    parts = [costs for costs in (frame_costs(table, args.frame_service) for table in tables) if costs is not None]
+    if not parts:
+        parser.error(f"No '{args.frame_service}' rows found; nothing to group into frames.")
+    report = build_breakdown(FrameCosts.concatenate(parts), args.budget_ms, args.spike_quantile)
+    report["frame_service"] = args.frame_service
+    report["sources"] = [str(path) for path in csv_paths]
+
+    html_path = args.html or ARTIFACT_DIR / "frame_breakdown.html"
+    json_path = args.json or ARTIFACT_DIR / "frame_breakdown.json"
+    for path in (html_path, json_path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+    html_path.write_text(render_breakdown_html(report, report["sources"]), encoding="utf-8")
+    with json_path.open("w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote {html_path}, {json_path} ({report['frames']} frames, {report['spike_frames']} spike frames)")
+    for entry in report["contributors"][:5]:
+        print(f"  {entry['node']:<28} {entry['spike_mean_ms']:8.3f} ms in spikes ({entry['spike_delta_ms']:+.3f} vs mean)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
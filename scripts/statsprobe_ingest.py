@@ -0,0 +1,407 @@
+"""Ingest StatsProbe per-tick CSVs into a typed columnar cache.
+
+``StatsProbe.gd`` flushes ``logs/perf/tick_<timestamp>.csv`` files with one row
+per service sample. Parsing those as text (or as dicts) is what makes multi-GB
+soak logs slow, so each CSV is streamed once in fixed-size row chunks and
+stored as one raw little-endian array per column:
+
+* numeric columns become ``float64``, flags and tiers small integers, and
+  GDScript booleans (``true``/``false``) ``uint8``;
+* label columns (``service``, ``event_id``, ...) are dictionary encoded as
+  ``int32`` codes plus a label list in ``meta.json``.
+
+Chunks are tokenised by ``numpy.loadtxt`` with a per-column record dtype, so
+numbers are parsed in C; a chunk it rejects (blank numbers, quoted newlines)
+falls back to the ``csv`` module. A cache directory is reused while the source CSV keeps its size and mtime.
+Queries memory-map the columns, so per-service percentiles only touch the
+``service`` codes and the metric column being summarised.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+CACHE_VERSION = 1
+CACHE_DIR_NAME = ".statsprobe_cache"
+CSV_GLOB = "tick_*.csv"
+CHUNK_ROWS = 1 << 16
+PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+CATEGORY = "category"
+BOOL = "bool"
+# Storage type per StatsProbe column; anything not listed is stored as a category.
+COLUMN_TYPES = {
+    "service": CATEGORY,
+    "tick_ms": "float64",
+    "pps": "float64",
+    "ci": "float64",
+    "active_cells": "float64",
+    "power_ratio": "float64",
+    "ci_delta": "float64",
+    "storage": "float64",
+    "feed_fraction": "float64",
+    "power_state": "float64",
+    "power_warning_level": "float64",
+    "power_warning_label": CATEGORY,
+    "power_warning_count": "float64",
+    "power_warning_duration": "float64",
+    "power_warning_min_ratio": "float64",
+    "auto_active": BOOL,
+    "sandbox_render_view_mode": CATEGORY,
+    "sandbox_render_fallback_active": "uint8",
+    "stage_rebuild_ms": "float64",
+    "stage_rebuild_source": CATEGORY,
+    "eco_in_ms": "float64",
+    "eco_apply_ms": "float64",
+    "eco_ship_ms": "float64",
+    "eco_research_ms": "float64",
+    "eco_statbus_ms": "float64",
+    "eco_ui_ms": "float64",
+    "economy_rate": "float64",
+    "economy_rate_label": CATEGORY,
+    "conveyor_backlog": "float64",
+    "conveyor_backlog_label": CATEGORY,
+    "automation_target": "float64",
+    "automation_target_label": CATEGORY,
+    "automation_panel_visible": "float64",
+    "tier": "int32",
+    "event_id": CATEGORY,
+}
+_TEXT_NUMBERS = {"true": 1.0, "false": 0.0, "": 0.0}
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("StatsProbe ingest requires NumPy. Install via `pip install numpy`.")
+
+
+def rank_index(count: int, q: float) -> int:
+    """Index of quantile ``q`` in ``count`` sorted values (StatsProbe's nearest-rank rule)."""
+    return min(count - 1, int(round(q * (count - 1))))
+
+
+def _parse_number(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        word = text.strip().lower()
+        if word in _TEXT_NUMBERS:
+            return _TEXT_NUMBERS[word]
+        raise
+
+
+def _numeric_column(values: Sequence[str], dtype: str) -> "np.ndarray":
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values.astype(dtype, copy=False)
+    try:
+        array = np.array(values, dtype=np.float64)
+    except ValueError:
+        # Booleans (GDScript writes ``true``/``false``) or blanks: parse each distinct string once.
+        uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        array = np.array([_parse_number(text) for text in uniques.tolist()], dtype=np.float64)[inverse]
+    if dtype == "float64":
+        return array
+    return array.astype(dtype)
+
+
+class _ColumnWriter:
+    """Appends one column's chunks to ``<name>.bin``; categories keep a label table."""
+
+    def __init__(self, directory: Path, name: str, dtype: str) -> None:
+        self.name = name
+        self.kind = dtype
+        self.dtype = {CATEGORY: "int32", BOOL: "uint8"}.get(dtype, dtype)
+        self.labels: Dict[str, int] = {}
+        self.handle = (directory / f"{name}.bin").open("wb")
+
+    def write(self, values: Sequence[str]) -> None:
+        if self.kind == CATEGORY:
+            # Label columns have few distinct values: encode per chunk, then remap to file-wide codes.
+            uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+            labels = self.labels
+            mapping = np.array([labels.setdefault(label, len(labels)) for label in uniques.tolist()], dtype="<i4")
+            self.handle.write(mapping[inverse].tobytes())
+            return
+        array = _numeric_column(values, self.dtype)
+        self.handle.write(array.astype(array.dtype.newbyteorder("<"), copy=False).tobytes())
+
+    def close(self) -> dict:
+        self.handle.close()
+        entry = {"kind": self.kind, "dtype": self.dtype}
+        if self.kind == CATEGORY:
+            entry["labels"] = list(self.labels)
+        return entry
+
+
+def _record_dtype(kinds: Sequence[str]) -> "np.dtype":
+    """``loadtxt`` dtype: numbers parsed natively, labels and booleans kept as text."""
+    return np.dtype(
+        [(f"c{index}", object if kind in (CATEGORY, BOOL) else kind) for index, kind in enumerate(kinds)]
+    )
+
+
+def _parse_chunk(lines: List[str], record: "np.dtype", width: int, first_line: int, source: Path) -> List:
+    """Split CSV lines into per-column arrays (or string tuples on the ``csv`` fallback)."""
+    try:
+        table = np.loadtxt(lines, delimiter=",", quotechar='"', comments=None, dtype=record, ndmin=1)
+        return [table[name] for name in record.names]
+    except ValueError:
+        pass
+    rows = [row for row in csv.reader(lines) if row]
+    for offset, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError(f"{source}: row near line {first_line + offset} has {len(row)} fields, expected {width}")
+    return list(zip(*rows)) if rows else []
+
+
+def _read_chunk(handle) -> List[str]:
+    """Next ``CHUNK_ROWS`` lines, extended until no quoted field is left open.
+
+    ``islice`` counts physical lines, so a record with a quoted newline can
+    straddle the cut; an odd number of ``"`` means the last record is unfinished.
+    """
+    lines = list(islice(handle, CHUNK_ROWS))
+    quotes = sum(map(str.count, lines, repeat('"')))
+    while quotes % 2:
+        line = handle.readline()
+        if not line:
+            break
+        lines.append(line)
+        quotes += line.count('"')
+    return lines
+
+
+def cache_path_for(csv_path: Path, cache_root: Path) -> Path:
+    return cache_root / csv_path.stem
+
+
+def _source_key(csv_path: Path) -> dict:
+    stat = csv_path.stat()
+    return {"source": str(csv_path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_meta(cache_dir: Path) -> Optional[dict]:
+    try:
+        with (cache_dir / "meta.json").open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def ingest_csv(csv_path: Path, cache_root: Path, force: bool = False) -> Tuple[Path, bool]:
+    """Convert ``csv_path`` into a column cache under ``cache_root``; returns (cache dir, rebuilt)."""
+    require_numpy()
+    cache_dir = cache_path_for(csv_path, cache_root)
+    key = _source_key(csv_path)
+    meta = _read_meta(cache_dir)
+    if not force and meta is not None and meta.get("version") == CACHE_VERSION and meta.get("key") == key:
+        return cache_dir, False
+
+    staging = cache_dir.with_name(cache_dir.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    rows = 0
+    with csv_path.open("r", encoding="utf-8", newline="", buffering=1 << 20) as handle:
+        header = next(csv.reader([handle.readline()]), None)
+        if not header:
+            shutil.rmtree(staging)
+            raise ValueError(f"Empty StatsProbe CSV: {csv_path}")
+        kinds = [COLUMN_TYPES.get(name, CATEGORY) for name in header]
+        record = _record_dtype(kinds)
+        writers = [_ColumnWriter(staging, name, kind) for name, kind in zip(header, kinds)]
+        line_number = 2
+        try:
+            while True:
+                lines = _read_chunk(handle)
+                if not lines:
+                    break
+                columns = _parse_chunk(lines, record, len(header), line_number, csv_path)
+                line_number += len(lines)
+                if not columns:
+                    continue
+                for writer, values in zip(writers, columns):
+                    writer.write(values)
+                rows += len(columns[0])
+        finally:
+            columns = {writer.name: writer.close() for writer in writers}
+    meta = {"version": CACHE_VERSION, "key": key, "rows": rows, "columns": columns}
+    with (staging / "meta.json").open("w", encoding="utf-8") as handle:
+        json.dump(meta, handle, indent=2)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(staging, cache_dir)
+    return cache_dir, True
+
+
+class ProbeColumns:
+    """Read-only view over one cached CSV; columns are memory-mapped on first use."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        require_numpy()
+        meta = _read_meta(cache_dir)
+        if meta is None or meta.get("version") != CACHE_VERSION:
+            raise ValueError(f"No StatsProbe column cache at {cache_dir}")
+        self.path = cache_dir
+        self.source = Path(meta["key"]["source"])
+        self.rows: int = meta["rows"]
+        self.columns: Dict[str, dict] = meta["columns"]
+        self._arrays: Dict[str, "np.ndarray"] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def column(self, name: str) -> "np.ndarray":
+        if name not in self._arrays:
+            dtype = np.dtype(self.columns[name]["dtype"]).newbyteorder("<")
+            if self.rows == 0:
+                self._arrays[name] = np.zeros(0, dtype=dtype)
+            else:
+                self._arrays[name] = np.memmap(self.path / f"{name}.bin", dtype=dtype, mode="r", shape=(self.rows,))
+        return self._arrays[name]
+
+    def labels(self, name: str) -> List[str]:
+        return self.columns[name].get("labels", [])
+
+    def mask(self, name: str, label: str) -> "np.ndarray":
+        """Boolean row mask for ``column == label`` on a category column."""
+        labels = self.labels(name)
+        if label not in labels:
+            return np.zeros(self.rows, dtype=bool)
+        return self.column(name) == labels.index(label)
+
+
+def gather_csvs(inputs: Iterable[Path]) -> List[Path]:
+    paths: List[Path] = []
+    for entry in inputs:
+        if entry.is_dir():
+            paths.extend(sorted(entry.glob(CSV_GLOB)))
+        elif entry.exists():
+            paths.append(entry)
+        else:
+            raise FileNotFoundError(f"StatsProbe input not found: {entry}")
+    return paths
+
+
+def default_cache_root(inputs: Sequence[Path]) -> Path:
+    first = inputs[0]
+    return (first if first.is_dir() else first.parent) / CACHE_DIR_NAME
+
+
+def load_tables(
+    csv_paths: Sequence[Path], cache_root: Path, force: bool = False, tool: str = "statsprobe_ingest"
+) -> Tuple[List[ProbeColumns], int]:
+    """Ingest (or reuse) every CSV's cache; unreadable files are reported and skipped."""
+    tables: List[ProbeColumns] = []
+    rebuilt = 0
+    for csv_path in csv_paths:
+        try:
+            cache_dir, fresh = ingest_csv(csv_path, cache_root, force=force)
+        except (OSError, ValueError, csv.Error) as exc:
+            print(f"[{tool}] Skipping {csv_path}: {exc}", file=sys.stderr)
+            continue
+        rebuilt += fresh
+        tables.append(ProbeColumns(cache_dir))
+    return tables, rebuilt
+
+
+def describe(values: "np.ndarray") -> Dict[str, float]:
+    """Count/avg/max and nearest-rank percentiles via partial sorts (no full sort)."""
+    count = len(values)
+    if count == 0:
+        return {"count": 0}
+    ranks = sorted({rank_index(count, q) for _, q in PERCENTILES})
+    selected = np.partition(values, ranks)
+    stats = {"count": count, "avg": float(values.mean())}
+    for label, q in PERCENTILES:
+        stats[label] = float(selected[rank_index(count, q)])
+    stats["max"] = float(values.max())
+    return stats
+
+
+def service_percentiles(tables: Sequence[ProbeColumns], metrics: Sequence[str] = ("tick_ms",)) -> Dict[str, Dict]:
+    """Per-service stats of each metric column across all cached files."""
+    services = sorted({label for table in tables for label in table.labels("service")})
+    result: Dict[str, Dict] = {}
+    for service in services:
+        per_metric: Dict[str, Dict[str, float]] = {}
+        for metric in metrics:
+            parts = [table.column(metric)[table.mask("service", service)] for table in tables if metric in table]
+            values = np.concatenate(parts) if parts else np.zeros(0)
+            per_metric[metric] = describe(values)
+        result[service] = per_metric
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cache StatsProbe tick CSVs as typed columns and report percentiles.")
+    parser.add_argument("inputs", nargs="+", type=Path, help=f"CSV files or directories containing {CSV_GLOB}.")
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help=f"Column cache directory (default: {CACHE_DIR_NAME} next to the first input).",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild caches even when the CSV is unchanged.")
+    parser.add_argument(
+        "--metrics",
+        default="tick_ms",
+        help="Comma-separated numeric columns to summarise per service (default: %(default)s).",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write the per-service report as JSON.")
+    args = parser.parse_args()
+
+    try:
+        require_numpy()
+        csv_paths = gather_csvs(args.inputs)
+    except (RuntimeError, FileNotFoundError) as exc:
+        parser.error(str(exc))
+    if not csv_paths:
+        parser.error("No StatsProbe CSV files found.")
+    metrics = [name.strip() for name in args.metrics.split(",") if name.strip()]
+    cache_root = args.cache or default_cache_root(args.inputs)
+    tables, rebuilt = load_tables(csv_paths, cache_root, force=args.force)
+    for metric in metrics:
+        if not any(metric in table for table in tables):
+            parser.error(f"Unknown column: {metric}")
+        if any(metric in table and table.columns[metric]["kind"] == CATEGORY for table in tables):
+            parser.error(f"Column {metric} holds labels, not numbers.")
+    report = {
+        "files": len(tables),
+        "rows": sum(table.rows for table in tables),
+        "services": service_percentiles(tables, metrics),
+    }
+    print(
+        f"[statsprobe_ingest] {len(tables)} file(s), {report['rows']} rows "
+        f"({rebuilt} converted, {len(tables) - rebuilt} cached) in {cache_root}"
+    )
+    header = f"{'Service':<14} {'Metric':<16} {'Count':>10} {'Avg':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'Max':>9}"
+    print(header)
+    print("-" * len(header))
+    for service, per_metric in report["services"].items():
+        for metric, stats in per_metric.items():
+            if not stats["count"]:
+                continue
+            print(
+                f"{service:<14} {metric:<16} {stats['count']:>10} {stats['avg']:>9.3f} {stats['p50']:>9.3f} "
+                f"{stats['p95']:>9.3f} {stats['p99']:>9.3f} {stats['max']:>9.3f}"
+            )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,317 @@
+"""Windowed tail-latency spike detection for StatsProbe logs and replay summaries.
+
+A rule such as ``sandbox_render:p95:18:5`` fires while the p95 of the last 5 s
+of ``sandbox_render`` samples is above 18 ms. For a window of ``w`` samples the
+p95 is the sorted value at ``r = rank_index(w, 0.95)``, so it exceeds the
+threshold exactly when at least ``w - r`` samples in the window do. That turns
+the sliding quantile into a sliding count: one cumulative sum per chunk, O(n)
+overall, with only the last ``w - 1`` samples carried between chunks.
+
+Consecutive breaching windows merge into an episode (start/end tick, peak,
+worst windowed quantile). Episodes are then annotated with the StatsProbe rows
+they span: peak ``active_cells``, highest ``power_warning_level`` and the
+``event_id`` values seen.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+from scripts.statsprobe_ingest import (
+    ProbeColumns,
+    default_cache_root,
+    gather_csvs,
+    load_tables,
+    rank_index,
+    require_numpy,
+)
+
+# StatsProbe samples each service at 10 Hz; replay summary samples carry their own ``time``.
+SAMPLE_HZ = 10.0
+CHUNK_ROWS = 1 << 20
+# Breaching windows whose quantile is evaluated at once (bounds the sliding-window copy).
+QUANTILE_BATCH = 4096
+DEFAULT_RULES = (
+    "sandbox_render:p95:18:5",  # StatsProbe renderer budget: frame p95 > 18 ms sustained for >= 5 s
+    "sandbox:p99:16:1",  # frame budget blown by the sim tick alone
+    "economy:p95:10:5",  # economy tick budget (gen_dashboard hard alert)
+)
+CORRELATED_NUMERIC = ("active_cells", "power_warning_level", "power_ratio")
+CORRELATED_LABELS = ("event_id",)
+
+
+@dataclass(frozen=True)
+class Rule:
+    series: str
+    quantile: float
+    threshold: float
+    window_s: float
+    sustain_s: float = 0.0
+
+    @property
+    def name(self) -> str:
+        label = f"{self.series}:p{self.quantile * 100:g}>{self.threshold:g}@{self.window_s:g}s"
+        return label + (f" for {self.sustain_s:g}s" if self.sustain_s else "")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Rule":
+        """``SERIES:pQQ:THRESHOLD:WINDOW_S[:SUSTAIN_S]``, e.g. ``sandbox_render:p95:18:5``."""
+        parts = spec.split(":")
+        if len(parts) not in (4, 5) or not parts[1].startswith("p"):
+            raise ValueError(f"Bad rule {spec!r}; expected SERIES:pQQ:THRESHOLD:WINDOW_S[:SUSTAIN_S]")
+        quantile = float(parts[1][1:]) / 100.0
+        if not 0.0 < quantile < 1.0:
+            raise ValueError(f"Bad quantile in rule {spec!r}")
+        rule = cls(parts[0], quantile, float(parts[2]), float(parts[3]), float(parts[4]) if len(parts) == 5 else 0.0)
+        if rule.window_s <= 0.0:
+            raise ValueError(f"Window must be positive in rule {spec!r}")
+        return rule
+
+
+class WindowDetector:
+    """Streams one series through a rule; memory is O(window) regardless of length."""
+
+    def __init__(self, rule: Rule, sample_hz: float) -> None:
+        self.rule = rule
+        self.window = max(1, int(round(rule.window_s * sample_hz)))
+        self.sustain = int(round(rule.sustain_s * sample_hz))
+        rank = rank_index(self.window, rule.quantile)
+        # Window quantile > threshold  <=>  at least this many samples in the window are above it.
+        self.needed = self.window - rank
+        self.rank = rank
+        self.seen = 0
+        self.tail_values = np.zeros(0)
+        self.tail_rows = np.zeros(0, dtype=np.int64)
+        self.open: Optional[Dict] = None
+        self.closed: List[Dict] = []
+
+    def feed(self, values: "np.ndarray", rows: "np.ndarray") -> None:
+        if not len(values):
+            return
+        carried = len(self.tail_values)
+        buf = np.concatenate([self.tail_values, values])
+        buf_rows = np.concatenate([self.tail_rows, rows])
+        base = self.seen - carried  # global sample index of buf[0]
+        above = np.concatenate([[0], np.cumsum(buf > self.rule.threshold)])
+        # Window ends for the new samples that have a full window behind them.
+        first_end = max(carried, self.window - 1)
+        ends = np.arange(first_end, len(buf))
+        breach = np.zeros(0, dtype=bool)
+        if len(ends):
+            breach = (above[ends + 1] - above[ends + 1 - self.window]) >= self.needed
+        self._collect(buf, buf_rows, base, ends, breach)
+        self.seen += len(values)
+        keep = min(self.window - 1, len(buf))
+        self.tail_values = buf[len(buf) - keep:].copy()
+        self.tail_rows = buf_rows[len(buf) - keep:].copy()
+
+    def _collect(self, buf, buf_rows, base: int, ends: "np.ndarray", breach: "np.ndarray") -> None:
+        if not len(ends):
+            return
+        edges = np.flatnonzero(np.diff(np.concatenate([[False], breach, [False]]).astype(np.int8)))
+        starts, stops = edges[0::2], edges[1::2]  # breach runs as [start, stop) into ``ends``
+        if self.open is not None and (not len(starts) or starts[0] != 0):
+            self._close()
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            first_end, last_end = int(ends[start]), int(ends[stop - 1])
+            low = max(first_end - self.window + 1, 0)
+            span = buf[low:last_end + 1]
+            peak_offset = int(np.argmax(span))
+            worst = self._worst_quantile(buf, ends[start:stop])
+            if self.open is None or start != 0:
+                self._close()
+                self.open = {
+                    "start_tick": base + low,
+                    "peak": -np.inf,
+                    "first_row": int(buf_rows[low]),
+                    "window_quantile_max": -np.inf,
+                }
+            episode = self.open
+            episode["end_tick"] = base + last_end
+            episode["last_row"] = int(buf_rows[last_end])
+            if float(span[peak_offset]) > episode["peak"]:
+                episode["peak"] = float(span[peak_offset])
+                episode["peak_tick"] = base + low + peak_offset
+            episode["window_quantile_max"] = max(episode["window_quantile_max"], worst)
+            if stop != len(ends):
+                self._close()
+
+    def _worst_quantile(self, buf: "np.ndarray", ends: "np.ndarray") -> float:
+        view = np.lib.stride_tricks.sliding_window_view(buf, self.window)
+        worst = -np.inf
+        for begin in range(0, len(ends), QUANTILE_BATCH):
+            windows = view[ends[begin:begin + QUANTILE_BATCH] - self.window + 1]
+            worst = max(worst, float(np.partition(windows, self.rank, axis=1)[:, self.rank].max()))
+        return worst
+
+    def _close(self) -> None:
+        episode, self.open = self.open, None
+        if episode is None:
+            return
+        if episode["end_tick"] - episode["start_tick"] + 1 >= self.sustain:
+            self.closed.append(episode)
+
+    def finish(self) -> List[Dict]:
+        self._close()
+        return self.closed
+
+
+def _probe_chunks(table: ProbeColumns, service: str) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    labels = table.labels("service")
+    if service not in labels:
+        return
+    code = labels.index(service)
+    codes = table.column("service")
+    tick_ms = table.column("tick_ms")
+    for start in range(0, table.rows, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, table.rows)
+        rows = np.flatnonzero(np.asarray(codes[start:stop]) == code)
+        yield np.asarray(tick_ms[start:stop])[rows], rows + start
+
+
+def _probe_correlates(table: ProbeColumns, episode: Dict) -> Dict[str, object]:
+    span = slice(episode["first_row"], episode["last_row"] + 1)
+    correlated: Dict[str, object] = {}
+    for name in CORRELATED_NUMERIC:
+        if name in table:
+            correlated[f"{name}_max"] = float(np.max(table.column(name)[span]))
+    for name in CORRELATED_LABELS:
+        if name in table:
+            labels = table.labels(name)
+            seen = sorted({labels[code] for code in np.unique(table.column(name)[span]).tolist()} - {""})
+            correlated[name] = seen
+    return correlated
+
+
+def detect_probe(table: ProbeColumns, rules: Sequence[Rule], sample_hz: float = SAMPLE_HZ) -> List[Dict]:
+    """Episodes for every rule over one cached StatsProbe CSV (rows in file order)."""
+    episodes: List[Dict] = []
+    for rule in rules:
+        detector = WindowDetector(rule, sample_hz)
+        for values, rows in _probe_chunks(table, rule.series):
+            detector.feed(values, rows)
+        for episode in detector.finish():
+            episode.update(
+                rule=rule.name,
+                series=rule.series,
+                start_s=episode["start_tick"] / sample_hz,
+                end_s=(episode["end_tick"] + 1) / sample_hz,
+                correlated=_probe_correlates(table, episode),
+            )
+            episodes.append(episode)
+    return episodes
+
+
+def detect_summary(path: Path, rules: Sequence[Rule]) -> List[Dict]:
+    """Episodes over a replay summary's ``samples`` (rule series = sample field, rate from ``time``)."""
+    with path.open("r", encoding="utf-8") as handle:
+        samples = json.load(handle).get("samples") or []
+    times = np.array([float(sample.get("time", index)) for index, sample in enumerate(samples)])
+    sample_hz = 1.0 / float(np.median(np.diff(times))) if len(times) > 1 else 1.0
+    episodes: List[Dict] = []
+    for rule in rules:
+        values = np.array([float(sample.get(rule.series, np.nan)) for sample in samples])
+        if not len(values) or np.isnan(values).all():
+            continue
+        detector = WindowDetector(rule, sample_hz)
+        detector.feed(values, np.arange(len(values)))
+        for episode in detector.finish():
+            span = samples[episode["first_row"]:episode["last_row"] + 1]
+            correlated = {
+                f"{name}_max": max(float(sample[name]) for sample in span)
+                for name in CORRELATED_NUMERIC
+                if all(name in sample for sample in span)
+            }
+            episode.update(
+                rule=rule.name,
+                series=rule.series,
+                start_s=float(times[episode["start_tick"]]),
+                end_s=float(times[episode["end_tick"]]),
+                correlated=correlated,
+            )
+            episodes.append(episode)
+    return episodes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Detect sustained tail-latency spikes in StatsProbe logs.")
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="StatsProbe CSVs / directories of tick_*.csv, or replay summary .json files.",
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        default=None,
+        help="SERIES:pQQ:THRESHOLD:WINDOW_S[:SUSTAIN_S] (repeatable; default: %s)." % ", ".join(DEFAULT_RULES),
+    )
+    parser.add_argument(
+        "--sample-hz",
+        type=float,
+        default=SAMPLE_HZ,
+        help="Per-service StatsProbe sample rate (default: %(default)s).",
+    )
+    parser.add_argument("--cache", type=Path, default=None, help="Column cache directory (see statsprobe_ingest.py).")
+    parser.add_argument("--output", type=Path, default=None, help="Write episodes as JSON.")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when any episode is found.")
+    args = parser.parse_args()
+
+    try:
+        require_numpy()
+        rules = [Rule.parse(spec) for spec in (args.rule or DEFAULT_RULES)]
+    except (RuntimeError, ValueError) as exc:
+        parser.error(str(exc))
+    summaries = [path for path in args.inputs if path.suffix == ".json"]
+    probe_inputs = [path for path in args.inputs if path.suffix != ".json"]
+
+    results: List[Dict] = []
+    if probe_inputs:
+        try:
+            csv_paths = gather_csvs(probe_inputs)
+        except FileNotFoundError as exc:
+            parser.error(str(exc))
+        tables, _ = load_tables(csv_paths, args.cache or default_cache_root(probe_inputs), tool="statsprobe_spikes")
+        for table in tables:
+            for episode in detect_probe(table, rules, args.sample_hz):
+                episode["source"] = str(table.source)
+                results.append(episode)
+    for path in summaries:
+        for episode in detect_summary(path, rules):
+            episode["source"] = str(path)
+            results.append(episode)
+
+    for episode in results:
+        correlated = ", ".join(
+            f"{key}={value if not isinstance(value, float) else round(value, 3)}"
+            for key, value in episode["correlated"].items()
+        )
+        print(
+            f"{episode['rule']:<36} {Path(episode['source']).name}: ticks {episode['start_tick']}-{episode['end_tick']} "
+            f"({episode['start_s']:.1f}-{episode['end_s']:.1f}s) peak {episode['peak']:.2f} "
+            f"window max {episode['window_quantile_max']:.2f} [{correlated}]"
+        )
+    print(f"[statsprobe_spikes] {len(results)} episode(s) across {len(rules)} rule(s)")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open("w", encoding="utf-8") as handle:
+            json.dump({"rules": [rule.name for rule in rules], "episodes": results}, handle, indent=2)
+    return 1 if args.strict and results else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
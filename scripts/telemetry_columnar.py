@@ -0,0 +1,467 @@
+"""NumPy-backed columnar engine for the telemetry replay demo.
+
+The scalar loop in ``telemetry_replay_demo.generate_demo_summary`` stays the
+reference implementation. This engine produces the same ``summary`` bit for bit
+while working on typed arrays in fixed-size batches:
+
+* the LCG stream is generated by jump-ahead multiplication (``s * a^k mod m``);
+* clamped state recurrences (rate, storage, ci, ...) are replayed with
+  sequential ``accumulate`` calls, predicting clamp positions in bulk;
+* averages replay the float semantics of the builtin ``sum()``;
+* every per-service tick cost is a monotonic function of ``abs(noise)``, so all
+  p95 values come from a single order statistic instead of one sort per series.
+
+With ``stats_mode="stream"`` that order statistic comes from a DDSketch over
+``abs(noise)`` instead of the full column (see ``telemetry_stats``). The costs
+are ``c + k * a`` with ``c, k >= 0``, so the sketch's relative error bound
+carries over to every p95 unchanged.
+"""
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+from scripts.telemetry_downsample import DEFAULT_MODE, DEFAULT_TARGET, MinMaxDownsampler, make_downsampler
+from scripts.telemetry_replay_demo import CHART_COLUMNS, DemoResult, _build_stats, _build_summary, _lcg
+from scripts.telemetry_stats import _COMPENSATED_SUM, DEFAULT_RELATIVE_ACCURACY, DDSketch, StatsCheckError, p95_rank
+
+MODULUS = 0x7FFFFFFF
+MULTIPLIER = 48271
+BATCH_TICKS = 1 << 16
+
+# Per-service tick costs as functions of abs(noise); shared by the batch loop
+# (arrays) and the p95 lookup (the order statistic as a plain float).
+TICK_COSTS: Dict[str, Callable] = {
+    "sandbox_tick": lambda a: 4.0 + a * 2.2,
+    "economy_tick": lambda a: 3.0 + a * 1.8,
+    "environment_tick": lambda a: 1.4 + a * 1.1,
+    "automation_tick": lambda a: 1.2 + a,
+    "power_tick": lambda a: 0.8 + a * 0.9,
+    "render_tick": lambda a: 2.2 + a * 1.4,
+    "eco_in": lambda a: (3.0 + a * 1.8) * 0.25,
+    "eco_apply": lambda a: (3.0 + a * 1.8) * 0.2,
+    "eco_ship": lambda a: (3.0 + a * 1.8) * 0.18,
+    "eco_research": lambda a: (3.0 + a * 1.8) * 0.16,
+    "eco_statbus": lambda a: (3.0 + a * 1.8) * 0.14,
+    "eco_ui": lambda a: (3.0 + a * 1.8) * 0.12,
+}
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("The numpy engine requires NumPy. Install via `pip install numpy`.")
+
+
+def _lcg_powers(count: int) -> "np.ndarray":
+    """Return ``MULTIPLIER ** k % MODULUS`` for ``k = 1..count``."""
+    powers = np.empty(count, dtype=np.int64)
+    powers[0] = MULTIPLIER
+    filled = 1
+    while filled < count:
+        step = min(filled, count - filled)
+        powers[filled:filled + step] = (powers[:step] * int(powers[filled - 1])) % MODULUS
+        filled += step
+    return powers
+
+
+def lcg_prestate(seed: int) -> int:
+    """Return the state whose jump-ahead stream matches ``_lcg`` from ``seed``.
+
+    The first scalar step folds out-of-range seeds (zero, negative, >= modulus)
+    into ``[1, MODULUS)``; stepping back once keeps every batch a pure product.
+    """
+    state = seed if seed > 0 else seed + MODULUS
+    return (_lcg(state) * pow(MULTIPLIER, -1, MODULUS)) % MODULUS
+
+
+class SumState:
+    """Replays the builtin ``sum()`` over float batches bit for bit."""
+
+    __slots__ = ("total", "compensation")
+
+    def __init__(self, total: float = 0.0, compensation: float = 0.0) -> None:
+        self.total = total
+        self.compensation = compensation
+
+    def feed(self, values: "np.ndarray") -> None:
+        if not len(values):
+            return
+        partial = np.add.accumulate(np.concatenate(([self.total], values)))
+        if _COMPENSATED_SUM:
+            prev = partial[:-1]
+            nxt = partial[1:]
+            terms = np.where(np.abs(prev) >= np.abs(values), (prev - nxt) + values, (values - nxt) + prev)
+            self.compensation = float(np.add.accumulate(np.concatenate(([self.compensation], terms)))[-1])
+        self.total = float(partial[-1])
+
+    def result(self) -> float:
+        total = self.total
+        if _COMPENSATED_SUM and self.compensation and math.isfinite(self.compensation):
+            total += self.compensation
+        return total
+
+
+class ClampedWalk:
+    """Batch replay of ``x = clamp(x OP operand [+ consts...], lo, hi)``.
+
+    Between clamp events the recurrence is a plain sequential accumulate, which
+    NumPy evaluates in the same order as the scalar loop. Saturating walks clamp
+    every few ticks, so clamp positions are first predicted in bulk with the
+    Lindley recursion (a one-sided reflected walk clamps exactly where its
+    prefix sum reaches a new running minimum) and then confirmed by replaying
+    every predicted segment exactly. Any segment the prediction gets wrong is
+    redone with a plain accumulate from the last confirmed clamp.
+    """
+
+    def __init__(
+        self,
+        lo: Optional[float] = None,
+        hi: Optional[float] = None,
+        consts: Tuple[float, ...] = (),
+        multiply: bool = False,
+        window: int = BATCH_TICKS,
+    ) -> None:
+        if multiply and consts:
+            raise ValueError("Multiplicative walks do not support trailing constants.")
+        self.lo = lo
+        self.hi = hi
+        self.consts = consts
+        self.multiply = multiply
+        self.window = window
+        self.targets = [bound for bound in (lo, hi) if bound is not None]
+
+    def _accumulate(self, start: float, operands: "np.ndarray") -> "np.ndarray":
+        """Sequential replay along the last axis, one row per start value."""
+        operands = np.atleast_2d(operands)
+        rows, width = operands.shape
+        if rows >= 16 * width:
+            # Short rows: step all rows together, column by column.
+            values = np.empty((rows, width))
+            current = np.full(rows, start)
+            for col in range(width):
+                current = current * operands[:, col] if self.multiply else current + operands[:, col]
+                for const in self.consts:
+                    current = current + const
+                values[:, col] = current
+            return values
+        stride = 1 + len(self.consts)
+        merged = np.empty((rows, 1 + width * stride))
+        merged[:, 0] = start
+        merged[:, 1::stride] = operands
+        for offset, const in enumerate(self.consts, start=2):
+            merged[:, offset::stride] = const
+        ufunc = np.multiply if self.multiply else np.add
+        return ufunc.accumulate(merged, axis=1)[:, stride::stride]
+
+    def _violations(self, values: "np.ndarray") -> "np.ndarray":
+        mask = np.zeros(values.shape, dtype=bool)
+        if self.lo is not None:
+            mask |= values <= self.lo
+        if self.hi is not None:
+            mask |= values >= self.hi
+        return mask
+
+    def _target_of(self, value: float) -> int:
+        if self.lo is not None and value <= self.lo:
+            return 0
+        return len(self.targets) - 1
+
+    def _advance(self, value: float, operands: "np.ndarray", pos: int, out: "np.ndarray") -> Tuple[int, Optional[int]]:
+        """Accumulate from ``value`` up to and including the next clamp."""
+        count = len(operands)
+        window = 256
+        while pos < count:
+            end = min(count, pos + window)
+            values = self._accumulate(value, operands[pos:end])[0]
+            bad = self._violations(values)
+            if bad.any():
+                hit = int(bad.argmax())
+                out[pos:pos + hit] = values[:hit]
+                target = self._target_of(float(values[hit]))
+                out[pos + hit] = self.targets[target]
+                return pos + hit + 1, target
+            out[pos:end] = values
+            value = float(values[-1])
+            pos = end
+            window *= 4
+        return pos, None
+
+    def _predict(self, target: int, operands: "np.ndarray") -> Tuple["np.ndarray", bool]:
+        """Clamp positions of the walk restarted at ``targets[target]``, in exact arithmetic.
+
+        Prediction stops where the walk would cross the opposite bound, since the
+        one-sided recursion no longer applies past that point; the flag reports
+        whether that happened.
+        """
+        bound = self.targets[target]
+        sign = 1.0 if self.lo is not None and target == 0 else -1.0
+        if self.multiply:
+            steps = sign * np.log(operands)
+        else:
+            steps = sign * (operands + sum(self.consts))
+        prefix = np.cumsum(steps)
+        floor = np.minimum.accumulate(np.concatenate(([0.0], prefix)))[:-1]
+        clamped = prefix <= floor
+        if len(self.targets) == 2:
+            gap = prefix - np.minimum(floor, prefix)
+            approx = bound * np.exp(sign * gap) if self.multiply else bound + sign * gap
+            crossed = approx >= self.hi if sign > 0 else approx <= self.lo
+            if crossed.any():
+                clamped[int(crossed.argmax()):] = False
+                return np.flatnonzero(clamped), True
+        return np.flatnonzero(clamped), False
+
+    def _confirm(
+        self,
+        target: int,
+        operands: "np.ndarray",
+        starts: "np.ndarray",
+        lengths: "np.ndarray",
+        out: "np.ndarray",
+    ) -> int:
+        """Replay predicted segments exactly; return how many leading ones hold.
+
+        Each segment restarts from ``targets[target]`` and must stay strictly
+        inside the bounds until its last position, which must clamp back to the
+        same target. Rows are bucketed by power-of-two width so the padded 2-D
+        replay never does more than twice the useful work. ``out`` carries one
+        spare slot that absorbs the padding; values written for segments that
+        fail are overwritten by the caller.
+        """
+        bound = self.targets[target]
+        count = len(operands)
+        padded = np.append(operands, 1.0 if self.multiply else 0.0)
+        valid = np.empty(len(starts), dtype=bool)
+        buckets = np.frexp(lengths - 1.0)[1]
+        for bucket in np.flatnonzero(np.bincount(buckets)).tolist():
+            rows = np.flatnonzero(buckets == bucket)
+            cols = np.arange(1 << bucket)
+            last = lengths[rows] - 1
+            index = np.where(cols <= last[:, None], starts[rows, None] + cols, count)
+            values = self._accumulate(bound, padded[index])
+            out[index] = values
+            first = self._violations(values).argmax(axis=1)
+            tail = values[np.arange(len(rows)), last]
+            closes = (tail <= bound) if bound == self.lo else (tail >= bound)
+            valid[rows] = (first == last) & closes
+        failed = np.flatnonzero(~valid)
+        accepted = int(failed[0]) if len(failed) else len(starts)
+        if accepted:
+            out[starts[:accepted] + lengths[:accepted] - 1] = bound
+        return accepted
+
+    def run(self, start: float, operands: "np.ndarray") -> "np.ndarray":
+        count = len(operands)
+        out = np.empty(count + 1)
+        pos, target = self._advance(start, operands, 0, out)
+        span = 4096
+        while pos < count and target is not None:
+            end = min(count, pos + span)
+            clamps, crossed = self._predict(target, operands[pos:end])
+            span = 1024 if crossed else min(self.window, span * 4)
+            if len(clamps):
+                starts = np.concatenate(([0], clamps[:-1] + 1))
+                lengths = clamps + 1 - starts
+                accepted = self._confirm(target, operands[pos:end], starts, lengths, out[pos:end + 1])
+                if accepted:
+                    pos += int(clamps[accepted - 1]) + 1
+                    if accepted == len(clamps) and end < count and pos < end:
+                        continue
+            pos, target = self._advance(self.targets[target], operands, pos, out)
+        return out[:count]
+
+
+class ColumnarSeries:
+    """Aggregate view over the batch accumulators (see ``_ListSeries``)."""
+
+    def __init__(
+        self,
+        ticks: int,
+        sums: Dict[str, SumState],
+        counts: Dict[str, int],
+        abs_noise_max: float,
+        ci_delta_abs_max: float,
+        abs_noise: Optional["np.ndarray"] = None,
+        noise_sketch: Optional[DDSketch] = None,
+    ) -> None:
+        self._ticks = ticks
+        self._sums = sums
+        self._counts = counts
+        self._abs_noise_max = abs_noise_max
+        self._ci_delta_abs_max = ci_delta_abs_max
+        self._abs_noise = abs_noise
+        self._noise_sketch = noise_sketch
+        self._p95_noise: Optional[float] = None
+
+    def avg(self, name: str) -> float:
+        if name in self._counts:
+            return self._counts[name] / self._ticks
+        return self._sums[name].result() / self._ticks
+
+    def _p95_abs_noise(self) -> float:
+        index = p95_rank(self._ticks)
+        exact = None
+        if self._abs_noise is not None:
+            exact = float(np.partition(self._abs_noise, index)[index])
+        if self._noise_sketch is None:
+            return exact
+        estimate = self._noise_sketch.value_at_rank(index)
+        tolerance = self._noise_sketch.relative_accuracy * (1.0 + 1e-9)
+        if exact is not None and abs(estimate - exact) > tolerance * exact:
+            raise StatsCheckError(
+                f"abs(noise) p95: streamed {estimate!r} vs exact {exact!r} (allowed relative error {tolerance})"
+            )
+        return estimate
+
+    def p95(self, name: str) -> float:
+        if self._p95_noise is None:
+            self._p95_noise = self._p95_abs_noise()
+        return float(TICK_COSTS[name](self._p95_noise))
+
+    def peak(self, name: str, absolute: bool = False) -> float:
+        if name == "ci_delta":
+            return self._ci_delta_abs_max
+        return float(TICK_COSTS[name](self._abs_noise_max))
+
+
+def generate_columnar_summary(
+    seed: int,
+    ticks: int,
+    batch_ticks: int = BATCH_TICKS,
+    stats_mode: str = "exact",
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    series_mode: str = DEFAULT_MODE,
+    series_points: int = DEFAULT_TARGET,
+) -> DemoResult:
+    require_numpy()
+    dt = 1.0
+    total = max(ticks, 1)
+    ship_every = max(1, ticks // 5)
+    state = lcg_prestate(seed)
+    powers = _lcg_powers(min(batch_ticks, total))
+
+    rate_walk = ClampedWalk(lo=0.1, multiply=True)
+    wallet_walk = ClampedWalk(lo=0.0)
+    storage_walk = ClampedWalk(lo=0.0, consts=(-1.1,))
+    ci_walk = ClampedWalk(lo=0.0, hi=100.0)
+    bonus_walk = ClampedWalk(lo=0.0, hi=30.0, consts=(0.05,))
+    cells_walk = ClampedWalk(lo=0.0, hi=512.0, consts=(2.0,))
+    power_walk = ClampedWalk(lo=0.5, hi=1.1)
+
+    eggs = 0.0
+    rate = 1.0
+    wallet = 10.0
+    storage = 20.0
+    ci = 50.0
+    ci_bonus = 0.0
+    active_cells = 64.0
+    power_ratio = 1.0
+
+    sums = {name: SumState() for name in (*TICK_COSTS, "ci_delta", "pps", "storage", "feed_fraction", "power_ratio")}
+    counts = {"fallback": 0, "auto_active": 0}
+    ci_delta_abs_max = 0.0
+    abs_noise_max = 0.0
+    noise_sketch = DDSketch(relative_accuracy) if stats_mode != "exact" else None
+    abs_parts: Optional[List["np.ndarray"]] = [] if stats_mode != "stream" else None
+    series_sampler = make_downsampler(series_mode, total, series_points)
+    chart_sampler = MinMaxDownsampler(total, buckets=CHART_COLUMNS)
+    shipments: List[dict] = []
+    samples: List[dict] = []
+
+    for start in range(0, total, batch_ticks):
+        count = min(batch_ticks, total - start)
+        states = (state * powers[:count]) % MODULUS
+        state = int(states[-1])
+        noise = states / float(MODULUS) - 0.5
+        abs_noise = np.abs(noise)
+
+        rates = rate_walk.run(rate, 1.0 + noise * 0.02)
+        egg_values = np.add.accumulate(np.concatenate(([eggs], rates)))[1:]
+        wallets = wallet_walk.run(wallet, rates * 0.55)
+        storages = storage_walk.run(storage, rates * 0.45)
+        ci_delta = noise * 0.8 + 0.15
+        cis = ci_walk.run(ci, ci_delta)
+        bonuses = bonus_walk.run(ci_bonus, ci_delta * 0.35)
+        cells = cells_walk.run(active_cells, noise * 7.0)
+        powers_ratio = power_walk.run(power_ratio, noise * 0.05)
+        feed = rates / 25.0
+        feed = np.where(feed > 0.0, feed, 0.0)
+        feed = np.where(feed < 1.0, feed, 1.0)
+
+        for name, cost in TICK_COSTS.items():
+            sums[name].feed(cost(abs_noise))
+        sums["ci_delta"].feed(ci_delta)
+        sums["pps"].feed(rates)
+        sums["storage"].feed(storages)
+        sums["feed_fraction"].feed(feed)
+        sums["power_ratio"].feed(powers_ratio)
+        counts["fallback"] += int(np.count_nonzero(noise > 0.35))
+        counts["auto_active"] += int(np.count_nonzero(noise > 0.25))
+        ci_delta_abs_max = max(ci_delta_abs_max, float(np.abs(ci_delta).max()))
+        abs_noise_max = max(abs_noise_max, float(abs_noise.max()))
+        if noise_sketch is not None:
+            noise_sketch.extend(abs_noise)
+        if abs_parts is not None:
+            abs_parts.append(abs_noise)
+        series_sampler.extend(start, egg_values)
+        chart_sampler.extend(start, egg_values)
+
+        first = (-start) % ship_every
+        for idx in range(first, count, ship_every):
+            shipments.append({
+                "time": (start + idx) * dt,
+                "amount": float(rates[idx]) * 4.0,
+                "wallet": float(wallets[idx])
+            })
+        picks = np.arange((-start) % 5, count, 5)
+        columns = (cis, bonuses, ci_delta, rates, storages, wallets, cells, powers_ratio)
+        samples.extend(
+            {
+                "time": tick * dt,
+                "ci": ci_value,
+                "ci_bonus": bonus_value,
+                "ci_delta": delta_value,
+                "pps": pps_value,
+                "storage": storage_value,
+                "wallet": wallet_value,
+                "active_cells": cells_value,
+                "power_ratio": power_value
+            }
+            for tick, ci_value, bonus_value, delta_value, pps_value, storage_value, wallet_value, cells_value, power_value
+            in zip((start + picks).tolist(), *(column[picks].tolist() for column in columns))
+        )
+
+        eggs = float(egg_values[-1])
+        rate = float(rates[-1])
+        wallet = float(wallets[-1])
+        storage = float(storages[-1])
+        ci = float(cis[-1])
+        ci_bonus = float(bonuses[-1])
+        active_cells = float(cells[-1])
+        power_ratio = float(powers_ratio[-1])
+
+    series = ColumnarSeries(
+        total,
+        sums,
+        counts,
+        abs_noise_max,
+        ci_delta_abs_max,
+        abs_noise=np.concatenate(abs_parts) if abs_parts is not None else None,
+        noise_sketch=noise_sketch,
+    )
+    stats = _build_stats(series, samples, ci, active_cells)
+    final = {
+        "ci": ci,
+        "ci_bonus": ci_bonus,
+        "pps": rate,
+        "wallet": wallet,
+        "storage": storage
+    }
+    series = [{"tick": tick, "eggs": value} for tick, value in series_sampler.points()]
+    summary = _build_summary(seed, ticks, dt, stats, shipments, samples, final, series)
+    return DemoResult(summary=summary, chart_points=chart_sampler.points())
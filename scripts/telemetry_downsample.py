@@ -0,0 +1,228 @@
+"""Downsamplers for telemetry series and charts.
+
+Each downsampler consumes one run's points in tick order (``append`` per tick
+or ``extend`` per NumPy batch, with ``x`` running from 0 to ``total - 1``) and
+keeps bounded state, so the same code serves full runs, streamed runs and
+checkpoints:
+
+* ``stride`` keeps every k-th point plus the last (the original ``series`` rule);
+* ``minmax`` keeps the first/min/max/last point of each bucket (M4). With one
+  bucket per pixel column, a line chart drawn from it is pixel-identical to
+  one drawn from every point;
+* ``lttb`` runs largest-triangle-three-buckets over a min/max preselection
+  (MinMaxLTTB), which keeps visual peaks in O(target) memory.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+Point = Tuple[int, float]
+
+DOWNSAMPLE_MODES = ("lttb", "minmax", "stride")
+DEFAULT_MODE = "lttb"
+DEFAULT_TARGET = 120
+# Preselection buckets per LTTB output point (each bucket yields up to 4 points).
+LTTB_PRESELECT_RATIO = 2
+
+
+def lttb(points: Sequence[Point], target: int) -> List[Point]:
+    """Largest-triangle-three-buckets (Steinarsson, 2013) down to ``target`` points."""
+    count = len(points)
+    if target >= count:
+        return list(points)
+    if target < 3:
+        return [points[0], points[-1]][:max(target, 1)]
+    every = (count - 2) / (target - 2)
+    sampled = [points[0]]
+    anchor = 0
+    for bucket in range(target - 2):
+        avg_start = int((bucket + 1) * every) + 1
+        avg_end = min(int((bucket + 2) * every) + 1, count)
+        if avg_end <= avg_start:
+            avg_x, avg_y = points[-1]
+        else:
+            span = points[avg_start:avg_end]
+            avg_x = sum(point[0] for point in span) / len(span)
+            avg_y = sum(point[1] for point in span) / len(span)
+        anchor_x, anchor_y = points[anchor]
+        best_area = -1.0
+        best = anchor + 1
+        for index in range(int(bucket * every) + 1, int((bucket + 1) * every) + 1):
+            x, y = points[index]
+            area = abs((anchor_x - avg_x) * (y - anchor_y) - (anchor_x - x) * (avg_y - anchor_y))
+            if area > best_area:
+                best_area = area
+                best = index
+        sampled.append(points[best])
+        anchor = best
+    sampled.append(points[-1])
+    return sampled
+
+
+class StrideDownsampler:
+    """Every ``total // target``-th point plus the last one."""
+
+    mode = "stride"
+
+    def __init__(self, total: int, target: int = DEFAULT_TARGET) -> None:
+        self.total = max(total, 1)
+        self.target = target
+        self.step = max(1, self.total // target)
+        self.kept: List[Point] = []
+
+    def append(self, x: int, y: float) -> None:
+        if x % self.step == 0 or x == self.total - 1:
+            self.kept.append((x, y))
+
+    def extend(self, start: int, values: "np.ndarray") -> None:
+        xs = np.arange(start, start + len(values))
+        mask = (xs % self.step == 0) | (xs == self.total - 1)
+        self.kept.extend(zip(xs[mask].tolist(), values[mask].tolist()))
+
+    def points(self) -> List[Point]:
+        return list(self.kept)
+
+    def to_dict(self) -> dict:
+        return {"mode": self.mode, "total": self.total, "target": self.target, "kept": self.kept}
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "StrideDownsampler":
+        sampler = cls(payload["total"], payload["target"])
+        sampler.kept = [(x, y) for x, y in payload["kept"]]
+        return sampler
+
+
+class MinMaxDownsampler:
+    """First, min, max and last point of each bucket, in tick order (M4).
+
+    Point ``x`` falls in bucket ``round(x / (total - 1) * (buckets - 1))``, the
+    same mapping ``_render_chart`` uses for pixel columns.
+    """
+
+    mode = "minmax"
+
+    def __init__(self, total: int, target: int = DEFAULT_TARGET, buckets: Optional[int] = None) -> None:
+        self.total = max(total, 1)
+        self.target = target
+        self.buckets = buckets if buckets is not None else max(1, target // 4)
+        self._last_x = self.total - 1
+        self.emitted: List[Point] = []
+        self._bucket: Optional[int] = None
+        self._first: Point = (0, 0.0)
+        self._low: Point = (0, 0.0)
+        self._high: Point = (0, 0.0)
+        self._final: Point = (0, 0.0)
+
+    def _bucket_of(self, x: int) -> int:
+        if not self._last_x:
+            return 0
+        return int(round((x / self._last_x) * (self.buckets - 1)))
+
+    def _open_points(self) -> List[Point]:
+        if self._bucket is None:
+            return []
+        kept: Dict[int, float] = {}
+        for x, y in (self._first, self._low, self._high, self._final):
+            kept[x] = y
+        return sorted(kept.items())
+
+    def _flush(self) -> None:
+        self.emitted.extend(self._open_points())
+
+    def append(self, x: int, y: float) -> None:
+        bucket = self._bucket_of(x)
+        if bucket != self._bucket:
+            self._flush()
+            self._bucket = bucket
+            self._first = self._low = self._high = self._final = (x, y)
+            return
+        if y < self._low[1]:
+            self._low = (x, y)
+        if y > self._high[1]:
+            self._high = (x, y)
+        self._final = (x, y)
+
+    def extend(self, start: int, values: "np.ndarray") -> None:
+        if not len(values):
+            return
+        xs = np.arange(start, start + len(values))
+        if self._last_x:
+            buckets = np.rint((xs / self._last_x) * (self.buckets - 1)).astype(np.int64)
+        else:
+            buckets = np.zeros(len(values), dtype=np.int64)
+        bounds = [0, *(np.flatnonzero(np.diff(buckets)) + 1).tolist(), len(values)]
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            segment = values[begin:end]
+            low = begin + int(np.argmin(segment))
+            high = begin + int(np.argmax(segment))
+            first = (start + begin, float(values[begin]))
+            low_point = (start + low, float(values[low]))
+            high_point = (start + high, float(values[high]))
+            final = (start + end - 1, float(values[end - 1]))
+            bucket = int(buckets[begin])
+            if bucket != self._bucket:
+                self._flush()
+                self._bucket = bucket
+                self._first, self._low, self._high = first, low_point, high_point
+            else:
+                if low_point[1] < self._low[1]:
+                    self._low = low_point
+                if high_point[1] > self._high[1]:
+                    self._high = high_point
+            self._final = final
+
+    def points(self) -> List[Point]:
+        return self.emitted + self._open_points()
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "total": self.total,
+            "target": self.target,
+            "buckets": self.buckets,
+            "emitted": self.emitted,
+            "bucket": self._bucket,
+            "open": [self._first, self._low, self._high, self._final],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "MinMaxDownsampler":
+        sampler = cls(payload["total"], payload["target"], payload["buckets"])
+        sampler.emitted = [(x, y) for x, y in payload["emitted"]]
+        sampler._bucket = payload["bucket"]
+        sampler._first, sampler._low, sampler._high, sampler._final = (tuple(point) for point in payload["open"])
+        return sampler
+
+
+class LttbDownsampler(MinMaxDownsampler):
+    """LTTB over a min/max preselection of ``LTTB_PRESELECT_RATIO * target`` buckets."""
+
+    mode = "lttb"
+
+    def __init__(self, total: int, target: int = DEFAULT_TARGET, buckets: Optional[int] = None) -> None:
+        super().__init__(total, target, buckets if buckets is not None else max(1, target * LTTB_PRESELECT_RATIO))
+
+    def points(self) -> List[Point]:
+        return lttb(super().points(), self.target)
+
+
+DOWNSAMPLERS = {
+    "lttb": LttbDownsampler,
+    "minmax": MinMaxDownsampler,
+    "stride": StrideDownsampler,
+}
+
+
+def make_downsampler(mode: str, total: int, target: int = DEFAULT_TARGET):
+    if mode not in DOWNSAMPLERS:
+        raise ValueError(f"Unknown downsample mode: {mode}")
+    return DOWNSAMPLERS[mode](total, target)
+
+
+def downsampler_from_dict(payload: dict):
+    return DOWNSAMPLERS[payload["mode"]].from_dict(payload)
@@ -5,19 +5,60 @@ import argparse
 import json
 import os
 import struct
+import sys
 import zlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 ARTIFACT_DIR = Path(os.environ.get("YLK_ARTIFACTS", "artifacts/telemetry"))
+ENGINES = ("scalar", "numpy")
+PNG_COMPRESSION_LEVEL = 9
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.telemetry_downsample import (
+    DEFAULT_MODE as DEFAULT_SERIES_MODE,
+    DEFAULT_TARGET as SERIES_POINTS,
+    DOWNSAMPLE_MODES,
+    MinMaxDownsampler,
+    downsampler_from_dict,
+    make_downsampler,
+)
+from scripts.telemetry_stats import DEFAULT_RELATIVE_ACCURACY, STATS_MODES, StreamingSeries
+
+CHECKPOINT_VERSION = 2
+CHART_WIDTH = 480
+CHART_HEIGHT = 260
+CHART_MARGIN = 24
+# One min/max bucket per pixel column the chart line can land on.
+CHART_COLUMNS = CHART_WIDTH - 2 * CHART_MARGIN + 1
+
+# Series that report a p95; streaming mode keeps a quantile sketch for these only.
+QUANTILE_SERIES = (
+    "sandbox_tick",
+    "economy_tick",
+    "environment_tick",
+    "automation_tick",
+    "power_tick",
+    "render_tick",
+    "eco_in",
+    "eco_apply",
+    "eco_ship",
+    "eco_research",
+    "eco_statbus",
+    "eco_ui",
+)
+SERIES_NAMES = QUANTILE_SERIES + ("fallback", "auto_active", "ci_delta", "pps", "storage", "feed_fraction", "power_ratio")
 
 
 @dataclass(frozen=True)
 class DemoResult:
     summary: dict
-    egg_history: List[float]
+    chart_points: Sequence[Tuple[int, float]]
 
 
 def _lcg(prev: int) -> int:
@@ -36,156 +77,80 @@ def _p95(values: Sequence[float]) -> float:
     return float(ordered[index])
 
 
-def _downsample(series: Sequence[Tuple[int, float]], target: int = 120) -> List[dict]:
-    if not series:
-        return []
-    step = max(1, len(series) // target)
-    return [{"tick": tick, "eggs": eggs} for idx, (tick, eggs) in enumerate(series) if idx % step == 0 or idx == len(series) - 1]
-
-
-def generate_demo_summary(seed: int, ticks: int) -> DemoResult:
-    dt = 1.0
-    state = seed if seed > 0 else seed + 0x7FFFFFFF
-    eggs = 0.0
-    rate = 1.0
-    ci = 50.0
-    ci_bonus = 0.0
-    ci_delta_history: List[float] = []
-    pps_history: List[float] = []
-    storage = 20.0
-    wallet = 10.0
-    active_cells = 64.0
-    power_ratio = 1.0
-    feed_fraction_history: List[float] = []
-    storage_history: List[float] = []
-    power_state_history: List[float] = []
-    auto_active_history: List[float] = []
-    sandbox_ticks: List[float] = []
-    economy_ticks: List[float] = []
-    environment_ticks: List[float] = []
-    automation_ticks: List[float] = []
-    power_ticks: List[float] = []
-    render_ticks: List[float] = []
-    eco_in: List[float] = []
-    eco_apply: List[float] = []
-    eco_ship: List[float] = []
-    eco_research: List[float] = []
-    eco_statbus: List[float] = []
-    eco_ui: List[float] = []
-    fallback_samples: List[int] = []
-    shipments = []
-    samples = []
-    alerts = []
-    egg_history: List[float] = []
-    series_seed: List[Tuple[int, float]] = []
-
-    for tick in range(max(ticks, 1)):
-        state = _lcg(state)
-        noise = (state / 0x7FFFFFFF) - 0.5
-        rate = max(0.1, rate * (1.0 + noise * 0.02))
-        eggs += rate
-        wallet = max(0.0, wallet + rate * 0.55)
-        storage = max(0.0, storage + rate * 0.45 - 1.1)
-        ci_delta = noise * 0.8 + 0.15
-        ci = min(100.0, max(0.0, ci + ci_delta))
-        ci_bonus = min(30.0, max(0.0, ci_bonus + ci_delta * 0.35 + 0.05))
-        active_cells = min(512.0, max(0.0, active_cells + noise * 7.0 + 2.0))
-        power_ratio = min(1.1, max(0.5, power_ratio + noise * 0.05))
-        feed_fraction = min(1.0, max(0.0, rate / 25.0))
-        sandbox_tick = 4.0 + abs(noise) * 2.2
-        economy_tick = 3.0 + abs(noise) * 1.8
-        environment_tick = 1.4 + abs(noise) * 1.1
-        automation_tick = 1.2 + abs(noise)
-        power_tick = 0.8 + abs(noise) * 0.9
-        render_tick = 2.2 + abs(noise) * 1.4
-
-        sandbox_ticks.append(sandbox_tick)
-        economy_ticks.append(economy_tick)
-        environment_ticks.append(environment_tick)
-        automation_ticks.append(automation_tick)
-        power_ticks.append(power_tick)
-        render_ticks.append(render_tick)
-
-        eco_in.append(economy_tick * 0.25)
-        eco_apply.append(economy_tick * 0.2)
-        eco_ship.append(economy_tick * 0.18)
-        eco_research.append(economy_tick * 0.16)
-        eco_statbus.append(economy_tick * 0.14)
-        eco_ui.append(economy_tick * 0.12)
-
-        fallback_samples.append(1 if noise > 0.35 else 0)
-        auto_active_history.append(1 if noise > 0.25 else 0)
-
-        ci_delta_history.append(ci_delta)
-        pps_history.append(rate)
-        storage_history.append(storage)
-        feed_fraction_history.append(feed_fraction)
-        power_state_history.append(power_ratio)
-        egg_history.append(eggs)
-        series_seed.append((tick, eggs))
-
-        if tick % max(1, ticks // 5) == 0:
-            shipments.append({
-                "time": tick * dt,
-                "amount": rate * 4.0,
-                "wallet": wallet
-            })
-        if tick % 5 == 0:
-            samples.append({
-                "time": tick * dt,
-                "ci": ci,
-                "ci_bonus": ci_bonus,
-                "ci_delta": ci_delta,
-                "pps": rate,
-                "storage": storage,
-                "wallet": wallet,
-                "active_cells": active_cells,
-                "power_ratio": power_ratio
-            })
-
-    fallback_ratio = _avg(fallback_samples)
-    stats = {
-        "sandbox_tick_ms_avg": _avg(sandbox_ticks),
-        "sandbox_tick_ms_p95": _p95(sandbox_ticks),
-        "sandbox_render_ms_avg": _avg(render_ticks),
-        "sandbox_render_ms_p95": _p95(render_ticks),
-        "sandbox_render_fallback_ratio": fallback_ratio,
+class _ListSeries:
+    """Aggregate view over per-tick histories kept as plain Python lists."""
+
+    def __init__(self, histories: Dict[str, List[float]]) -> None:
+        self._histories = histories
+
+    def avg(self, name: str) -> float:
+        return _avg(self._histories[name])
+
+    def p95(self, name: str) -> float:
+        return _p95(self._histories[name])
+
+    def peak(self, name: str, absolute: bool = False) -> float:
+        values = self._histories[name]
+        if absolute:
+            return max((abs(value) for value in values), default=0.0)
+        return max(values)
+
+
+def _build_stats(series, samples: List[dict], ci: float, active_cells: float) -> dict:
+    return {
+        "sandbox_tick_ms_avg": series.avg("sandbox_tick"),
+        "sandbox_tick_ms_p95": series.p95("sandbox_tick"),
+        "sandbox_render_ms_avg": series.avg("render_tick"),
+        "sandbox_render_ms_p95": series.p95("render_tick"),
+        "sandbox_render_fallback_ratio": series.avg("fallback"),
         "sandbox_render_view_mode": "isometric",
-        "pps_avg": _avg(pps_history),
+        "pps_avg": series.avg("pps"),
         "ci_avg": _avg([sample["ci"] for sample in samples]) if samples else ci,
-        "ci_delta_avg": _avg(ci_delta_history),
-        "ci_delta_abs_max": max((abs(value) for value in ci_delta_history), default=0.0),
-        "power_ratio_avg": _avg(power_state_history),
+        "ci_delta_avg": series.avg("ci_delta"),
+        "ci_delta_abs_max": series.peak("ci_delta", absolute=True),
+        "power_ratio_avg": series.avg("power_ratio"),
         "active_cells_max": max(active_cells for active_cells in [s["active_cells"] for s in samples]) if samples else active_cells,
-        "automation_tick_ms_avg": _avg(automation_ticks),
-        "automation_tick_ms_p95": _p95(automation_ticks),
-        "automation_auto_active_avg": _avg(auto_active_history),
-        "economy_tick_ms_avg": _avg(economy_ticks),
-        "economy_tick_ms_p95": _p95(economy_ticks),
-        "economy_pps_avg": _avg(pps_history),
-        "economy_storage_avg": _avg(storage_history),
-        "economy_feed_fraction_avg": _avg(feed_fraction_history),
-        "eco_in_ms_avg": _avg(eco_in),
-        "eco_in_ms_p95": _p95(eco_in),
-        "eco_apply_ms_avg": _avg(eco_apply),
-        "eco_apply_ms_p95": _p95(eco_apply),
-        "eco_ship_ms_avg": _avg(eco_ship),
-        "eco_ship_ms_p95": _p95(eco_ship),
-        "eco_research_ms_avg": _avg(eco_research),
-        "eco_research_ms_p95": _p95(eco_research),
-        "eco_statbus_ms_avg": _avg(eco_statbus),
-        "eco_statbus_ms_p95": _p95(eco_statbus),
-        "eco_ui_ms_avg": _avg(eco_ui),
-        "eco_ui_ms_p95": _p95(eco_ui),
-        "environment_tick_ms_avg": _avg(environment_ticks),
-        "environment_tick_ms_p95": _p95(environment_ticks),
-        "environment_stage_rebuild_ms_max": max(environment_ticks) * 0.35,
+        "automation_tick_ms_avg": series.avg("automation_tick"),
+        "automation_tick_ms_p95": series.p95("automation_tick"),
+        "automation_auto_active_avg": series.avg("auto_active"),
+        "economy_tick_ms_avg": series.avg("economy_tick"),
+        "economy_tick_ms_p95": series.p95("economy_tick"),
+        "economy_pps_avg": series.avg("pps"),
+        "economy_storage_avg": series.avg("storage"),
+        "economy_feed_fraction_avg": series.avg("feed_fraction"),
+        "eco_in_ms_avg": series.avg("eco_in"),
+        "eco_in_ms_p95": series.p95("eco_in"),
+        "eco_apply_ms_avg": series.avg("eco_apply"),
+        "eco_apply_ms_p95": series.p95("eco_apply"),
+        "eco_ship_ms_avg": series.avg("eco_ship"),
+        "eco_ship_ms_p95": series.p95("eco_ship"),
+        "eco_research_ms_avg": series.avg("eco_research"),
+        "eco_research_ms_p95": series.p95("eco_research"),
+        "eco_statbus_ms_avg": series.avg("eco_statbus"),
+        "eco_statbus_ms_p95": series.p95("eco_statbus"),
+        "eco_ui_ms_avg": series.avg("eco_ui"),
+        "eco_ui_ms_p95": series.p95("eco_ui"),
+        "environment_tick_ms_avg": series.avg("environment_tick"),
+        "environment_tick_ms_p95": series.p95("environment_tick"),
+        "environment_stage_rebuild_ms_max": series.peak("environment_tick") * 0.35,
         "environment_stage_rebuild_source_last": "demo",
-        "power_tick_ms_avg": _avg(power_ticks),
-        "power_tick_ms_p95": _p95(power_ticks),
-        "power_state_avg": _avg(power_state_history)
+        "power_tick_ms_avg": series.avg("power_tick"),
+        "power_tick_ms_p95": series.p95("power_tick"),
+        "power_state_avg": series.avg("power_ratio")
     }
 
+
+def _build_summary(
+    seed: int,
+    ticks: int,
+    dt: float,
+    stats: dict,
+    shipments: List[dict],
+    samples: List[dict],
+    final: dict,
+    series: List[dict],
+) -> dict:
+    alerts = []
     if stats["sandbox_tick_ms_p95"] > 6.0:
         alerts.append({
             "time": ticks * dt,
@@ -193,6 +158,7 @@ def generate_demo_summary(seed: int, ticks: int) -> DemoResult:
             "value": stats["sandbox_tick_ms_p95"],
             "threshold": 6.0
         })
+    fallback_ratio = stats["sandbox_render_fallback_ratio"]
     if fallback_ratio > 0.2:
         alerts.append({
             "time": ticks * dt,
@@ -201,7 +167,7 @@ def generate_demo_summary(seed: int, ticks: int) -> DemoResult:
             "threshold": 0.2
         })
 
-    summary = {
+    return {
         "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
         "seed": seed,
         "strategy": "demo",
@@ -212,29 +178,290 @@ def generate_demo_summary(seed: int, ticks: int) -> DemoResult:
         "samples": samples,
         "stats": stats,
         "alerts": alerts,
-        "final": {
-            "ci": ci,
-            "ci_bonus": ci_bonus,
-            "pps": pps_history[-1] if pps_history else rate,
-            "wallet": wallet,
-            "storage": storage
-        },
-        "series": _downsample(series_seed),
+        "final": final,
+        "series": series,
         "metadata": {
             "generator": "telemetry_replay_demo.py",
             "ticks": ticks
         }
     }
-    return DemoResult(summary=summary, egg_history=egg_history)
 
 
-def _write_png(width: int, height: int, pixels: bytearray, path: Path) -> None:
-    raw = bytearray()
+class _DemoRun:
+    """Scalar reference generator, advanced in chunks and checkpointable.
+
+    ``advance`` runs the per-tick loop up to a tick; ``result`` builds the
+    summary from whatever has run so far (a partial snapshot before the last
+    tick). Streaming runs can be saved with ``checkpoint`` and picked up again
+    with ``from_checkpoint``. Egg counts only feed the ``series`` and chart
+    downsamplers, so no per-tick history is kept.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        ticks: int,
+        stats_mode: str = "exact",
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        series_mode: str = DEFAULT_SERIES_MODE,
+        series_points: int = SERIES_POINTS,
+    ) -> None:
+        self.seed = seed
+        self.ticks = ticks
+        self.total = max(ticks, 1)
+        self.dt = 1.0
+        self.tick = 0
+        self.state = seed if seed > 0 else seed + 0x7FFFFFFF
+        self.values = {
+            "eggs": 0.0,
+            "rate": 1.0,
+            "ci": 50.0,
+            "ci_bonus": 0.0,
+            "storage": 20.0,
+            "wallet": 10.0,
+            "active_cells": 64.0,
+            "power_ratio": 1.0,
+        }
+        self.streaming = None
+        if stats_mode != "exact":
+            self.streaming = StreamingSeries(QUANTILE_SERIES, relative_accuracy, check=stats_mode == "verify")
+        self.histories = {
+            name: [] if self.streaming is None else self.streaming.metric(name)
+            for name in SERIES_NAMES
+        }
+        self.shipments: List[dict] = []
+        self.samples: List[dict] = []
+        self.series = make_downsampler(series_mode, self.total, series_points)
+        self.chart = MinMaxDownsampler(self.total, buckets=CHART_COLUMNS)
+
+    @property
+    def done(self) -> bool:
+        return self.tick >= self.total
+
+    def advance(self, until: int) -> None:
+        dt = self.dt
+        ticks = self.ticks
+        state = self.state
+        eggs = self.values["eggs"]
+        rate = self.values["rate"]
+        ci = self.values["ci"]
+        ci_bonus = self.values["ci_bonus"]
+        storage = self.values["storage"]
+        wallet = self.values["wallet"]
+        active_cells = self.values["active_cells"]
+        power_ratio = self.values["power_ratio"]
+        histories = self.histories
+        ci_delta_history = histories["ci_delta"]
+        pps_history = histories["pps"]
+        feed_fraction_history = histories["feed_fraction"]
+        storage_history = histories["storage"]
+        power_state_history = histories["power_ratio"]
+        auto_active_history = histories["auto_active"]
+        sandbox_ticks = histories["sandbox_tick"]
+        economy_ticks = histories["economy_tick"]
+        environment_ticks = histories["environment_tick"]
+        automation_ticks = histories["automation_tick"]
+        power_ticks = histories["power_tick"]
+        render_ticks = histories["render_tick"]
+        eco_in = histories["eco_in"]
+        eco_apply = histories["eco_apply"]
+        eco_ship = histories["eco_ship"]
+        eco_research = histories["eco_research"]
+        eco_statbus = histories["eco_statbus"]
+        eco_ui = histories["eco_ui"]
+        fallback_samples = histories["fallback"]
+        shipments = self.shipments
+        samples = self.samples
+        series_append = self.series.append
+        chart_append = self.chart.append
+
+        for tick in range(self.tick, min(until, self.total)):
+            state = _lcg(state)
+            noise = (state / 0x7FFFFFFF) - 0.5
+            rate = max(0.1, rate * (1.0 + noise * 0.02))
+            eggs += rate
+            wallet = max(0.0, wallet + rate * 0.55)
+            storage = max(0.0, storage + rate * 0.45 - 1.1)
+            ci_delta = noise * 0.8 + 0.15
+            ci = min(100.0, max(0.0, ci + ci_delta))
+            ci_bonus = min(30.0, max(0.0, ci_bonus + ci_delta * 0.35 + 0.05))
+            active_cells = min(512.0, max(0.0, active_cells + noise * 7.0 + 2.0))
+            power_ratio = min(1.1, max(0.5, power_ratio + noise * 0.05))
+            feed_fraction = min(1.0, max(0.0, rate / 25.0))
+            sandbox_tick = 4.0 + abs(noise) * 2.2
+            economy_tick = 3.0 + abs(noise) * 1.8
+            environment_tick = 1.4 + abs(noise) * 1.1
+            automation_tick = 1.2 + abs(noise)
+            power_tick = 0.8 + abs(noise) * 0.9
+            render_tick = 2.2 + abs(noise) * 1.4
+
+            sandbox_ticks.append(sandbox_tick)
+            economy_ticks.append(economy_tick)
+            environment_ticks.append(environment_tick)
+            automation_ticks.append(automation_tick)
+            power_ticks.append(power_tick)
+            render_ticks.append(render_tick)
+
+            eco_in.append(economy_tick * 0.25)
+            eco_apply.append(economy_tick * 0.2)
+            eco_ship.append(economy_tick * 0.18)
+            eco_research.append(economy_tick * 0.16)
+            eco_statbus.append(economy_tick * 0.14)
+            eco_ui.append(economy_tick * 0.12)
+
+            fallback_samples.append(1 if noise > 0.35 else 0)
+            auto_active_history.append(1 if noise > 0.25 else 0)
+
+            ci_delta_history.append(ci_delta)
+            pps_history.append(rate)
+            storage_history.append(storage)
+            feed_fraction_history.append(feed_fraction)
+            power_state_history.append(power_ratio)
+            series_append(tick, eggs)
+            chart_append(tick, eggs)
+
+            if tick % max(1, ticks // 5) == 0:
+                shipments.append({
+                    "time": tick * dt,
+                    "amount": rate * 4.0,
+                    "wallet": wallet
+                })
+            if tick % 5 == 0:
+                samples.append({
+                    "time": tick * dt,
+                    "ci": ci,
+                    "ci_bonus": ci_bonus,
+                    "ci_delta": ci_delta,
+                    "pps": rate,
+                    "storage": storage,
+                    "wallet": wallet,
+                    "active_cells": active_cells,
+                    "power_ratio": power_ratio
+                })
+
+        self.tick = max(self.tick, min(until, self.total))
+        self.state = state
+        self.values.update(
+            eggs=eggs,
+            rate=rate,
+            ci=ci,
+            ci_bonus=ci_bonus,
+            storage=storage,
+            wallet=wallet,
+            active_cells=active_cells,
+            power_ratio=power_ratio,
+        )
+
+    def result(self) -> DemoResult:
+        if self.tick == 0:
+            raise ValueError("No ticks have run yet.")
+        values = self.values
+        histories = _ListSeries(self.histories) if self.streaming is None else self.streaming
+        series = [{"tick": tick, "eggs": eggs} for tick, eggs in self.series.points()]
+        stats = _build_stats(histories, self.samples, values["ci"], values["active_cells"])
+        final = {
+            "ci": values["ci"],
+            "ci_bonus": values["ci_bonus"],
+            "pps": values["rate"],
+            "wallet": values["wallet"],
+            "storage": values["storage"]
+        }
+        ticks = self.ticks if self.done else self.tick
+        summary = _build_summary(self.seed, ticks, self.dt, stats, self.shipments, self.samples, final, series)
+        if not self.done:
+            summary["metadata"]["partial"] = True
+            summary["metadata"]["ticks_target"] = self.ticks
+        return DemoResult(summary=summary, chart_points=self.chart.points())
+
+    def checkpoint(self) -> dict:
+        if self.streaming is None:
+            raise ValueError("Only streaming runs can be checkpointed; use stats_mode='stream'.")
+        return {
+            "version": CHECKPOINT_VERSION,
+            "seed": self.seed,
+            "ticks": self.ticks,
+            "tick": self.tick,
+            "state": self.state,
+            "values": dict(self.values),
+            "streaming": self.streaming.to_dict(),
+            "shipments": self.shipments,
+            "samples": self.samples,
+            "series": self.series.to_dict(),
+            "chart": self.chart.to_dict(),
+        }
+
+    @classmethod
+    def from_checkpoint(cls, payload: dict) -> "_DemoRun":
+        if payload.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {payload.get('version')}")
+        streaming = StreamingSeries.from_dict(payload["streaming"])
+        run = cls(
+            payload["seed"],
+            payload["ticks"],
+            stats_mode="verify" if streaming.check else "stream",
+            relative_accuracy=streaming.relative_accuracy,
+        )
+        run.streaming = streaming
+        run.histories = {name: streaming.metric(name) for name in SERIES_NAMES}
+        run.tick = payload["tick"]
+        run.state = payload["state"]
+        run.values.update(payload["values"])
+        run.shipments = payload["shipments"]
+        run.samples = payload["samples"]
+        run.series = downsampler_from_dict(payload["series"])
+        run.chart = downsampler_from_dict(payload["chart"])
+        return run
+
+
+def generate_demo_summary(
+    seed: int,
+    ticks: int,
+    engine: str = "scalar",
+    stats_mode: str = "exact",
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    series_mode: str = DEFAULT_SERIES_MODE,
+    series_points: int = SERIES_POINTS,
+) -> DemoResult:
+    """Run the demo generator.
+
+    ``engine`` selects the scalar reference loop (``"scalar"``) or the NumPy
+    columnar engine (``"numpy"``); both produce identical summaries for a seed.
+
+    ``stats_mode`` controls how per-tick series are aggregated: ``"exact"``
+    keeps every value, ``"stream"`` folds them into constant-memory running
+    aggregates (p95 values within ``relative_accuracy``, everything else exact)
+    and ``"verify"`` streams while also checking each answer against the exact
+    value, raising ``StatsCheckError`` on drift.
+
+    ``series_mode`` picks the downsampler for the ``series`` field (see
+    ``telemetry_downsample``); ``chart_points`` is always the per-pixel-column
+    min/max envelope the chart is drawn from.
+    """
+    if stats_mode not in STATS_MODES:
+        raise ValueError(f"Unknown stats mode: {stats_mode}")
+    if engine == "numpy":
+        from scripts.telemetry_columnar import generate_columnar_summary
+
+        return generate_columnar_summary(
+            seed,
+            ticks,
+            stats_mode=stats_mode,
+            relative_accuracy=relative_accuracy,
+            series_mode=series_mode,
+            series_points=series_points,
+        )
+    if engine != "scalar":
+        raise ValueError(f"Unknown engine: {engine}")
+
+    run = _DemoRun(seed, ticks, stats_mode, relative_accuracy, series_mode, series_points)
+    run.advance(run.total)
+    return run.result()
+
+
+def _write_png(width: int, height: int, pixels: bytearray, path: Path, level: int = PNG_COMPRESSION_LEVEL) -> None:
     stride = width * 4
-    for y in range(height):
-        start = y * stride
-        raw.append(0)
-        raw.extend(pixels[start:start + stride])
+    view = memoryview(pixels)
+    raw = b"".join(b"\x00" + view[start:start + stride] for start in range(0, height * stride, stride))
 
     def _chunk(tag: bytes, data: bytes) -> bytes:
         return (
@@ -245,7 +472,7 @@ def _write_png(width: int, height: int, pixels: bytearray, path: Path) -> None:
         )
 
     header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
-    data = zlib.compress(bytes(raw), level=9)
+    data = zlib.compress(raw, level=level)
     png_bytes = b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header) + _chunk(b"IDAT", data) + _chunk(b"IEND", b"")
     path.write_bytes(png_bytes)
 
@@ -271,60 +498,238 @@ def _draw_line(pixels: bytearray, width: int, height: int, x0: int, y0: int, x1:
             y0 += sy
 
 
-def _render_chart(values: Sequence[float], path: Path) -> None:
-    if len(values) < 2:
+def _fill_span(pixels: bytearray, width: int, height: int, x0: int, x1: int, y: int, color: bytes) -> None:
+    """Fill pixels ``x0..x1`` (inclusive) of row ``y`` with one slice assignment."""
+    if not 0 <= y < height:
+        return
+    x0, x1 = max(x0, 0), min(x1, width - 1)
+    if x0 > x1:
+        return
+    start = (y * width + x0) * 4
+    pixels[start:start + (x1 - x0 + 1) * 4] = color * (x1 - x0 + 1)
+
+
+def _fill_column(pixels: bytearray, width: int, height: int, x: int, y0: int, y1: int, color: bytes) -> None:
+    """Fill pixels ``y0..y1`` (inclusive) of column ``x`` via a strided slice."""
+    if not 0 <= x < width:
+        return
+    y0, y1 = max(y0, 0), min(y1, height - 1)
+    if y0 > y1:
+        return
+    view = memoryview(pixels).cast("I")
+    view[y0 * width + x:y1 * width + x + 1:width] = memoryview(color * (y1 - y0 + 1)).cast("I")
+
+
+def _draw_polyline(
+    pixels: bytearray,
+    width: int,
+    height: int,
+    points: Sequence[Tuple[int, int]],
+    color: Tuple[int, int, int, int],
+) -> None:
+    """Draw the same pixels as ``_draw_line`` over each consecutive pair of ``points``.
+
+    Consecutive points that share a column cover exactly the span between their
+    lowest and highest y, so each such run becomes one column fill and only the
+    segments between columns go through Bresenham.
+    """
+    color_bytes = bytes(color)
+    run_x, low, high = points[0][0], points[0][1], points[0][1]
+    prev_x, prev_y = points[0]
+    for x, y in points[1:]:
+        if x == prev_x:
+            low = min(low, y)
+            high = max(high, y)
+        else:
+            _fill_column(pixels, width, height, run_x, low, high, color_bytes)
+            _draw_line(pixels, width, height, prev_x, prev_y, x, y, color)
+            run_x, low, high = x, y, y
+        prev_x, prev_y = x, y
+    _fill_column(pixels, width, height, run_x, low, high, color_bytes)
+
+
+def _render_chart(points: Sequence[Tuple[int, float]], path: Path, level: int = PNG_COMPRESSION_LEVEL) -> None:
+    """Draw ``(tick, value)`` points as a line chart.
+
+    Ticks map linearly onto the x axis, so a per-column min/max envelope
+    (``DemoResult.chart_points``) renders the same pixels as the full series.
+    """
+    if len(points) < 2:
         return
-    width, height = 480, 260
-    margin = 24
+    width, height = CHART_WIDTH, CHART_HEIGHT
+    margin = CHART_MARGIN
     bg = (248, 249, 255, 255)
     axis = (213, 219, 240, 255)
     line = (78, 119, 212, 255)
-    pixels = bytearray(width * height * 4)
-    for idx in range(0, len(pixels), 4):
-        pixels[idx:idx + 4] = bytes(bg)
+    pixels = bytearray(bytes(bg) * (width * height))
 
-    for x in range(margin, width - margin):
-        _draw_line(pixels, width, height, x, height - margin, x, height - margin, axis)
-    for y in range(margin, height - margin + 1):
-        _draw_line(pixels, width, height, margin, y, margin, y, axis)
+    _fill_span(pixels, width, height, margin, width - margin - 1, height - margin, bytes(axis))
+    _fill_column(pixels, width, height, margin, margin, height - margin, bytes(axis))
 
+    values = [value for _, value in points]
     max_val = max(values)
     min_val = min(values)
     scale = max(max_val - min_val, 1e-6)
     usable_height = height - 2 * margin
     usable_width = width - 2 * margin
+    first = points[0][0]
+    span = max(points[-1][0] - first, 1)
 
-    def _to_screen(idx: int, value: float) -> Tuple[int, int]:
-        x = margin + int(round((idx / (len(values) - 1)) * usable_width))
-        norm = (value - min_val) / scale
-        y = height - margin - int(round(norm * usable_height))
-        return x, y
+    screen = [
+        (
+            margin + int(round(((tick - first) / span) * usable_width)),
+            height - margin - int(round(((value - min_val) / scale) * usable_height)),
+        )
+        for tick, value in points
+    ]
+    _draw_polyline(pixels, width, height, screen, line)
 
-    prev_x, prev_y = _to_screen(0, values[0])
-    for idx, value in enumerate(values[1:], start=1):
-        x, y = _to_screen(idx, value)
-        _draw_line(pixels, width, height, prev_x, prev_y, x, y, line)
-        prev_x, prev_y = x, y
+    _write_png(width, height, pixels, path, level)
+
+
+def _write_json(path: Path, payload: dict, indent: Optional[int] = 2) -> None:
+    """Write via a temp file and rename so readers never see a half-written file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=indent)
+    os.replace(tmp_path, path)
 
-    _write_png(width, height, pixels, path)
+
+def _run_chunked(run: _DemoRun, chunk_ticks: int, checkpoint_path: Path, kpi_path: Path) -> DemoResult:
+    """Advance ``run`` chunk by chunk, checkpointing and snapshotting ``kpi.json`` after each."""
+    while not run.done:
+        run.advance(run.tick + chunk_ticks)
+        if run.done:
+            break
+        payload = run.checkpoint()
+        payload["chunk_ticks"] = chunk_ticks
+        _write_json(checkpoint_path, payload, indent=None)
+        _write_json(kpi_path, run.result().summary)
+        print(f"[telemetry-demo] Checkpoint at tick {run.tick}/{run.total} -> {checkpoint_path}")
+    result = run.result()
+    if checkpoint_path.exists():
+        checkpoint_path.unlink()
+    return result
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--seed", type=int, default=42)
-    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None, help="Generator seed (default: 42).")
+    parser.add_argument("--ticks", type=int, default=None, help="Ticks to simulate (default: 200).")
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="scalar",
+        help="Generator backend; 'numpy' batches the run as typed arrays (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--stats",
+        choices=STATS_MODES,
+        default=None,
+        help="Series aggregation: keep every value, stream into constant-memory sketches, or stream and verify (default: exact, or stream with --chunk-ticks).",
+    )
+    parser.add_argument(
+        "--stats-accuracy",
+        type=float,
+        default=None,
+        help=f"Relative error bound for streamed p95 values (default: {DEFAULT_RELATIVE_ACCURACY}).",
+    )
+    parser.add_argument(
+        "--series-mode",
+        choices=DOWNSAMPLE_MODES,
+        default=None,
+        help=f"Downsampler for the kpi.json series: LTTB, min/max per bucket, or every k-th tick (default: {DEFAULT_SERIES_MODE}).",
+    )
+    parser.add_argument(
+        "--series-points",
+        type=int,
+        default=None,
+        help=f"Target number of series points (default: {SERIES_POINTS}).",
+    )
+    parser.add_argument(
+        "--chunk-ticks",
+        type=int,
+        default=0,
+        help="Checkpoint generator state and write a partial kpi.json every N ticks (scalar engine, streamed stats).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file for --chunk-ticks/--resume (default: <artifacts>/checkpoint.json).",
+    )
+    parser.add_argument("--resume", action="store_true", help="Continue the run saved in the checkpoint file.")
+    parser.add_argument(
+        "--png-level",
+        type=int,
+        choices=range(0, 10),
+        default=PNG_COMPRESSION_LEVEL,
+        metavar="0-9",
+        help="zlib level for kpi_chart.png; lower is faster, larger (default: %(default)s).",
+    )
     args = parser.parse_args()
 
     ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
-    result = generate_demo_summary(args.seed, args.ticks)
-
     kpi_path = ARTIFACT_DIR / "kpi.json"
-    with kpi_path.open("w", encoding="utf-8") as handle:
-        json.dump(result.summary, handle, indent=2)
+    checkpoint_path = args.checkpoint or ARTIFACT_DIR / "checkpoint.json"
+    if args.chunk_ticks < 0:
+        parser.error("--chunk-ticks must be positive")
+    if args.series_points is not None and args.series_points < 2:
+        parser.error("--series-points must be at least 2")
+
+    if args.resume or args.chunk_ticks:
+        if args.engine != "scalar":
+            parser.error("--chunk-ticks/--resume run on the scalar engine only")
+        if args.stats == "exact":
+            parser.error("--chunk-ticks/--resume need streamed stats (--stats stream or verify)")
+        if args.resume:
+            if not checkpoint_path.exists():
+                parser.error(f"No checkpoint to resume at {checkpoint_path}")
+            payload = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+            # Options left unset follow the checkpoint; explicit ones must agree with it.
+            saved = {
+                "seed": payload["seed"],
+                "ticks": payload["ticks"],
+                "stats": "verify" if payload["streaming"]["check"] else "stream",
+                "stats_accuracy": payload["streaming"]["relative_accuracy"],
+                "series_mode": payload["series"]["mode"],
+                "series_points": payload["series"]["target"],
+            }
+            for option, value in saved.items():
+                requested = getattr(args, option)
+                if requested is not None and requested != value:
+                    flag = option.replace("_", "-")
+                    parser.error(f"--{flag} {requested} does not match the checkpoint ({value})")
+            run = _DemoRun.from_checkpoint(payload)
+            chunk_ticks = args.chunk_ticks or payload.get("chunk_ticks") or run.total
+            print(f"[telemetry-demo] Resuming seed {run.seed} at tick {run.tick}/{run.total}")
+        else:
+            run = _DemoRun(
+                42 if args.seed is None else args.seed,
+                200 if args.ticks is None else args.ticks,
+                stats_mode=args.stats or "stream",
+                relative_accuracy=DEFAULT_RELATIVE_ACCURACY if args.stats_accuracy is None else args.stats_accuracy,
+                series_mode=args.series_mode or DEFAULT_SERIES_MODE,
+                series_points=SERIES_POINTS if args.series_points is None else args.series_points,
+            )
+            chunk_ticks = args.chunk_ticks
+        result = _run_chunked(run, chunk_ticks, checkpoint_path, kpi_path)
+    else:
+        result = generate_demo_summary(
+            42 if args.seed is None else args.seed,
+            200 if args.ticks is None else args.ticks,
+            engine=args.engine,
+            stats_mode=args.stats or "exact",
+            relative_accuracy=DEFAULT_RELATIVE_ACCURACY if args.stats_accuracy is None else args.stats_accuracy,
+            series_mode=args.series_mode or DEFAULT_SERIES_MODE,
+            series_points=SERIES_POINTS if args.series_points is None else args.series_points,
+        )
+
+    _write_json(kpi_path, result.summary)
 
     chart_path = ARTIFACT_DIR / "kpi_chart.png"
     try:
-        _render_chart(result.egg_history, chart_path)
+        _render_chart(result.chart_points, chart_path, level=args.png_level)
     except Exception as exc:  # pragma: no cover - avoid failing demo on image issues
         chart_path = None
         print(f"[telemetry-demo] Chart generation skipped: {exc}")
@@ -0,0 +1,317 @@
+"""Streaming aggregators for telemetry series.
+
+Constant-memory replacements for keeping whole per-tick histories: a running
+mean/min/max that reproduces ``sum()`` exactly, and a DDSketch quantile
+estimator whose answers stay within a configurable relative error of the exact
+order statistic. ``StreamingSeries(check=True)`` also keeps the raw values and
+fails loudly when a sketch answer leaves its error bound.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+STATS_MODES = ("exact", "stream", "verify")
+
+# Python 3.12 switched float sum() to Neumaier compensated summation.
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+class StatsCheckError(Exception):
+    """Raised when a streamed aggregate drifts outside its error bound."""
+
+
+def p95_rank(count: int) -> int:
+    """Index of the p95 element in a sorted list of ``count`` values (see ``_p95``)."""
+    return min(count - 1, int(round(0.95 * (count - 1))))
+
+
+class RunningStats:
+    """Running count/mean/min/max; ``mean()`` matches ``sum(values) / len(values)`` bit for bit."""
+
+    __slots__ = ("count", "total", "compensation", "minimum", "maximum", "abs_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.compensation = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.abs_max = 0.0
+
+    def append(self, value: float) -> None:
+        self.count += 1
+        total = self.total + value
+        if _COMPENSATED_SUM:
+            if abs(self.total) >= abs(value):
+                self.compensation += (self.total - total) + value
+            else:
+                self.compensation += (value - total) + self.total
+        self.total = total
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if abs(value) > self.abs_max:
+            self.abs_max = abs(value)
+
+    def sum(self) -> float:
+        total = self.total
+        if _COMPENSATED_SUM and self.compensation and math.isfinite(self.compensation):
+            total += self.compensation
+        return total
+
+    def mean(self) -> float:
+        return self.sum() / max(self.count, 1)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "RunningStats":
+        stats = cls()
+        for name in cls.__slots__:
+            setattr(stats, name, payload[name])
+        return stats
+
+
+class DDSketch:
+    """Quantile sketch with relative-error guarantees (Masson et al., VLDB 2019).
+
+    Values fall into logarithmic bins of ratio ``gamma = (1 + a) / (1 - a)``; any
+    value reported for a bin is within ``a`` (the relative accuracy) of every
+    value stored in it. Memory is bounded by ``max_bins`` per sign: when the
+    limit is hit the lowest-magnitude bins are collapsed, which only affects the
+    accuracy of the smallest quantiles.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_bins: int = DEFAULT_MAX_BINS) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2.0 * self.gamma ** index / (self.gamma + 1.0)
+
+    def append(self, value: float) -> None:
+        self.count += 1
+        if value > 0.0:
+            store = self.positive
+        elif value < 0.0:
+            store = self.negative
+            value = -value
+        else:
+            self.zero_count += 1
+            return
+        index = self._index(value)
+        store[index] = store.get(index, 0) + 1
+        if len(store) > self.max_bins:
+            self._collapse(store)
+
+    def extend(self, values: Iterable[float]) -> None:
+        if np is not None and isinstance(values, np.ndarray):
+            self._extend_array(values)
+            return
+        for value in values:
+            self.append(value)
+
+    def _extend_array(self, values: "np.ndarray") -> None:
+        self.count += len(values)
+        self.zero_count += int(np.count_nonzero(values == 0.0))
+        for store, magnitudes in ((self.positive, values[values > 0.0]), (self.negative, -values[values < 0.0])):
+            if not len(magnitudes):
+                continue
+            indices, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64), return_counts=True)
+            for index, count in zip(indices.tolist(), counts.tolist()):
+                store[index] = store.get(index, 0) + count
+            if len(store) > self.max_bins:
+                self._collapse(store)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        ordered = sorted(store)
+        excess = ordered[:len(ordered) - self.max_bins + 1]
+        folded = sum(store.pop(index) for index in excess)
+        target = ordered[len(excess)]
+        store[target] = store.get(target, 0) + folded
+
+    def merge(self, other: "DDSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy.")
+        for store, incoming in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in incoming.items():
+                store[index] = store.get(index, 0) + count
+            if len(store) > self.max_bins:
+                self._collapse(store)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "positive": sorted(self.positive.items()),
+            "negative": sorted(self.negative.items()),
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "DDSketch":
+        sketch = cls(payload["relative_accuracy"], payload["max_bins"])
+        sketch.positive = {int(index): int(count) for index, count in payload["positive"]}
+        sketch.negative = {int(index): int(count) for index, count in payload["negative"]}
+        sketch.zero_count = payload["zero_count"]
+        sketch.count = payload["count"]
+        return sketch
+
+    def value_at_rank(self, rank: int) -> float:
+        """Estimate of the ``rank``-th smallest value (0-based)."""
+        if self.count == 0:
+            return 0.0
+        rank = min(max(rank, 0), self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive))
+
+    def quantile(self, q: float) -> float:
+        return self.value_at_rank(int(round(q * (self.count - 1))))
+
+
+class StreamMetric:
+    """Per-series accumulator fed through ``append`` like the list it replaces."""
+
+    __slots__ = ("stats", "sketch", "reference")
+
+    def __init__(self, sketch: Optional[DDSketch] = None, keep_values: bool = False) -> None:
+        self.stats = RunningStats()
+        self.sketch = sketch
+        self.reference: Optional[List[float]] = [] if keep_values else None
+
+    def append(self, value: float) -> None:
+        self.stats.append(value)
+        if self.sketch is not None:
+            self.sketch.append(value)
+        if self.reference is not None:
+            self.reference.append(value)
+
+    def to_dict(self) -> dict:
+        return {
+            "stats": self.stats.to_dict(),
+            "sketch": self.sketch.to_dict() if self.sketch is not None else None,
+            "reference": self.reference,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "StreamMetric":
+        sketch = DDSketch.from_dict(payload["sketch"]) if payload["sketch"] is not None else None
+        metric = cls(sketch)
+        metric.stats = RunningStats.from_dict(payload["stats"])
+        metric.reference = payload["reference"]
+        return metric
+
+
+class StreamingSeries:
+    """Aggregate view over streamed metrics (same interface as ``_ListSeries``).
+
+    Only series named in ``quantiles`` carry a sketch. With ``check=True`` every
+    metric also keeps its raw values and each answer is compared with the exact
+    one: means, peaks and the like must match exactly, sketch quantiles must
+    stay within ``relative_accuracy``.
+    """
+
+    def __init__(
+        self,
+        quantiles: Iterable[str] = (),
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        check: bool = False,
+    ) -> None:
+        self.quantiles = set(quantiles)
+        self.relative_accuracy = relative_accuracy
+        self.check = check
+        self.metrics: Dict[str, StreamMetric] = {}
+
+    def metric(self, name: str) -> StreamMetric:
+        if name not in self.metrics:
+            sketch = DDSketch(self.relative_accuracy) if name in self.quantiles else None
+            self.metrics[name] = StreamMetric(sketch, keep_values=self.check)
+        return self.metrics[name]
+
+    def to_dict(self) -> dict:
+        """JSON-ready state (floats keep their exact ``repr``), for checkpoints."""
+        return {
+            "quantiles": sorted(self.quantiles),
+            "relative_accuracy": self.relative_accuracy,
+            "check": self.check,
+            "metrics": {name: metric.to_dict() for name, metric in self.metrics.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "StreamingSeries":
+        series = cls(payload["quantiles"], payload["relative_accuracy"], payload["check"])
+        series.metrics = {name: StreamMetric.from_dict(metric) for name, metric in payload["metrics"].items()}
+        return series
+
+    def _verify(self, name: str, label: str, value: float, exact: float, tolerance: float = 0.0) -> float:
+        if abs(value - exact) > tolerance * abs(exact):
+            raise StatsCheckError(
+                f"{name} {label}: streamed {value!r} vs exact {exact!r} (allowed relative error {tolerance})"
+            )
+        return value
+
+    def avg(self, name: str) -> float:
+        metric = self.metrics[name]
+        value = metric.stats.mean()
+        if self.check:
+            values = metric.reference
+            self._verify(name, "avg", value, sum(values) / max(len(values), 1))
+        return value
+
+    def p95(self, name: str) -> float:
+        metric = self.metrics[name]
+        if metric.sketch is None:
+            raise KeyError(f"No quantile sketch configured for {name}")
+        if metric.stats.count == 0:
+            return 0.0
+        value = metric.sketch.value_at_rank(p95_rank(metric.stats.count))
+        if self.check:
+            ordered = sorted(metric.reference)
+            # Allow for the float rounding of gamma ** index on top of the bound.
+            self._verify(name, "p95", value, ordered[p95_rank(len(ordered))], self.relative_accuracy * (1.0 + 1e-9))
+        return value
+
+    def peak(self, name: str, absolute: bool = False) -> float:
+        metric = self.metrics[name]
+        value = metric.stats.abs_max if absolute else metric.stats.maximum
+        if self.check:
+            values = metric.reference
+            exact = max((abs(v) for v in values), default=0.0) if absolute else max(values)
+            self._verify(name, "max", value, exact)
+        return value
@@ -0,0 +1,174 @@
+"""Multi-seed sweep for the telemetry demo generator.
+
+Runs ``generate_demo_summary`` for every (seed, ticks) pair across a process
+pool and merges the results into one artifact: a row per run plus cross-seed
+percentile bands for every numeric stat.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.telemetry_replay_demo import ARTIFACT_DIR, ENGINES, generate_demo_summary
+from scripts.telemetry_stats import DEFAULT_RELATIVE_ACCURACY, STATS_MODES
+
+BAND_QUANTILES = (("p5", 0.05), ("p50", 0.5), ("p95", 0.95))
+
+
+def parse_seeds(spec: str) -> List[int]:
+    """Parse ``"1-100,250,300-310"`` into a sorted, de-duplicated seed list."""
+    seeds = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        if sep and first:
+            low, high = int(first), int(last)
+            if high < low:
+                raise ValueError(f"Empty seed range: {part}")
+            seeds.update(range(low, high + 1))
+        else:
+            seeds.add(int(part))
+    if not seeds:
+        raise ValueError("No seeds given")
+    return sorted(seeds)
+
+
+def _run_case(case: Tuple[int, int, str, str, float]) -> dict:
+    seed, ticks, engine, stats_mode, relative_accuracy = case
+    summary = generate_demo_summary(
+        seed,
+        ticks,
+        engine=engine,
+        stats_mode=stats_mode,
+        relative_accuracy=relative_accuracy,
+    ).summary
+    # Only the compact parts travel back to the parent; samples/series stay behind.
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "stats": summary["stats"],
+        "final": summary["final"],
+        "alerts": [alert["metric"] for alert in summary["alerts"]],
+    }
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return float(ordered[index])
+
+
+def build_bands(rows: Sequence[dict]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Cross-seed min/mean/percentiles/max of every numeric stat, grouped by tick length."""
+    grouped: Dict[int, List[dict]] = {}
+    for row in rows:
+        grouped.setdefault(row["ticks"], []).append(row)
+    bands: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for ticks, group in sorted(grouped.items()):
+        metrics: Dict[str, Dict[str, float]] = {}
+        for key, value in group[0]["stats"].items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            ordered = sorted(float(row["stats"][key]) for row in group)
+            band = {"min": ordered[0]}
+            band.update((label, _percentile(ordered, q)) for label, q in BAND_QUANTILES)
+            band["max"] = ordered[-1]
+            band["mean"] = sum(ordered) / len(ordered)
+            metrics[key] = band
+        bands[str(ticks)] = {"runs": len(group), "metrics": metrics}
+    return bands
+
+
+def run_sweep(
+    seeds: Sequence[int],
+    tick_lengths: Sequence[int],
+    jobs: int = 0,
+    engine: str = "scalar",
+    stats_mode: str = "exact",
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+) -> dict:
+    """Run every seed at every tick length; ``jobs`` <= 0 uses all cores, 1 stays in-process."""
+    cases = [(seed, ticks, engine, stats_mode, relative_accuracy) for ticks in tick_lengths for seed in seeds]
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, len(cases))
+    if jobs <= 1:
+        rows = [_run_case(case) for case in cases]
+    else:
+        # Several cases per task keeps IPC overhead flat as the sweep grows.
+        chunksize = max(1, len(cases) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rows = list(pool.map(_run_case, cases, chunksize=chunksize))
+    return {
+        "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "generator": "telemetry_sweep.py",
+        "engine": engine,
+        "stats_mode": stats_mode,
+        "seeds": list(seeds),
+        "ticks": list(tick_lengths),
+        "runs": rows,
+        "bands": build_bands(rows),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the telemetry demo across many seeds.")
+    parser.add_argument("--seeds", default="1-100", help="Seed list/ranges, e.g. '1-200,512' (default: %(default)s).")
+    parser.add_argument(
+        "--ticks",
+        default="200",
+        help="Comma-separated tick lengths; every seed runs at each (default: %(default)s).",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes (default: all cores; 1 = in-process).")
+    parser.add_argument("--engine", choices=ENGINES, default="scalar", help="Generator backend (default: %(default)s).")
+    parser.add_argument("--stats", choices=STATS_MODES, default="exact", help="Series aggregation (default: %(default)s).")
+    parser.add_argument(
+        "--stats-accuracy",
+        type=float,
+        default=DEFAULT_RELATIVE_ACCURACY,
+        help="Relative error bound for streamed p95 values (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Aggregate artifact path (default: <artifacts>/sweep.json).",
+    )
+    args = parser.parse_args()
+
+    try:
+        seeds = parse_seeds(args.seeds)
+        tick_lengths = [int(value) for value in args.ticks.split(",") if value.strip()]
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not tick_lengths:
+        parser.error("--ticks needs at least one value")
+
+    result = run_sweep(
+        seeds,
+        tick_lengths,
+        jobs=args.jobs,
+        engine=args.engine,
+        stats_mode=args.stats,
+        relative_accuracy=args.stats_accuracy,
+    )
+    output = args.output or ARTIFACT_DIR / "sweep.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        json.dump(result, handle, indent=2)
+    print(f"Wrote {output} ({len(result['runs'])} runs)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
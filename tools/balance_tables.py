@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Sectioned parser and validator for data/balance.tsv.
+
+balance.tsv is a series of [SECTION] banners. Text before the first banner is
+free-form commentary, as in Balance.gd. Key/value sections (CONSTANTS,
+PRESTIGE, HUD_FLAGS) hold "KEY<TAB>value" lines. The other sections are
+tables whose first line is the header. iter_sections reads the file in a
+single pass and yields each section as a typed tsv_loader Table. It also
+records the file line of every row, so errors point at real lines.
+
+Cross-section checks:
+  - visible UPGRADE rows in [PRICES] must name an id in [UPGRADES] (hidden rows
+    may reserve ids for upgrades that are not in the table yet);
+  - [UPGRADES] requires must be "-" or factory>=N with N a tier in [FACTORY_TIERS];
+  - [RESEARCH] prereq must be "-" or a research id, without cycles.
+
+load_balance caches the parsed, validated result as a JSON artifact
+(default: data/balance.compiled.json) keyed by the source SHA-256 and a
+digest of the parser. Tooling can load that instead of re-parsing.
+"""
+
+import argparse
+import hashlib
+import json
+import pathlib
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import tsv_loader
+from tsv_loader import Column, Table, TableSchema, parse_table
+
+BALANCE_PATH = pathlib.Path("data/balance.tsv")
+ARTIFACT_VERSION = 1
+BOOL_TOKENS = frozenset(("0", "1", "true", "false", "yes", "no", "on", "off"))
+REQUIRES_PATTERN = re.compile(r"factory>=(\d+)")
+
+VALUE_SECTIONS = {
+    "CONSTANTS": TableSchema([Column("key", "id"), Column("value", "float")]),
+    "PRESTIGE": TableSchema([Column("key", "id"), Column("value", "float")]),
+    "HUD_FLAGS": TableSchema([Column("key", "id"), Column("value")]),
+}
+TABLE_SECTIONS = {
+    "UPGRADES": TableSchema(
+        [
+            Column("id", "id"),
+            Column("kind"),
+            Column("stat"),
+            Column("mult_add", "float"),
+            Column("mult_mul", "float", min=0.0),
+            Column("base_cost", "float", min=0.0),
+            Column("growth", "float", min=1.0),
+            Column("requires"),
+        ]
+    ),
+    "FACTORY_TIERS": TableSchema(
+        [
+            Column("tier", "int", min=1),
+            Column("display_name"),
+            Column("cap_mult", "float", min=0.0),
+            Column("prod_mult", "float", min=0.0),
+            Column("unlocks"),
+            Column("cost", "float", min=0.0),
+        ]
+    ),
+    "AUTOMATION": TableSchema(
+        [Column("id", "id"), Column("type"), Column("value", "float"), Column("description", required=False)]
+    ),
+    "RESEARCH": TableSchema(
+        [
+            Column("id", "id"),
+            Column("branch"),
+            Column("stat"),
+            Column("mult_add", "float"),
+            Column("mult_mul", "float", min=0.0),
+            Column("cost", "float", min=0.0),  # Balance.gd reads int(_to_number(...)), so "150.0" loads
+            Column("prereq"),
+        ]
+    ),
+    "PRICES": TableSchema(
+        [
+            Column("id", "id"),
+            Column("type"),
+            Column("price", "float", min=0.0),
+            Column("visible"),
+            Column("notes", required=False),
+        ]
+    ),
+}
+KEY_COLUMNS = {"FACTORY_TIERS": "tier"}  # unique key per section; "key" or "id" otherwise
+BOOL_COLUMNS = {"HUD_FLAGS": "value", "PRICES": "visible"}
+INTEGRAL_COLUMNS = {"RESEARCH": "cost"}
+HEADER_ALIASES = {"PRICES": {"ID": "id"}}  # header spellings Balance.gd also skips
+
+
+class Section(NamedTuple):
+    name: str
+    line: int  # file line of the [NAME] banner
+    table: Table
+    lines: List[int]  # file line of each data row
+
+    def where(self, index: Optional[int] = None) -> str:
+        line = self.line if index is None else self.lines[index]
+        return f"[{self.name}] line {line}"
+
+    def values(self) -> Dict[str, object]:
+        """Key/value sections as a dict (last duplicate wins, as in Balance.gd)."""
+        return dict(zip(self.table.columns["key"], self.table.columns["value"]))
+
+
+def _section(name: str, line: int, rows: List[Tuple[int, str]]) -> Section:
+    if name in VALUE_SECTIONS:
+        header, body = "key\tvalue", rows
+        schema: Optional[TableSchema] = VALUE_SECTIONS[name]
+    else:
+        header, body = (rows[0][1], rows[1:]) if rows else ("", [])
+        schema = TABLE_SECTIONS.get(name)
+        aliases = HEADER_ALIASES.get(name)
+        if aliases:
+            header = "\t".join(aliases.get(cell.strip(), cell) for cell in header.split("\t"))
+    table = parse_table("\n".join([header] + [text for _, text in body]), schema)
+    return Section(name, line, table, [number for number, _ in body])
+
+
+def iter_sections(lines: Iterable[str]) -> Iterator[Section]:
+    """Yield each section as soon as the next banner (or the end) is reached."""
+    name: Optional[str] = None
+    start = 0
+    rows: List[Tuple[int, str]] = []
+    for number, raw in enumerate(lines, start=1):
+        raw = raw.rstrip("\r\n")
+        if raw.strip() == "" or raw.startswith("#"):
+            continue
+        if raw.startswith("[") and raw.endswith("]"):
+            if name is not None:
+                yield _section(name, start, rows)
+            name, start, rows = raw[1:-1], number, []
+            continue
+        if name is not None:
+            rows.append((number, raw))
+    if name is not None:
+        yield _section(name, start, rows)
+
+
+def parse_balance(lines: Iterable[str]) -> Tuple[Dict[str, Section], List[str]]:
+    sections: Dict[str, Section] = {}
+    errors: List[str] = []
+    for section in iter_sections(lines):
+        if section.name in sections:
+            errors.append(f"{section.where()}: duplicate section (first at line {sections[section.name].line}).")
+        sections[section.name] = section
+    return sections, errors
+
+
+def _section_errors(section: Section) -> List[str]:
+    table = section.table
+    errors: List[str] = []
+    for error in table.errors():
+        index = error.row - 2
+        errors.append(f"{section.where(index if index >= 0 else None)}: {error.message}")
+    key = KEY_COLUMNS.get(section.name, "key" if section.name in VALUE_SECTIONS else "id")
+    if key in table.columns:
+        seen: Dict[str, int] = {}
+        for index, value in enumerate(table.text(key)):
+            if value in seen:
+                errors.append(f"{section.where(index)}: duplicate {key} '{value}' (first at line {seen[value]}).")
+            else:
+                seen[value] = section.lines[index]
+    column = BOOL_COLUMNS.get(section.name)
+    if column in table.columns:
+        errors.extend(
+            f"{section.where(index)}: {column} '{value}' is not a boolean."
+            for index, value in enumerate(table.text(column))
+            if value.lower() not in BOOL_TOKENS
+        )
+    column = INTEGRAL_COLUMNS.get(section.name)
+    if column in table.columns:
+        invalid = set(table.invalid.get(column, ()))
+        errors.extend(
+            f"{section.where(index)}: {column} {value:g} must be a whole number."
+            for index, value in enumerate(table.columns[column])
+            if index not in invalid and value == value and not float(value).is_integer()
+        )
+    return errors
+
+
+def validate_balance(sections: Dict[str, Section]) -> List[str]:
+    """Per-section schema checks, then cross-section references."""
+    errors: List[str] = []
+    for name in list(VALUE_SECTIONS) + list(TABLE_SECTIONS):
+        if name not in sections:
+            errors.append(f"[{name}] missing section.")
+    for section in sections.values():
+        errors.extend(_section_errors(section))
+
+    upgrades = sections.get("UPGRADES")
+    tiers = sections.get("FACTORY_TIERS")
+    prices = sections.get("PRICES")
+    research = sections.get("RESEARCH")
+    upgrade_ids = set(upgrades.table.text("id")) if upgrades else set()
+    tier_ids = set(tiers.table.columns["tier"]) if tiers and "tier" in tiers.table.columns else set()
+
+    if upgrades and "requires" in upgrades.table.columns:
+        for index, requires in enumerate(upgrades.table.text("requires")):
+            if requires in ("", "-"):
+                continue
+            match = REQUIRES_PATTERN.fullmatch(requires)
+            if match is None:
+                errors.append(f"{upgrades.where(index)}: unsupported requires '{requires}' (expected factory>=N).")
+            elif tiers and int(match.group(1)) not in tier_ids:
+                errors.append(f"{upgrades.where(index)}: requires '{requires}' names no [FACTORY_TIERS] tier.")
+
+    if prices and upgrades:
+        table = prices.table
+        for index, (price_id, kind, visible) in enumerate(zip(table.text("id"), table.text("type"), table.text("visible"))):
+            if kind == "UPGRADE" and price_id not in upgrade_ids and visible.lower() in ("1", "true", "yes", "on"):
+                errors.append(f"{prices.where(index)}: id '{price_id}' not found in [UPGRADES].")
+
+    if research and "prereq" in research.table.columns:
+        ids = research.table.text("id")
+        prereqs = dict(zip(ids, research.table.text("prereq")))
+        for index, (node, prereq) in enumerate(zip(ids, research.table.text("prereq"))):
+            if prereq not in ("", "-") and prereq not in prereqs:
+                errors.append(f"{research.where(index)}: prereq '{prereq}' not found in [RESEARCH].")
+        # Each id has at most one prereq, so following chains finds every cycle in linear time.
+        done: Set[str] = set()
+        for node in ids:
+            path: List[str] = []
+            current = node
+            while current in prereqs and current not in done and current not in path:
+                path.append(current)
+                current = prereqs[current]
+            if current in path:
+                cycle = path[path.index(current):] + [current]
+                errors.append(f"[RESEARCH] prereq cycle: {' -> '.join(cycle)}")
+            done.update(path)
+    return errors
+
+
+def parser_digest() -> str:
+    """Version key for artifacts; changes whenever this parser or the loader changes."""
+    digest = hashlib.sha256(str(ARTIFACT_VERSION).encode("utf-8"))
+    for source in (__file__, tsv_loader.__file__):
+        digest.update(pathlib.Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def compile_balance(sections: Dict[str, Section], source_sha256: str, errors: List[str]) -> Dict[str, object]:
+    """JSON-ready, column-oriented form of the parsed sections."""
+    return {
+        "version": ARTIFACT_VERSION,
+        "parser": parser_digest(),
+        "source_sha256": source_sha256,
+        "errors": errors,
+        "sections": {
+            name: {
+                "line": section.line,
+                "rows": section.lines,
+                "columns": {column: list(values) for column, values in section.table.columns.items()},
+            }
+            for name, section in sections.items()
+        },
+    }
+
+
+def default_artifact(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.stem}.compiled.json")
+
+
+def load_balance(
+    path: pathlib.Path = BALANCE_PATH, artifact: Optional[pathlib.Path] = None
+) -> Tuple[Dict[str, object], bool]:
+    """Compiled balance data and whether it came from a fresh artifact."""
+    data = path.read_bytes()
+    source_sha256 = hashlib.sha256(data).hexdigest()
+    artifact = artifact or default_artifact(path)
+    try:
+        cached = json.loads(artifact.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = None
+    if (
+        isinstance(cached, dict)
+        and cached.get("source_sha256") == source_sha256
+        and cached.get("parser") == parser_digest()
+    ):
+        return cached, True
+    sections, errors = parse_balance(data.decode("utf-8").splitlines())
+    errors += validate_balance(sections)
+    compiled = compile_balance(sections, source_sha256, errors)
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    scratch = artifact.with_suffix(".tmp")
+    scratch.write_text(json.dumps(compiled, separators=(",", ":")) + "\n", encoding="utf-8")
+    scratch.replace(artifact)
+    return compiled, False
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate data/balance.tsv and refresh its compiled artifact.")
+    parser.add_argument("--balance", type=pathlib.Path, default=BALANCE_PATH, help="Balance TSV (default: %(default)s).")
+    parser.add_argument(
+        "--artifact",
+        type=pathlib.Path,
+        help="Compiled JSON artifact (default: <balance dir>/<stem>.compiled.json).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.balance.exists():
+        print(f"[{args.balance}] missing file.")
+        return 1
+    compiled, cached = load_balance(args.balance, args.artifact)
+    errors = compiled["errors"]
+    artifact = args.artifact or default_artifact(args.balance)
+    print(f"[balance_tables] {len(compiled['sections'])} sections, artifact {artifact} ({'cached' if cached else 'rebuilt'})")
+    if errors:
+        print(f"[{args.balance}] validation errors:")
+        for error in errors:
+            print(f"  - {error}")
+        return 1
+    print(f"[{args.balance}] ✅ No schema issues found.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
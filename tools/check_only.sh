@@ -19,7 +19,7 @@ fi
 mkdir -p logs
 
 # Validate TSV schemas before running Godot check-only.
-python3 tools/validate_tables.py --tables=data/upgrade.tsv,data/research.tsv,data/environment_profiles.tsv,data/materials.tsv --schema=docs/data/Schemas.md
+python3 tools/validate_tables.py --tables=data/upgrade.tsv,data/research.tsv,data/environment_profiles.tsv,data/materials.tsv,data/balance.tsv --schema=docs/data/Schemas.md
 
 # Guard against hangs: disable remote debugger socket and add an optional timeout.
 TIMEOUT_SECS="${CHECK_ONLY_TIMEOUT:-300}"
@@ -5,6 +5,12 @@ Generate telemetry dashboards or diff key metrics between two replay summaries.
 Usage:
     python3 tools/gen_dashboard.py --input reports/nightly --output reports/dashboard/index.html
     python3 tools/gen_dashboard.py --diff reports/nightly/latest.json artifacts/telemetry/kpi.json
+
+    python3 tools/gen_dashboard.py --gate sweeps/main.json sweeps/candidate.json
+
+Parsed runs are cached in a SQLite catalog (default: <input>/.gen_dashboard_catalog.sqlite)
+keyed by input root, folder and summary.json mtime/size, so repeat builds only parse new or
+changed runs. Several input roots can share one catalog.
 """
 
 from __future__ import annotations
@@ -12,14 +18,69 @@ from __future__ import annotations
 import argparse
 import json
 import math
+import mmap
+import os
+import re
+import sqlite3
 import statistics
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 
 MetricValue = Optional[float]
+# Top-level summary fields the dashboard and diff read; samples/shipments/series are skipped.
+SUMMARY_KEYS = ("timestamp", "stats", "final", "summary", "metadata", "alerts")
+# Metrics charted as trends and checked against their rolling baseline.
+TREND_METRICS = [
+	("sandbox_tick_ms_p95", "Sandbox p95 tick"),
+	("sandbox_render_ms_p95", "Sandbox render p95"),
+	("sandbox_render_fallback_ratio", "Sandbox fallback ratio"),
+	("environment_tick_ms_p95", "Environment p95 tick"),
+	("economy_tick_ms_p95", "Economy p95 tick"),
+	("eco_ship_ms_p95", "Economy shipment p95"),
+	("pps_avg", "Average PPS"),
+	("ci_avg", "Average Comfort Index"),
+	("power_ratio_avg", "Average power ratio"),
+]
+BASELINE_WINDOW = 14
+BASELINE_MIN_RUNS = 3
+# Robust z = (value - median) / (1.4826 * MAD); 3.5 is the Iglewicz-Hoaglin outlier cut-off.
+MAD_SCALE = 1.4826
+ROBUST_Z_THRESHOLD = 3.5
+# Ignore statistically significant but tiny shifts on very stable metrics.
+BASELINE_MIN_RELATIVE = 0.05
+SPARKLINE_WIDTH = 240
+SPARKLINE_HEIGHT = 40
+# Hard per-run budgets (ms) shared by the dashboard alerts and --gate.
+BUDGETS = [
+	("economy_tick_ms_p95", "Economy tick p95", 10.0),
+	("eco_ship_ms_p95", "Economy shipment p95", 7.0),
+]
+# Timing metrics --gate tests for regressions (higher is worse).
+GATE_METRICS = [
+	"sandbox_tick_ms_p95",
+	"sandbox_render_ms_p95",
+	"environment_tick_ms_p95",
+	"economy_tick_ms_p95",
+	"eco_ship_ms_p95",
+	"automation_tick_ms_p95",
+	"power_tick_ms_p95",
+]
+# Family-wise false-positive rate of --gate, split across metrics (Bonferroni).
+GATE_ALPHA = 0.05
+# Smallest Hodges-Lehmann shift, relative to the baseline median, that can fail the gate.
+GATE_MIN_SHIFT = 0.02
+# Largest n_baseline * n_candidate for which the exact Mann-Whitney null distribution is used.
+GATE_EXACT_MAX_PAIRS = 400
+GATE_EXIT_CODES = {"pass": 0, "fail": 1, "inconclusive": 2}
+CATALOG_NAME = ".gen_dashboard_catalog.sqlite"
+# Bump when RunRecord or build_run_record changes so cached rows are rebuilt.
+CATALOG_VERSION = 2
 
 
 @dataclass
@@ -49,13 +110,61 @@ def parse_args() -> argparse.Namespace:
 		type=Path,
 		help="Compare two summary JSON files (baseline -> candidate) and print metric deltas.",
 	)
+	parser.add_argument(
+		"--gate",
+		nargs=2,
+		metavar=("BASELINE", "CANDIDATE"),
+		type=Path,
+		help=(
+			"Regression gate between two sets of runs (summary JSON, sweep.json, or a nightly folder); "
+			"prints a JSON verdict and exits 1 on regression, 2 if inconclusive."
+		),
+	)
+	parser.add_argument(
+		"--gate-alpha",
+		type=float,
+		default=GATE_ALPHA,
+		help="Family-wise false-positive rate across gated metrics (default: %(default)s).",
+	)
+	parser.add_argument(
+		"--gate-min-shift",
+		type=float,
+		default=GATE_MIN_SHIFT,
+		help="Smallest relative slowdown that can fail the gate (default: %(default)s).",
+	)
+	parser.add_argument("--gate-output", type=Path, help="Also write the gate verdict JSON to this path.")
+	parser.add_argument(
+		"--catalog",
+		type=Path,
+		help=f"Run catalog path (default: <input>/{CATALOG_NAME}).",
+	)
+	parser.add_argument("--no-catalog", action="store_true", help="Parse every summary.json without the run catalog.")
+	parser.add_argument(
+		"--baseline-window",
+		type=int,
+		default=BASELINE_WINDOW,
+		help="Previous runs in the rolling median/MAD baseline (default: %(default)s).",
+	)
+	parser.add_argument(
+		"--jobs",
+		type=int,
+		default=1,
+		help="Worker processes for parsing summaries (0 = all cores, default: 1).",
+	)
 	args = parser.parse_args()
-	if args.diff:
+	if args.diff and args.gate:
+		parser.error("--diff and --gate are mutually exclusive.")
+	if args.gate:
+		if args.input or args.output:
+			parser.error("--gate cannot be combined with --input/--output.")
+		if not 0.0 < args.gate_alpha < 1.0:
+			parser.error("--gate-alpha must be between 0 and 1.")
+	elif args.diff:
 		if args.input or args.output:
 			parser.error("--diff cannot be combined with --input/--output.")
 	else:
 		if args.input is None or args.output is None:
-			parser.error("--input and --output are required unless using --diff.")
+			parser.error("--input and --output are required unless using --diff or --gate.")
 	return args
 
 
@@ -66,9 +175,92 @@ def gather_run_directories(base_path: Path) -> List[Path]:
 	return dirs
 
 
-def load_summary(summary_path: Path) -> Dict:
-	with summary_path.open("r", encoding="utf-8") as handle:
-		return json.load(handle)
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+_STRING_RE = re.compile(_STRING)
+_SCALAR_RE = re.compile(rb"[^,}\]\s]+")
+_FLAT = rb'(?:[^\[\]{}"]++|' + _STRING + rb")*+"
+# Everything up to the next bracket that closes (or opens a nested container in) the
+# current level; strings and flat objects/arrays are consumed whole inside the regex engine.
+_SKIP_RE = re.compile(rb'(?:[^\[\]{}"]++|' + _STRING + rb"|\{" + _FLAT + rb"\}|\[" + _FLAT + rb"\])*+")
+
+
+def _skip_ws(data, pos: int) -> int:
+	return _WHITESPACE.match(data, pos).end()
+
+
+def _skip_value(data, pos: int) -> int:
+	"""End offset of the JSON value starting at ``pos`` (bracket-matched, not validated)."""
+	head = data[pos:pos + 1]
+	if head == b'"':
+		match = _STRING_RE.match(data, pos)
+		if match is None:
+			raise ValueError(f"Unterminated string at offset {pos}")
+		return match.end()
+	if head not in (b"[", b"{"):
+		match = _SCALAR_RE.match(data, pos)
+		if match is None:
+			raise ValueError(f"Expected a value at offset {pos}")
+		return match.end()
+	depth = 1
+	pos += 1
+	while depth:
+		pos = _SKIP_RE.match(data, pos).end()
+		char = data[pos:pos + 1]
+		if char in (b"[", b"{"):
+			depth += 1
+		elif char in (b"]", b"}"):
+			depth -= 1
+		else:
+			raise ValueError(f"Unbalanced JSON container at offset {pos}")
+		pos += 1
+	return pos
+
+
+def _select_fields(data, keys: Iterable[str]) -> Dict:
+	wanted = set(keys)
+	pos = _skip_ws(data, 0)
+	if data[pos:pos + 1] != b"{":
+		return json.loads(bytes(data))
+	result: Dict = {}
+	pos = _skip_ws(data, pos + 1)
+	if data[pos:pos + 1] == b"}":
+		return result
+	while True:
+		match = _STRING_RE.match(data, pos)
+		if match is None:
+			raise ValueError(f"Expected an object key at offset {pos}")
+		key = json.loads(match.group())
+		pos = _skip_ws(data, match.end())
+		if data[pos:pos + 1] != b":":
+			raise ValueError(f"Expected ':' at offset {pos}")
+		pos = _skip_ws(data, pos + 1)
+		end = _skip_value(data, pos)
+		if key in wanted:
+			result[key] = json.loads(data[pos:end])
+		pos = _skip_ws(data, end)
+		separator = data[pos:pos + 1]
+		if separator == b"}":
+			return result
+		if separator != b",":
+			raise ValueError(f"Expected ',' or '}}' at offset {pos}")
+		pos = _skip_ws(data, pos + 1)
+
+
+def load_summary(summary_path: Path, keys: Optional[Iterable[str]] = None) -> Dict:
+	"""Load a summary JSON file; with ``keys``, decode only those top-level fields.
+
+	Selective loads memory-map the file and skip unwanted values without decoding
+	them, so multi-MB ``samples``/``series`` arrays cost neither time nor memory.
+	"""
+	if keys is None:
+		with summary_path.open("r", encoding="utf-8") as handle:
+			return json.load(handle)
+	with summary_path.open("rb") as handle:
+		if os.fstat(handle.fileno()).st_size == 0:
+			raise ValueError(f"Empty summary file: {summary_path}")
+		with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			return _select_fields(data, keys)
 
 
 def _collect_numeric_values(source: Dict[str, object], prefix: str = "") -> Dict[str, float]:
@@ -143,8 +335,8 @@ def run_diff(baseline_path: Path, candidate_path: Path) -> None:
 		raise SystemExit(f"Baseline summary not found: {baseline_path}")
 	if not candidate_path.exists():
 		raise SystemExit(f"Candidate summary not found: {candidate_path}")
-	baseline_data = load_summary(baseline_path)
-	candidate_data = load_summary(candidate_path)
+	baseline_data = load_summary(baseline_path, SUMMARY_KEYS)
+	candidate_data = load_summary(candidate_path, SUMMARY_KEYS)
 	baseline_metrics = collect_metrics(baseline_data)
 	candidate_metrics = collect_metrics(candidate_data)
 	all_keys = sorted(set(baseline_metrics.keys()) | set(candidate_metrics.keys()))
@@ -193,6 +385,184 @@ def run_diff(baseline_path: Path, candidate_path: Path) -> None:
 		for entry in new_alerts:
 			print(f"    • {entry}")
 
+def load_gate_runs(path: Path) -> List[Dict[str, float]]:
+	"""Per-run numeric stats from a summary JSON, a telemetry_sweep.py artifact, or a nightly folder."""
+	if path.is_dir():
+		return [record.stats for record in load_runs(path)]
+	if not path.exists():
+		raise SystemExit(f"Gate input not found: {path}")
+	payload = load_summary(path, ("stats", "runs"))
+	rows = payload.get("runs")
+	payloads = rows if isinstance(rows, list) else [payload]
+	runs: List[Dict[str, float]] = []
+	for payload in payloads:
+		stats = payload.get("stats") if isinstance(payload, dict) else None
+		if isinstance(stats, dict):
+			runs.append(_collect_numeric_values(stats))
+	return runs
+
+
+def _mann_whitney_null(n_candidate: int, n_baseline: int) -> List[int]:
+	"""Number of orderings giving each U in 0..n_candidate * n_baseline (no ties)."""
+	# counts[b][u] for the current candidate count; candidates are added one at a time.
+	counts = [[1] for _ in range(n_baseline + 1)]
+	for candidates in range(1, n_candidate + 1):
+		updated = [[1]]
+		for baseline in range(1, n_baseline + 1):
+			size = candidates * baseline + 1
+			row = [0] * size
+			# Largest value is a candidate (beats every baseline run) or a baseline run (beats nothing).
+			for u, ways in enumerate(counts[baseline]):
+				row[u + baseline] += ways
+			for u, ways in enumerate(updated[baseline - 1]):
+				row[u] += ways
+			updated.append(row)
+		counts = updated
+	return counts[n_baseline]
+
+
+def mann_whitney_greater(baseline: Sequence[float], candidate: Sequence[float]) -> Tuple[float, float]:
+	"""One-sided Mann-Whitney U test that ``candidate`` tends to be larger; returns (U, p)."""
+	n_base, n_cand = len(baseline), len(candidate)
+	ordered = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+	ranks = [0.0] * len(ordered)
+	tie_term = 0.0
+	start = 0
+	while start < len(ordered):
+		end = start
+		while end + 1 < len(ordered) and ordered[end + 1][0] == ordered[start][0]:
+			end += 1
+		for index in range(start, end + 1):
+			ranks[index] = (start + end) / 2.0 + 1.0
+		tied = end - start + 1
+		tie_term += tied ** 3 - tied
+		start = end + 1
+	rank_sum = sum(rank for rank, (_, side) in zip(ranks, ordered) if side == 1)
+	u_stat = rank_sum - n_cand * (n_cand + 1) / 2.0
+	if tie_term == 0.0 and n_base * n_cand <= GATE_EXACT_MAX_PAIRS:
+		null = _mann_whitney_null(n_cand, n_base)
+		return u_stat, sum(null[int(u_stat):]) / sum(null)
+	total = n_base + n_cand
+	mean = n_base * n_cand / 2.0
+	variance = n_base * n_cand / 12.0 * ((total + 1) - tie_term / (total * (total - 1)))
+	if variance <= 0.0:
+		return u_stat, 1.0
+	z_score = (u_stat - mean - 0.5) / math.sqrt(variance)
+	return u_stat, 0.5 * math.erfc(z_score / math.sqrt(2.0))
+
+
+def hodges_lehmann_shift(baseline: Sequence[float], candidate: Sequence[float]) -> float:
+	"""Median of all candidate - baseline differences (the shift estimate matching the U test)."""
+	return statistics.median(c - b for c in candidate for b in baseline)
+
+
+def run_gate(
+	baseline_runs: List[Dict[str, float]],
+	candidate_runs: List[Dict[str, float]],
+	alpha: float = GATE_ALPHA,
+	min_shift: float = GATE_MIN_SHIFT,
+) -> Dict:
+	"""Compare timing metrics across runs and check the hard budgets on the candidate.
+
+	Each metric is tested at ``alpha / len(GATE_METRICS)``, so a candidate drawn
+	from the baseline's distribution fails with probability at most ``alpha``.
+	"""
+	alpha_per_metric = alpha / len(GATE_METRICS)
+	metrics: List[Dict] = []
+	for key in GATE_METRICS:
+		base = [run[key] for run in baseline_runs if math.isfinite(run.get(key, math.nan))]
+		cand = [run[key] for run in candidate_runs if math.isfinite(run.get(key, math.nan))]
+		entry: Dict[str, object] = {"metric": key, "baseline_runs": len(base), "candidate_runs": len(cand)}
+		metrics.append(entry)
+		if not base or not cand:
+			entry["status"] = "missing"
+			continue
+		u_stat, p_value = mann_whitney_greater(base, cand)
+		shift = hodges_lehmann_shift(base, cand)
+		base_median = statistics.median(base)
+		relative = shift / base_median if base_median else math.inf if shift > 0 else 0.0
+		entry.update(
+			baseline_median=base_median,
+			candidate_median=statistics.median(cand),
+			shift=shift,
+			# null when the baseline median is 0 and the candidate is slower (no finite ratio).
+			shift_relative=relative if math.isfinite(relative) else None,
+			u=u_stat,
+			p_value=p_value,
+		)
+		if p_value <= alpha_per_metric and relative >= min_shift:
+			entry["status"] = "regression"
+		elif 1.0 / math.comb(len(base) + len(cand), len(cand)) > alpha_per_metric:
+			# Even a complete separation could not reach significance with this many runs.
+			entry["status"] = "inconclusive"
+		else:
+			entry["status"] = "pass"
+	budgets: List[Dict] = []
+	for key, label, limit in BUDGETS:
+		values = [run[key] for run in candidate_runs if math.isfinite(run.get(key, math.nan))]
+		if not values:
+			continue
+		over = sum(1 for value in values if value > limit)
+		budgets.append(
+			{
+				"metric": key,
+				"label": label,
+				"limit_ms": limit,
+				"worst_ms": max(values),
+				"runs_over": over,
+				"status": "fail" if over else "pass",
+			}
+		)
+	statuses = {entry["status"] for entry in metrics} | {entry["status"] for entry in budgets}
+	if "regression" in statuses or "fail" in statuses:
+		verdict = "fail"
+	elif "inconclusive" in statuses or not any(entry["status"] == "pass" for entry in metrics):
+		verdict = "inconclusive"
+	else:
+		verdict = "pass"
+	return {
+		"verdict": verdict,
+		"test": "mann-whitney-u (one-sided, candidate slower)",
+		"alpha": alpha,
+		"alpha_per_metric": alpha_per_metric,
+		"min_shift": min_shift,
+		"baseline_runs": len(baseline_runs),
+		"candidate_runs": len(candidate_runs),
+		"metrics": metrics,
+		"budgets": budgets,
+	}
+
+
+def print_gate_report(result: Dict) -> None:
+	"""Human-readable gate table on stderr; stdout carries the JSON verdict."""
+	out = sys.stderr
+	print(
+		f"Regression gate: {result['baseline_runs']} baseline vs {result['candidate_runs']} candidate runs "
+		f"(alpha {result['alpha']}, {result['alpha_per_metric']:.4f} per metric)",
+		file=out,
+	)
+	header = f"{'Metric':<28} {'Baseline':>10} {'Candidate':>10} {'Shift%':>8} {'p':>10}  Status"
+	print(header, file=out)
+	print("-" * len(header), file=out)
+	for entry in result["metrics"]:
+		if entry["status"] == "missing":
+			print(f"{entry['metric']:<28} {'—':>10} {'—':>10} {'—':>8} {'—':>10}  missing", file=out)
+			continue
+		print(
+			f"{entry['metric']:<28} {format_number(entry['baseline_median'], 3):>10} "
+			f"{format_number(entry['candidate_median'], 3):>10} "
+			f"{format_percent(None if entry['shift_relative'] is None else entry['shift_relative'] * 100.0, 1):>8} {entry['p_value']:>10.2e}  {entry['status']}",
+			file=out,
+		)
+	for entry in result["budgets"]:
+		print(
+			f"Budget {entry['label']}: worst {entry['worst_ms']:.2f} ms vs {entry['limit_ms']:g} ms, "
+			f"{entry['runs_over']} run(s) over -> {entry['status']}",
+			file=out,
+		)
+	print(f"Verdict: {result['verdict'].upper()}", file=out)
+
+
 def parse_timestamp(raw: str) -> datetime:
 	# Examples: "2025-10-26 15:50:35"
 	return datetime.strptime(raw, "%Y-%m-%d %H:%M:%S")
@@ -202,7 +572,7 @@ def build_run_record(folder: Path) -> Optional[RunRecord]:
 	summary_file = folder / "summary.json"
 	if not summary_file.exists():
 		return None
-	data = load_summary(summary_file)
+	data = load_summary(summary_file, SUMMARY_KEYS)
 	stats_raw = data.get("stats")
 	if not isinstance(stats_raw, dict):
 		return None
@@ -231,56 +601,239 @@ def build_run_record(folder: Path) -> Optional[RunRecord]:
 	)
 
 
-def load_runs(base_path: Path) -> List[RunRecord]:
-	records: List[RunRecord] = []
-	for folder in gather_run_directories(base_path):
-		record = build_run_record(folder)
-		if record:
-			records.append(record)
+def record_to_json(record: Optional[RunRecord]) -> Optional[str]:
+	if record is None:
+		return None
+	return json.dumps({
+		"timestamp": record.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+		"label": record.label,
+		"stats": record.stats,
+		"final_ci": record.final_ci,
+		"final_bonus": record.final_bonus,
+		"final_pps": record.final_pps,
+		"render_view": record.render_view,
+	})
+
+
+def record_from_json(raw: Optional[str], folder: Path) -> Optional[RunRecord]:
+	if raw is None:
+		return None
+	payload = json.loads(raw)
+	return RunRecord(
+		timestamp=parse_timestamp(payload["timestamp"]),
+		label=payload["label"],
+		source_dir=folder,
+		stats=payload["stats"],
+		final_ci=payload["final_ci"],
+		final_bonus=payload["final_bonus"],
+		final_pps=payload["final_pps"],
+		render_view=payload["render_view"],
+	)
+
+
+class RunCatalog:
+	"""SQLite cache of build_run_record results keyed by input root, folder name and summary.json mtime/size.
+
+	Folders whose summary is unusable are cached too (as NULL records), so they
+	are not re-parsed until the file changes. Only rows under ``root`` are read
+	or pruned, so several input roots can share one catalog file.
+	"""
+
+	def __init__(self, path: Path, root: Path) -> None:
+		self.path = path
+		self.root = str(root.resolve())
+		self.hits = 0
+		self.misses = 0
+		self._conn = sqlite3.connect(str(path))
+		version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+		if version != CATALOG_VERSION:
+			self._conn.execute("DROP TABLE IF EXISTS runs")
+			self._conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS runs ("
+			"root TEXT NOT NULL, folder TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, record TEXT, "
+			"PRIMARY KEY (root, folder))"
+		)
+		self._rows = {
+			folder: (mtime_ns, size, record)
+			for folder, mtime_ns, size, record in self._conn.execute(
+				"SELECT folder, mtime_ns, size, record FROM runs WHERE root = ?", (self.root,)
+			)
+		}
+		self._seen: set = set()
+
+	def lookup(self, folder: Path, mtime_ns: int, size: int) -> Tuple[bool, Optional[RunRecord]]:
+		self._seen.add(folder.name)
+		row = self._rows.get(folder.name)
+		if row is None or row[0] != mtime_ns or row[1] != size:
+			self.misses += 1
+			return False, None
+		self.hits += 1
+		return True, record_from_json(row[2], folder)
+
+	def store(self, folder: Path, mtime_ns: int, size: int, record: Optional[RunRecord]) -> None:
+		self._conn.execute(
+			"INSERT OR REPLACE INTO runs (root, folder, mtime_ns, size, record) VALUES (?, ?, ?, ?, ?)",
+			(self.root, folder.name, mtime_ns, size, record_to_json(record)),
+		)
+
+	def close(self) -> None:
+		stale = [(self.root, folder) for folder in self._rows if folder not in self._seen]
+		if stale:
+			self._conn.executemany("DELETE FROM runs WHERE root = ? AND folder = ?", stale)
+		self._conn.commit()
+		self._conn.close()
+
+
+def _load_record(folder: Path) -> Tuple[Optional[RunRecord], Optional[str]]:
+	try:
+		return build_run_record(folder), None
+	except Exception as exc:  # surface per folder instead of aborting the whole build
+		return None, f"{type(exc).__name__}: {exc}"
+
+
+def _map_jobs(func: Callable, items: Sequence, jobs: int) -> List:
+	"""``map`` over ``items`` on a process pool (JSON decoding holds the GIL); results keep input order."""
+	jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+	jobs = min(jobs, len(items))
+	if jobs <= 1:
+		return [func(item) for item in items]
+	with ProcessPoolExecutor(max_workers=jobs) as pool:
+		return list(pool.map(func, items, chunksize=max(1, len(items) // (jobs * 4))))
+
+
+def load_runs(base_path: Path, catalog: Optional[RunCatalog] = None, jobs: int = 1) -> List[RunRecord]:
+	folders = gather_run_directories(base_path)
+	loaded: Dict[Path, Optional[RunRecord]] = {}
+	pending: List[Tuple[Path, Optional[os.stat_result]]] = []
+	for folder in folders:
+		if catalog is None:
+			pending.append((folder, None))
+			continue
+		try:
+			stat = (folder / "summary.json").stat()
+		except FileNotFoundError:
+			continue
+		cached, record = catalog.lookup(folder, stat.st_mtime_ns, stat.st_size)
+		if cached:
+			loaded[folder] = record
+		else:
+			pending.append((folder, stat))
+
+	results = _map_jobs(_load_record, [folder for folder, _ in pending], jobs)
+	for (folder, stat), (record, error) in zip(pending, results):
+		if error is not None:
+			print(f"[gen_dashboard] Skipping {folder}: {error}", file=sys.stderr)
+			continue
+		if catalog is not None and stat is not None:
+			catalog.store(folder, stat.st_mtime_ns, stat.st_size, record)
+		loaded[folder] = record
+
+	records = [loaded[folder] for folder in folders if loaded.get(folder)]
 	return sorted(records, key=lambda run: run.timestamp)
 
 
-def compute_alerts(records: List[RunRecord], threshold: float = 0.15) -> List[str]:
+@dataclass
+class Baseline:
+	median: float
+	mad: float
+	runs: int
+
+	def robust_z(self, value: float) -> float:
+		spread = MAD_SCALE * self.mad
+		if spread == 0.0:
+			return 0.0 if value == self.median else math.copysign(math.inf, value - self.median)
+		return (value - self.median) / spread
+
+	def is_regression(self, value: float) -> bool:
+		if abs(self.robust_z(value)) < ROBUST_Z_THRESHOLD:
+			return False
+		if self.median == 0.0:
+			return True
+		return abs(value - self.median) / abs(self.median) >= BASELINE_MIN_RELATIVE
+
+
+@dataclass
+class Trend:
+	key: str
+	label: str
+	values: List[MetricValue]
+	baselines: List[Optional[Baseline]]
+
+	@property
+	def flagged(self) -> List[int]:
+		return [
+			index
+			for index, (value, baseline) in enumerate(zip(self.values, self.baselines))
+			if value is not None and baseline is not None and baseline.is_regression(value)
+		]
+
+
+def rolling_baselines(values: Sequence[MetricValue], window: int = BASELINE_WINDOW) -> List[Optional[Baseline]]:
+	"""Median/MAD of the up-to-``window`` previous values for each position (None until enough history)."""
+	history: deque = deque(maxlen=max(window, 1))
+	baselines: List[Optional[Baseline]] = []
+	for value in values:
+		if len(history) >= min(BASELINE_MIN_RUNS, history.maxlen):
+			median = statistics.median(history)
+			mad = statistics.median(abs(entry - median) for entry in history)
+			baselines.append(Baseline(median=median, mad=mad, runs=len(history)))
+		else:
+			baselines.append(None)
+		if value is not None:
+			history.append(value)
+	return baselines
+
+
+def build_trends(records: List[RunRecord], window: int = BASELINE_WINDOW) -> List[Trend]:
+	trends: List[Trend] = []
+	for key, label in TREND_METRICS:
+		values = [run.stats.get(key) for run in records]
+		trends.append(Trend(key=key, label=label, values=values, baselines=rolling_baselines(values, window)))
+	return trends
+
+
+def _format_metric(key: str, value: float) -> str:
+	if key == "sandbox_render_fallback_ratio":
+		return f"{value * 100.0:.2f}%"
+	return f"{value:.3f}"
+
+
+def compute_alerts(records: List[RunRecord], threshold: float = 0.15, window: int = BASELINE_WINDOW) -> List[str]:
+	"""Drift alerts against each metric's rolling median/MAD baseline, plus hard budgets.
+
+	Runs without enough history for a baseline fall back to a ``threshold``
+	comparison with the previous run.
+	"""
 	alerts: List[str] = []
-	if len(records) < 2:
-		pass
-	key_metrics = [
-		("sandbox_tick_ms_p95", "Sandbox p95 tick"),
-		("sandbox_render_ms_p95", "Sandbox render p95"),
-		("sandbox_render_fallback_ratio", "Sandbox fallback ratio"),
-		("environment_tick_ms_p95", "Environment p95 tick"),
-		("pps_avg", "Average PPS"),
-		("ci_avg", "Average Comfort Index"),
-	]
-	if len(records) >= 2:
-		for prev, current in zip(records[:-1], records[1:]):
-			for key, label in key_metrics:
-				prev_value = prev.stats.get(key)
-				curr_value = current.stats.get(key)
-				if prev_value in (None, 0.0):
-					continue
-				if curr_value is None:
-					continue
-				diff_ratio = (curr_value - prev_value) / prev_value
+	for trend in build_trends(records, window):
+		key, label = trend.key, trend.label
+		previous: MetricValue = None
+		for run, value, baseline in zip(records, trend.values, trend.baselines):
+			if value is None:
+				continue
+			if baseline is not None:
+				if baseline.is_regression(value):
+					direction = "increase" if value > baseline.median else "decrease"
+					alerts.append(
+						f"{run.label}: {label} {direction} vs rolling median of {baseline.runs} runs "
+						f"(median {_format_metric(key, baseline.median)} → current {_format_metric(key, value)}, "
+						f"robust z {baseline.robust_z(value):+.1f})"
+					)
+			elif previous not in (None, 0.0):
+				diff_ratio = (value - previous) / previous
 				if abs(diff_ratio) >= threshold:
 					direction = "increase" if diff_ratio > 0 else "decrease"
-					if key == "sandbox_render_fallback_ratio":
-						prev_display = prev_value * 100.0
-						curr_display = curr_value * 100.0
-						alerts.append(
-							f"{current.label}: {label} {direction} of {diff_ratio * 100:.1f}% (prev {prev_display:.2f}% → current {curr_display:.2f}%)"
-						)
-					else:
-						alerts.append(
-							f"{current.label}: {label} {direction} of {diff_ratio * 100:.1f}% (prev {prev_value:.3f} → current {curr_value:.3f})"
-						)
+					alerts.append(
+						f"{run.label}: {label} {direction} of {diff_ratio * 100:.1f}% "
+						f"(prev {_format_metric(key, previous)} → current {_format_metric(key, value)})"
+					)
+			previous = value
 	for run in records:
-		eco_tick = run.stats.get("economy_tick_ms_p95")
-		if eco_tick is not None and eco_tick > 10.0:
-			alerts.append(f"{run.label}: Economy tick p95 {eco_tick:.2f} ms exceeds 10 ms budget")
-		eco_ship = run.stats.get("eco_ship_ms_p95")
-		if eco_ship is not None and eco_ship > 7.0:
-			alerts.append(f"{run.label}: Economy shipment p95 {eco_ship:.2f} ms exceeds 7 ms budget")
+		for key, label, limit in BUDGETS:
+			value = run.stats.get(key)
+			if value is not None and value > limit:
+				alerts.append(f"{run.label}: {label} {value:.2f} ms exceeds {limit:g} ms budget")
 		warn_count = run.stats.get("power_warning_count")
 		warn_duration = run.stats.get("power_warning_duration")
 		warn_min = run.stats.get("power_warning_min_ratio")
@@ -296,6 +849,87 @@ def compute_alerts(records: List[RunRecord], threshold: float = 0.15) -> List[st
 	return alerts
 
 
+def _sparkline_points(values: Sequence[Tuple[int, float]], count: int, low: float, high: float) -> str:
+	"""SVG polyline points, reduced to first/min/max/last per pixel column so size stays O(width)."""
+	span = max(high - low, 1e-9)
+	columns: Dict[int, List[Tuple[int, float]]] = {}
+	for index, value in values:
+		column = int(round(index / max(count - 1, 1) * (SPARKLINE_WIDTH - 1)))
+		bucket = columns.get(column)
+		if bucket is None:
+			columns[column] = [(index, value)] * 4
+			continue
+		if value < bucket[1][1]:
+			bucket[1] = (index, value)
+		if value > bucket[2][1]:
+			bucket[2] = (index, value)
+		bucket[3] = (index, value)
+	coords: List[str] = []
+	for column in sorted(columns):
+		for index, value in sorted(set(columns[column])):
+			x = index / max(count - 1, 1) * (SPARKLINE_WIDTH - 1)
+			y = (SPARKLINE_HEIGHT - 2) - (value - low) / span * (SPARKLINE_HEIGHT - 4)
+			coords.append(f"{x:.1f},{y:.1f}")
+	return " ".join(coords)
+
+
+def render_sparkline(trend: Trend) -> str:
+	points = [(index, value) for index, value in enumerate(trend.values) if value is not None]
+	if len(points) < 2:
+		return "<td class=\"label\">—</td>"
+	medians = [(index, baseline.median) for index, baseline in enumerate(trend.baselines) if baseline is not None]
+	low = min(value for _, value in points + medians)
+	high = max(value for _, value in points + medians)
+	count = len(trend.values)
+	parts = [
+		f"<svg class=\"spark\" width=\"{SPARKLINE_WIDTH}\" height=\"{SPARKLINE_HEIGHT}\" "
+		f"viewBox=\"0 0 {SPARKLINE_WIDTH} {SPARKLINE_HEIGHT}\" role=\"img\" aria-label=\"{trend.label} trend\">"
+	]
+	if len(medians) >= 2:
+		parts.append(f"<polyline class=\"baseline\" points=\"{_sparkline_points(medians, count, low, high)}\"/>")
+	parts.append(f"<polyline class=\"trend\" points=\"{_sparkline_points(points, count, low, high)}\"/>")
+	span = max(high - low, 1e-9)
+	for index in trend.flagged[-20:]:
+		value = trend.values[index]
+		x = index / max(count - 1, 1) * (SPARKLINE_WIDTH - 1)
+		y = (SPARKLINE_HEIGHT - 2) - (value - low) / span * (SPARKLINE_HEIGHT - 4)
+		parts.append(f"<circle class=\"flag\" cx=\"{x:.1f}\" cy=\"{y:.1f}\" r=\"2.5\"/>")
+	parts.append("</svg>")
+	return "<td>" + "".join(parts) + "</td>"
+
+
+def render_trends_block(records: List[RunRecord], window: int = BASELINE_WINDOW) -> str:
+	rows: List[str] = []
+	for trend in build_trends(records, window):
+		latest_index = next((i for i in range(len(trend.values) - 1, -1, -1) if trend.values[i] is not None), None)
+		if latest_index is None:
+			continue
+		latest = trend.values[latest_index]
+		baseline = trend.baselines[latest_index]
+		if baseline is None:
+			baseline_cells = "<td class=\"metric\">—</td><td class=\"metric\">—</td><td class=\"metric\">—</td>"
+		else:
+			z_score = baseline.robust_z(latest)
+			z_class = "metric flagged" if baseline.is_regression(latest) else "metric"
+			baseline_cells = (
+				f"<td class=\"metric\">{_format_metric(trend.key, baseline.median)}</td>"
+				f"<td class=\"metric\">{_format_metric(trend.key, baseline.mad)}</td>"
+				f"<td class=\"{z_class}\">{z_score:+.1f}</td>"
+			)
+		rows.append(
+			f"<tr><td class=\"label\">{trend.label}</td>{render_sparkline(trend)}"
+			f"<td class=\"metric\">{_format_metric(trend.key, latest)}</td>{baseline_cells}"
+			f"<td class=\"metric\">{len(trend.flagged)}</td></tr>"
+		)
+	if not rows:
+		return "<p class=\"subtitle\">No trend data.</p>"
+	header = "".join(
+		f"<th>{title}</th>"
+		for title in ("Metric", "Trend", "Latest", "Baseline Median", "Baseline MAD", "Robust z", "Flagged Runs")
+	)
+	return f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+
+
 def render_metric_cell(value: MetricValue, unit: str = "", precision: int = 3) -> str:
 	if value is None:
 		return "<td class=\"metric\">—</td>"
@@ -387,12 +1021,12 @@ def render_summary_block(records: List[RunRecord]) -> str:
 
 def render_alerts(alerts: List[str]) -> str:
 	if not alerts:
-		return "<p class=\"ok\">No alerts triggered (±15% threshold).</p>"
+		return "<p class=\"ok\">No alerts triggered (rolling median/MAD baseline, budgets).</p>"
 	items = "".join(f"<li>{entry}</li>" for entry in alerts)
 	return f"<ul class=\"alert-list\">{items}</ul>"
 
 
-def render_dashboard(records: List[RunRecord], alerts: List[str]) -> str:
+def render_dashboard(records: List[RunRecord], alerts: List[str], window: int = BASELINE_WINDOW) -> str:
 	headers = [
 		"Run ID",
 		"Timestamp",
@@ -417,6 +1051,7 @@ def render_dashboard(records: List[RunRecord], alerts: List[str]) -> str:
 	rows = build_table_rows(records)
 	summary_block = render_summary_block(records)
 	alert_block = render_alerts(alerts)
+	trends_block = render_trends_block(records, window)
 	generated_at = datetime.now(UTC).isoformat(timespec="seconds")
 	return f"""<!DOCTYPE html>
 <html lang="en">
@@ -437,6 +1072,11 @@ def render_dashboard(records: List[RunRecord], alerts: List[str]) -> str:
 		.ok {{ color: #1f7f3d; font-weight: 600; }}
 		.alert-list {{ color: #a94442; }}
 		.summary-list {{ margin: 0; padding-left: 20px; }}
+		.spark {{ display: block; }}
+		.spark .trend {{ fill: none; stroke: #4e77d4; stroke-width: 1.2; }}
+		.spark .baseline {{ fill: none; stroke: #9aa3b5; stroke-width: 1; stroke-dasharray: 3 2; }}
+		.spark .flag {{ fill: #a94442; }}
+		.flagged {{ color: #a94442; font-weight: 600; }}
 	</style>
 </head>
 <body>
@@ -454,6 +1094,12 @@ def render_dashboard(records: List[RunRecord], alerts: List[str]) -> str:
 		{alert_block}
 	</section>
 
+	<section>
+		<h2>Trends</h2>
+		<p class="subtitle">Dashed line: rolling median of the previous {window} runs. Red dots: robust z ≥ {ROBUST_Z_THRESHOLD} and ≥ {BASELINE_MIN_RELATIVE * 100:.0f}% off the median.</p>
+		{trends_block}
+	</section>
+
 	<section>
 		<h2>Run History</h2>
 		<table>
@@ -474,14 +1120,39 @@ def render_dashboard(records: List[RunRecord], alerts: List[str]) -> str:
 
 def main() -> None:
 	args = parse_args()
+	if args.baseline_window < 1:
+		raise SystemExit("--baseline-window must be at least 1")
 	if args.diff:
 		run_diff(args.diff[0], args.diff[1])
 		return
-	records = load_runs(args.input)
+	if args.gate:
+		result = run_gate(
+			load_gate_runs(args.gate[0]),
+			load_gate_runs(args.gate[1]),
+			alpha=args.gate_alpha,
+			min_shift=args.gate_min_shift,
+		)
+		print_gate_report(result)
+		payload = json.dumps(result, indent=2, allow_nan=False)
+		print(payload)
+		if args.gate_output:
+			args.gate_output.parent.mkdir(parents=True, exist_ok=True)
+			args.gate_output.write_text(payload + "\n", encoding="utf-8")
+		raise SystemExit(GATE_EXIT_CODES[result["verdict"]])
+	catalog = None
+	if not args.no_catalog and args.input.exists():
+		catalog = RunCatalog(args.catalog or args.input / CATALOG_NAME, args.input)
+	try:
+		records = load_runs(args.input, catalog, args.jobs)
+	finally:
+		if catalog is not None:
+			catalog.close()
+	if catalog is not None:
+		print(f"[gen_dashboard] Catalog {catalog.path}: {catalog.hits} cached, {catalog.misses} parsed")
 	if not records:
 		raise SystemExit(f"No replay summaries found under {args.input}")
-	alerts = compute_alerts(records)
-	html = render_dashboard(records, alerts)
+	alerts = compute_alerts(records, window=args.baseline_window)
+	html = render_dashboard(records, alerts, args.baseline_window)
 	args.output.parent.mkdir(parents=True, exist_ok=True)
 	args.output.write_text(html, encoding="utf-8")
 
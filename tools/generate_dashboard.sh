@@ -14,6 +14,6 @@ fi
 
 mkdir -p "$(dirname "${OUTPUT_PATH}")"
 
-python3 "${SCRIPT_DIR}/gen_dashboard.py" --input "${INPUT_DIR}" --output "${OUTPUT_PATH}"
+python3 "${SCRIPT_DIR}/gen_dashboard.py" --input "${INPUT_DIR}" --output "${OUTPUT_PATH}" --jobs "${DASHBOARD_JOBS:-0}"
 
 echo "[generate_dashboard] Wrote dashboard to ${OUTPUT_PATH}"
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Typed, column-oriented TSV loader shared by validate_tables and data tooling.
+
+A TableSchema is compiled once from Column specs (type, range, required).
+parse_table then splits a table straight into columns:
+  - numeric columns become array('d') / array('q');
+  - id columns become lists of interned strings;
+  - text columns become lists of stripped strings.
+
+Range and type checks run per column instead of per cell. When NumPy is
+installed, range checks run on zero-copy views of the numeric arrays.
+
+Rows are numbered as in validate_tables: the header is row 1 and the first
+data row is row 2. Comment (#) and blank lines are skipped and not counted.
+"""
+
+import math
+import pathlib
+import sys
+from array import array
+from itertools import repeat
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+KINDS = ("str", "id", "float", "int")
+Values = Union[array, List[str], List[int]]
+
+
+class Column(NamedTuple):
+    name: str
+    kind: str = "str"
+    required: bool = True
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class RowError(NamedTuple):
+    row: int
+    column: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"Row {self.row}: {self.message}"
+
+
+class TableSchema:
+    """Column specs compiled once; reuse the instance for every table of that shape."""
+
+    def __init__(self, columns: Iterable[Column]) -> None:
+        self.columns: Dict[str, Column] = {}
+        for column in columns:
+            if column.kind not in KINDS:
+                raise ValueError(f"Column '{column.name}': kind must be one of {', '.join(KINDS)}.")
+            self.columns[column.name] = column
+        self.required = frozenset(name for name, column in self.columns.items() if column.required)
+
+    def kind(self, name: str) -> str:
+        column = self.columns.get(name)
+        return column.kind if column else "str"
+
+
+class Table:
+    """One parsed table: headers plus one value sequence per column."""
+
+    def __init__(self, headers: List[str], raw: Dict[str, List[str]], size: int, schema: Optional[TableSchema]) -> None:
+        self.headers = headers
+        self.schema = schema or TableSchema(())
+        self.size = size
+        self.columns: Dict[str, Values] = {}
+        self.invalid: Dict[str, List[int]] = {}  # column -> data indices that failed to parse
+        self._raw = raw
+        self._text: Dict[str, List[str]] = {}
+        for name, cells in raw.items():
+            kind = self.schema.kind(name)
+            if kind == "str":
+                self.columns[name] = self.text(name)
+            elif kind == "id":
+                self.columns[name] = list(map(sys.intern, self.text(name)))
+            else:
+                self.columns[name] = self._parse_numbers(name, cells, float if kind == "float" else int)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def text(self, name: str) -> List[str]:
+        """Stripped cell text of ``name`` (empty strings when the column is absent)."""
+        if name not in self._text:
+            cells = self._raw.get(name)
+            self._text[name] = list(map(str.strip, cells)) if cells is not None else [""] * self.size
+        return self._text[name]
+
+    def missing(self) -> List[str]:
+        return sorted(self.schema.required.difference(self.headers))
+
+    def out_of_range(self, name: str, low: Optional[float] = None, high: Optional[float] = None) -> List[int]:
+        """Data indices of parsed ``name`` values outside [low, high] (NaN counts as outside).
+
+        Bounds default to the schema's; unparseable cells are reported by ``invalid`` instead.
+        """
+        column = self.schema.columns.get(name)
+        low = column.min if low is None and column else low
+        high = column.max if high is None and column else high
+        values = self.columns[name]
+        if not values or (low is None and high is None):
+            return []
+        lowest = -math.inf if low is None else low
+        highest = math.inf if high is None else high
+        skip = self.invalid.get(name, ())
+        if np is not None and isinstance(values, array):
+            # Zero-copy view of the array buffer; NaN fails both comparisons.
+            data = np.frombuffer(values, dtype=np.float64 if values.typecode == "d" else np.int64)
+            bad = ~((data >= lowest) & (data <= highest))
+            bad[list(skip)] = False
+            return np.flatnonzero(bad).tolist()
+        total = sum(values)  # NaN when any value is NaN, which min/max would not reliably expose
+        if total == total and lowest <= min(values) and max(values) <= highest:
+            return []
+        skipped = set(skip)
+        return [idx for idx, value in enumerate(values) if not lowest <= value <= highest and idx not in skipped]
+
+    def errors(self) -> List[RowError]:
+        """Schema violations: missing columns (row 1), unparseable cells, and range failures."""
+        found = [RowError(1, name, f"missing column '{name}'") for name in self.missing()]
+        cells: List[RowError] = []
+        for name, column in self.schema.columns.items():
+            if name not in self.columns or column.kind in ("str", "id"):
+                continue
+            noun = "numeric" if column.kind == "float" else "integer"
+            cells.extend(RowError(idx + 2, name, f"{name} must be {noun}") for idx in self.invalid.get(name, ()))
+            if column.min is not None or column.max is not None:
+                values = self.columns[name]
+                bounds = f"{'' if column.min is None else f'{column.min:g}'}-{'' if column.max is None else f'{column.max:g}'}"
+                cells.extend(
+                    RowError(idx + 2, name, f"{name} {values[idx]} outside {bounds} range")
+                    for idx in self.out_of_range(name)
+                )
+        cells.sort(key=lambda error: error.row)
+        return found + cells
+
+    def _parse_numbers(self, name: str, cells: List[str], convert: type) -> Values:
+        typecode = "d" if convert is float else "q"
+        try:
+            return array(typecode, map(convert, cells))
+        except (ValueError, OverflowError):
+            pass
+        values: List = []
+        invalid: List[int] = []
+        for idx, cell in enumerate(cells):
+            try:
+                values.append(convert(cell))
+            except ValueError:
+                values.append(convert(0))
+                invalid.append(idx)
+        if invalid:
+            self.invalid[name] = invalid
+        try:
+            return array(typecode, values)
+        except OverflowError:
+            return values
+
+
+def parse_table(source: str, schema: Optional[TableSchema] = None) -> Table:
+    """Parse TSV text into a Table; row handling matches validate_tables.parse_tsv."""
+    lines = source.strip().splitlines()
+    headers = [header.strip() for header in lines[0].split("\t")] if lines else []
+    body = lines[1:]
+    if "" in body or any(map(str.startswith, body, repeat("#"))):
+        body = [line for line in body if line and not line.startswith("#")]
+    width = len(headers)
+    if body and set(map(str.count, body, repeat("\t"))) == {width - 1}:
+        # Every row has exactly one cell per header: split once and stride.
+        cells = "\t".join(body).split("\t")
+        by_index: Sequence[List[str]] = [cells[index::width] for index in range(width)]
+    else:
+        rows = [line.split("\t") for line in body]
+        by_index = [[row[index] if index < len(row) else "" for row in rows] for index in range(width)]
+    raw: Dict[str, List[str]] = {}
+    for header, cells in zip(headers, by_index):
+        raw[header] = cells  # duplicate headers: the last column wins, as with dict rows
+    return Table(headers, raw, len(body), schema)
+
+
+def load_table(path: pathlib.Path, schema: Optional[TableSchema] = None) -> Table:
+    return parse_table(path.read_text(encoding="utf-8"), schema)
@@ -2,29 +2,53 @@
 """
 Validate HUD baseline PNGs against the layout contract.
 
+The contract lives in contracts/ui_layout.json (see ui_layout.py). Each PNG is
+matched to the contract resolution with the same size, so 720p, 1080p, 1440p
+and ultrawide captures validate in one pass.
+
 Checks:
   1. Toast region must be empty (matches background colour).
   2. All non-background pixels must live inside the safe-area rectangle.
+  3. Every HUD slot rect must fit inside the safe area.
+
+PNG scanlines are unfiltered with NumPy when it is installed; the pure-Python
+decoder stays as the reference (``--reference-decoder``).
+
+Results are cached in SQLite (default: <images>/.ui_assert_cache.sqlite) keyed
+by the PNG's SHA-256 and the contract file's SHA-256, so only new or edited
+images, or a contract change, are validated again.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
+import sqlite3
 import struct
 import sys
+import time
+import xml.etree.ElementTree as ET
 import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Sequence, Tuple
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+	import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+	np = None
+else:
+	from numpy.lib.stride_tricks import as_strided
+
+from ui_layout import DEFAULT_CONTRACT, ContractError, Layout, LayoutContract, SpanMask, load_contract
 
 PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
-EXPECTED_SIZE = (1280, 720)
-SAFE_AREA = (32, 24, 1248, 696)  # left, top, right, bottom (exclusive)
-TOAST_RECT = (340, 624, 600, 72)  # x, y, width, height
-HUD_SLOT_RECTS = {
-	"D": (992, 144, 224, 32),
-	"F": (992, 184, 224, 32)
-}
+CACHE_NAME = ".ui_assert_cache.sqlite"
+BYTES_PER_PIXEL = {2: 3, 6: 4}  # PNG color type -> bytes per 8-bit pixel (RGB, RGBA)
+CACHE_VERSION = 3  # bump when the checks change without the contract file changing
 
 
 class BaselineError(Exception):
@@ -41,8 +65,113 @@ class ImageData:
 		idx = (y * self.width + x) * 4
 		return tuple(self.pixels[idx + channel] for channel in range(4))  # type: ignore[return-value]
 
+	def span(self, y: int, x0: int, x1: int) -> bytearray:
+		"""Packed RGBA bytes of pixels ``x0 <= x < x1`` on row ``y``."""
+		start = (y * self.width + x0) * 4
+		return self.pixels[start:start + (x1 - x0) * 4]
+
+
+# Region analysis: rows are compared as packed byte strings against the
+# background pixel repeated across the row, so each row costs one memcmp
+# instead of one tuple per pixel.
+
+
+def background(image: ImageData) -> bytes:
+	return bytes(image.span(0, 0, 1))
+
+
+def _leading_match(span: bytearray, pattern: bytes) -> int:
+	"""Number of leading pixels of ``span`` that equal ``pattern`` (same length)."""
+	low, high = 0, len(span) // 4
+	while low < high:
+		mid = (low + high + 1) // 2
+		if span[:mid * 4] == pattern[:mid * 4]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+
+def _trailing_match(span: bytearray, pattern: bytes) -> int:
+	"""Number of trailing pixels of ``span`` that equal ``pattern`` (same length)."""
+	size = len(span)
+	low, high = 0, size // 4
+	while low < high:
+		mid = (low + high + 1) // 2
+		if span[size - mid * 4:] == pattern[size - mid * 4:]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+
+def first_foreground(image: ImageData, rect: Tuple[int, int, int, int], bg: bytes) -> Optional[Tuple[int, int]]:
+	"""First pixel in ``rect`` (x, y, width, height) that differs from ``bg``, row-major."""
+	x, y, w, h = rect
+	pattern = bg * w
+	for yy in range(y, y + h):
+		span = image.span(yy, x, x + w)
+		if span != pattern:
+			return x + _leading_match(span, pattern), yy
+	return None
+
+
+def foreground_bounds(image: ImageData, bg: bytes) -> Optional[Tuple[int, int, int, int]]:
+	"""Inclusive (min_x, min_y, max_x, max_y) of non-background pixels, or None.
+
+	One comparison per row; rows that differ narrow the horizontal extent
+	with a binary search over prefix/suffix equality, skipped when the row
+	cannot widen the bounds found so far.
+	"""
+	width = image.width
+	pattern = bg * width
+	min_x, max_x = width, -1
+	min_y = max_y = -1
+	for y in range(image.height):
+		span = image.span(y, 0, width)
+		if span == pattern:
+			continue
+		if min_y == -1:
+			min_y = y
+		max_y = y
+		if min_x > 0 and span[:min_x * 4] != pattern[:min_x * 4]:
+			min_x = _leading_match(span, pattern)
+		if max_x < width - 1 and span[(max_x + 1) * 4:] != pattern[(max_x + 1) * 4:]:
+			max_x = width - 1 - _trailing_match(span, pattern)
+	if max_y == -1:
+		return None
+	return min_x, min_y, max_x, max_y
+
+
+def read_png_rgba(path: Path, reference: bool = False) -> ImageData:
+	"""Decode an 8-bit RGBA or RGB PNG as RGBA; ``reference`` forces the pure-Python unfilter loop.
+
+	RGB images are expanded with an opaque alpha channel. Truncated or corrupt
+	files raise BaselineError like any other invalid image.
+	"""
+	try:
+		width, height, bpp, raw = _read_idat(path)
+		if len(raw) < height * (width * bpp + 1):
+			raise BaselineError("Truncated image data.")
+		if np is not None and not reference:
+			pixels = _unfilter_numpy(raw, width, height, bpp)
+		else:
+			pixels = _unfilter_reference(raw, width, height, bpp)
+	except (zlib.error, struct.error, IndexError, ValueError) as exc:
+		raise BaselineError(f"Corrupt PNG: {exc}") from exc
+	if bpp == 3:
+		pixels = _expand_rgb(pixels, width * height)
+	return ImageData(width, height, pixels)
 
-def read_png_rgba(path: Path) -> ImageData:
+
+def _expand_rgb(rgb: bytearray, count: int) -> bytearray:
+	rgba = bytearray(b"\xff" * (count * 4))
+	for channel in range(3):
+		rgba[channel::4] = rgb[channel::3]
+	return rgba
+
+
+def _read_idat(path: Path) -> Tuple[int, int, int, bytes]:
 	with path.open("rb") as handle:
 		if handle.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
 			raise BaselineError("Not a PNG file.")
@@ -65,25 +194,220 @@ def read_png_rgba(path: Path) -> ImageData:
 				break
 		if width is None or height is None or color_type is None or bit_depth is None:
 			raise BaselineError("Missing IHDR chunk.")
-		if color_type != 6 or bit_depth != 8:
-			raise BaselineError("PNG must be RGBA 8-bit.")
-		raw = zlib.decompress(bytes(compressed))
-		bpp = 4
-		stride = width * bpp
-		pixels = bytearray(width * height * bpp)
-		prev = bytearray(stride)
-		i = 0
-		pos = 0
-		for _ in range(height):
-			filter_type = raw[pos]
-			pos += 1
-			line = bytearray(raw[pos:pos + stride])
-			pos += stride
-			recon = _apply_filter(filter_type, line, prev, bpp)
-			pixels[i:i + stride] = recon
-			prev = recon
-			i += stride
-		return ImageData(width, height, pixels)
+		if color_type not in BYTES_PER_PIXEL or bit_depth != 8:
+			raise BaselineError(
+				f"Unsupported PNG format (color type {color_type}, bit depth {bit_depth}); expected 8-bit RGB or RGBA."
+			)
+		return width, height, BYTES_PER_PIXEL[color_type], zlib.decompress(bytes(compressed))
+
+
+def _unfilter_reference(raw: bytes, width: int, height: int, bpp: int = 4) -> bytearray:
+	stride = width * bpp
+	pixels = bytearray(width * height * bpp)
+	prev = bytearray(stride)
+	i = 0
+	pos = 0
+	for _ in range(height):
+		filter_type = raw[pos]
+		pos += 1
+		line = bytearray(raw[pos:pos + stride])
+		pos += stride
+		recon = _apply_filter(filter_type, line, prev, bpp)
+		pixels[i:i + stride] = recon
+		prev = recon
+		i += stride
+	return pixels
+
+
+def _unfilter_numpy(raw: bytes, width: int, height: int, bpp: int = 4) -> bytearray:
+	"""Vectorised unfilter; byte-identical to ``_unfilter_reference``.
+
+	None/Sub/Up rows only depend on their own row or the row above, so each is
+	one array operation (Sub is a wrapping per-channel ``cumsum``). Average and
+	Paeth rows also need the reconstructed left neighbour. Runs of Up/Average/
+	Paeth rows are independent of each other once the row above each run is
+	known, so all runs are swept together by ``_unfilter_chains``.
+	"""
+	stride = width * bpp
+	if len(raw) < height * (stride + 1):
+		raise BaselineError("Truncated image data.")
+	rows = np.frombuffer(raw, dtype=np.uint8, count=height * (stride + 1)).reshape(height, stride + 1)
+	filters = rows[:, 0]
+	if int(filters.max(initial=0)) > 4:
+		raise BaselineError(f"Unsupported PNG filter: {int(filters.max())}")
+	data = rows[:, 1:].reshape(height, width, bpp)
+	recon = np.empty((height, width, bpp), dtype=np.uint8)
+	chains = []
+	start = end = None
+	for row, filter_type in enumerate(filters.tolist()):
+		if filter_type >= 3:
+			start = row if start is None else start
+			end = row + 1
+		elif filter_type <= 1 and start is not None:
+			chains.append((start, end))
+			start = None
+	if start is not None:
+		chains.append((start, end))
+	# Up rows trailing a chain depend on its last row and run after the sweep.
+	in_chain = np.zeros(height, dtype=bool)
+	deferred = []
+	for start, end in chains:
+		in_chain[start:end] = True
+		row = end
+		while row < height and filters[row] == 2:
+			deferred.append(row)
+			in_chain[row] = True
+			row += 1
+	zero_row = np.zeros((width, bpp), dtype=np.uint8)
+	for row in np.flatnonzero(~in_chain).tolist():
+		_unfilter_row(filters[row], data[row], recon[row - 1] if row else zero_row, recon[row])
+	if chains:
+		_unfilter_chains(data, filters, recon, chains)
+	for row in deferred:
+		_unfilter_row(filters[row], data[row], recon[row - 1], recon[row])
+	return bytearray(recon.tobytes())
+
+
+def _unfilter_row(filter_type: int, line: "np.ndarray", above: "np.ndarray", out: "np.ndarray") -> None:
+	if filter_type == 0:
+		out[:] = line
+	elif filter_type == 1:
+		np.cumsum(line, axis=0, dtype=np.uint8, out=out)
+	else:
+		np.add(line, above, out=out)
+
+
+def _unfilter_chains(
+	data: "np.ndarray",
+	filters: "np.ndarray",
+	recon: "np.ndarray",
+	chains: Sequence[Tuple[int, int]],
+) -> None:
+	"""Unfilter row chains one anti-diagonal at a time, writing into ``recon``.
+
+	Pixel (r, x) only depends on (r, x-1), (r-1, x) and (r-1, x-1). Placing it
+	at step ``x + depth`` (depth = position within its chain) puts all three on
+	the previous two steps, so each step is a handful of vector operations and
+	a decode takes ``width + longest chain`` steps instead of one per byte.
+	Every chain is laid out after a copy of the row above it, stored as a None
+	row, so the "up" neighbour is always the previous slot.
+	"""
+	height, width, bpp = data.shape
+	heads = []
+	kinds = [0]  # slot 0 is zero padding so "previous slot" never wraps
+	for start, end in chains:
+		heads.append(len(kinds))
+		kinds.append(0)
+		kinds.extend(filters[start:end].tolist())
+	slots = len(kinds)
+	longest = max(end - start for start, end in chains)
+	# Step 0 stays zero so step 1 (x = 0 of the chain heads) can look two back.
+	steps = width + longest + 1
+	filtered = np.zeros((steps, slots, bpp), dtype=np.int16)
+	skew = np.zeros((steps, slots, bpp), dtype=np.int16)
+	step_stride, slot_stride, byte_stride = skew.strides
+
+	def chain_view(array: "np.ndarray", head: int, count: int) -> "np.ndarray":
+		# Slot head + k at step x + k + 1 for each row k and column x of a chain.
+		return as_strided(
+			array[1:, head:],
+			shape=(count, width, bpp),
+			strides=(step_stride + slot_stride, step_stride, byte_stride),
+		)
+
+	for head, (start, end) in zip(heads, chains):
+		view = chain_view(filtered, head, end - start + 1)
+		if start:
+			view[0] = recon[start - 1]
+		view[1:] = data[start:end]
+	filtered = filtered.reshape(steps, slots * bpp)
+	flat = skew.reshape(steps, slots * bpp)
+
+	# Sub/Up/Average/None predict ((a & left_mask) + (b & up_mask)) >> shift;
+	# masks are 0 or -1 so every selection below is branch-free arithmetic.
+	kinds = np.repeat(np.array(kinds, dtype=np.int16), bpp)
+	left_mask = -np.isin(kinds, (1, 3)).astype(np.int16)
+	up_mask = -np.isin(kinds, (2, 3)).astype(np.int16)
+	shift = (kinds == 3).astype(np.int16)
+	paeth_mask = -(kinds == 4).astype(np.int16)
+	any_paeth = bool(paeth_mask.any())
+	any_linear = bool(np.isin(kinds, (1, 2, 3)).any())
+	# Slots live at step x + depth + 1 for x in [0, width); outside that range
+	# they are either still zero or finished, so each step covers the slots
+	# from the first with depth >= step - width to the deepest live one of the
+	# last chain.
+	depth = np.arange(slots) - np.repeat([0, *heads], np.diff([0, *heads, slots]))
+	first_at = np.searchsorted(np.maximum.accumulate(depth[1:]), np.arange(longest + 1)) + 1
+	last_head = heads[-1]
+	last_depth = slots - 1 - last_head
+	scratch = np.empty((6, slots * bpp), dtype=np.int16)
+	for step in range(1, steps):
+		low = int(first_at[max(0, step - width)]) * bpp
+		high = (last_head + min(step - 1, last_depth) + 1) * bpp
+		if low >= high:
+			continue
+		prev = slice(low - bpp, high - bpp)
+		left = flat[step - 1, low:high]
+		up = flat[step - 1, prev]
+		up_left = flat[step - 2, prev]
+		pred, t1, t2, t3, t4, t5 = scratch[:, :high - low]
+		if any_linear:
+			np.bitwise_and(left, left_mask[low:high], out=pred)
+			np.bitwise_and(up, up_mask[low:high], out=t1)
+			np.add(pred, t1, out=pred)
+			np.right_shift(pred, shift[low:high], out=pred)
+		if any_paeth:
+			_paeth_into(left, up, up_left, pred, paeth_mask[low:high], scratch[1:, :high - low], any_linear)
+		out = flat[step, low:high]
+		np.add(filtered[step, low:high], pred, out=out)
+		np.bitwise_and(out, 0xFF, out=out)
+	for head, (start, end) in zip(heads, chains):
+		recon[start:end] = chain_view(skew, head, end - start + 1)[1:]
+
+
+def _paeth_into(
+	left: "np.ndarray",
+	up: "np.ndarray",
+	up_left: "np.ndarray",
+	pred: "np.ndarray",
+	mask: "np.ndarray",
+	scratch: "np.ndarray",
+	blend: bool,
+) -> None:
+	"""Set ``pred`` to the Paeth predictor where ``mask`` is -1.
+
+	Elsewhere ``pred`` keeps its value when ``blend`` is set and becomes 0
+	otherwise.
+
+	The comparisons of ``_paeth`` become sign bits of int16 differences
+	(``x >> 15`` is -1 when x < 0), so selection is and/add instead of branches.
+	"""
+	t1, t2, t3, t4, t5 = scratch
+	np.subtract(left, up_left, out=t1)
+	np.subtract(up, up_left, out=t2)
+	np.add(t1, t2, out=t3)
+	np.abs(t3, out=t3)  # pc = |a + b - 2c|
+	np.abs(t1, out=t1)  # pb = |a - c|
+	np.abs(t2, out=t2)  # pa = |b - c|
+	# b, or c where pb > pc.
+	np.subtract(t3, t1, out=t4)
+	np.right_shift(t4, 15, out=t4)
+	np.subtract(up_left, up, out=t5)
+	np.bitwise_and(t5, t4, out=t5)
+	np.add(t5, up, out=t5)
+	# a, unless pa > min(pb, pc).
+	np.minimum(t1, t3, out=t1)
+	np.subtract(t1, t2, out=t1)
+	np.right_shift(t1, 15, out=t1)
+	np.subtract(t5, left, out=t5)
+	np.bitwise_and(t5, t1, out=t5)
+	np.add(t5, left, out=t5)
+	if not blend:
+		np.bitwise_and(t5, mask, out=pred)
+		return
+	np.subtract(t5, pred, out=t5)
+	np.bitwise_and(t5, mask, out=t5)
+	np.add(pred, t5, out=pred)
 
 
 def _apply_filter(filter_type: int, line: bytearray, prev: bytearray, bpp: int) -> bytearray:
@@ -126,57 +450,190 @@ def _paeth(a: int, b: int, c: int) -> int:
 	return c
 
 
-def assert_toast_empty(image: ImageData) -> None:
-	bg = image.pixel(0, 0)
-	x, y, w, h = TOAST_RECT
-	for yy in range(y, y + h):
-		for xx in range(x, x + w):
-			if image.pixel(xx, yy) != bg:
-				raise BaselineError(f"Toast rect not empty at ({xx}, {yy}).")
+def mask_first_foreground(image: ImageData, mask: SpanMask, bg: bytes) -> Optional[Tuple[int, int]]:
+	"""First pixel covered by ``mask`` that differs from ``bg``, in span order."""
+	for y, x0, x1 in mask.spans:
+		span = image.span(y, x0, x1)
+		pattern = bg * (x1 - x0)
+		if span != pattern:
+			return x0 + _leading_match(span, pattern), y
+	return None
 
 
-def assert_safe_area(image: ImageData) -> None:
-	bg = image.pixel(0, 0)
-	min_x, min_y = image.width, image.height
-	max_x = max_y = -1
-	for y in range(image.height):
-		for x in range(image.width):
-			if image.pixel(x, y) != bg:
-				if x < min_x:
-					min_x = x
-				if y < min_y:
-					min_y = y
-				if x > max_x:
-					max_x = x
-				if y > max_y:
-					max_y = y
-	if max_x == -1 or max_y == -1:
-		raise BaselineError("No HUD pixels detected.")
-	left, top, right, bottom = SAFE_AREA
-	if not (left <= min_x and top <= min_y and max_x < right and max_y < bottom):
-		raise BaselineError(
-			f"HUD dock exceeds safe area: bounds=({min_x},{min_y})-({max_x},{max_y}), "
-			f"expected within ({left},{top})-({right - 1},{bottom - 1})."
-		)
+def assert_toast_empty(image: ImageData, layout: Layout) -> None:
+	hit = mask_first_foreground(image, layout.toast_mask, background(image))
+	if hit is not None:
+		raise BaselineError(f"Toast rect not empty at ({hit[0]}, {hit[1]}).")
+
+
+def assert_safe_area(image: ImageData, layout: Layout) -> None:
+	bg = background(image)
+	left, top, right, bottom = layout.safe_area
+	if mask_first_foreground(image, layout.outside_safe_mask, bg) is None:
+		if first_foreground(image, (left, top, right - left, bottom - top), bg) is None:
+			raise BaselineError("No HUD pixels detected.")
+		return
+	min_x, min_y, max_x, max_y = foreground_bounds(image, bg)
+	raise BaselineError(
+		f"HUD dock exceeds safe area: bounds=({min_x},{min_y})-({max_x},{max_y}), "
+		f"expected within ({left},{top})-({right - 1},{bottom - 1})."
+	)
 
 
-def assert_slot_rects_within_safe_area() -> None:
-	left, top, right, bottom = SAFE_AREA
-	for slot, rect in HUD_SLOT_RECTS.items():
+def assert_slot_rects_within_safe_area(layout: Layout) -> None:
+	left, top, right, bottom = layout.safe_area
+	for slot, rect in layout.slots.items():
 		x, y, w, h = rect
 		if not (left <= x and top <= y and x + w <= right and y + h <= bottom):
 			raise BaselineError(
-				f"Slot {slot} rect {rect} exceeds safe area bounds ({left},{top})-({right},{bottom})."
+				f"Slot {slot} rect {rect} exceeds {layout.name} safe area bounds ({left},{top})-({right},{bottom})."
+			)
+
+
+def validate_image(path: Path, reference: bool = False, contract: Optional[LayoutContract] = None) -> None:
+	contract = contract or load_contract()
+	image = read_png_rgba(path, reference)
+	layout = contract.for_size(image.width, image.height)
+	if layout is None:
+		raise BaselineError(f"Expected one of {contract.sizes()} image, found {image.width}x{image.height}.")
+	assert_toast_empty(image, layout)
+	assert_safe_area(image, layout)
+	assert_slot_rects_within_safe_area(layout)
+
+
+@dataclass(frozen=True)
+class ImageResult:
+	name: str
+	error: Optional[str]
+	seconds: float
+	cached: bool = False
+
+	@property
+	def ok(self) -> bool:
+		return self.error is None
+
+
+def check_image(path: Path, reference: bool = False, contract_path: Path = DEFAULT_CONTRACT) -> ImageResult:
+	start = time.perf_counter()
+	try:
+		validate_image(path, reference, load_contract(contract_path))
+		error = None
+	except (BaselineError, OSError) as exc:
+		error = str(exc)
+	return ImageResult(path.name, error, time.perf_counter() - start)
+
+
+def iter_results(
+	pngs: Sequence[Path], jobs: int = 1, reference: bool = False, contract_path: Path = DEFAULT_CONTRACT
+) -> Iterator[ImageResult]:
+	"""Validate ``pngs`` on ``jobs`` processes (0 = all cores), yielding each result as it finishes."""
+	jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+	jobs = min(jobs, len(pngs))
+	if jobs <= 1:
+		for png in pngs:
+			yield check_image(png, reference, contract_path)
+		return
+	with ProcessPoolExecutor(max_workers=jobs) as pool:
+		futures = [pool.submit(check_image, png, reference, contract_path) for png in pngs]
+		for future in as_completed(futures):
+			yield future.result()
+
+
+def contract_digest(contract: LayoutContract) -> str:
+	key = {"version": CACHE_VERSION, "contract": contract.digest}
+	return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+	"""SQLite cache of validation outcomes keyed by PNG content hash and contract digest.
+
+	Failures are cached too: the outcome only depends on the bytes and the
+	contract. Rows not looked up during a run are pruned on close.
+	"""
+
+	def __init__(self, path: Path, contract: LayoutContract) -> None:
+		self.path = path
+		self.hits = 0
+		self.misses = 0
+		self.contract = contract_digest(contract)
+		self._conn = sqlite3.connect(str(path))
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS results ("
+			"digest TEXT NOT NULL, contract TEXT NOT NULL, error TEXT, PRIMARY KEY (digest, contract))"
+		)
+		self._rows = {
+			digest: error
+			for digest, error in self._conn.execute(
+				"SELECT digest, error FROM results WHERE contract = ?", (self.contract,)
 			)
+		}
+		self._seen: set = set()
+
+	@staticmethod
+	def digest(path: Path) -> str:
+		return hashlib.sha256(path.read_bytes()).hexdigest()
+
+	def lookup(self, digest: str) -> Tuple[bool, Optional[str]]:
+		self._seen.add(digest)
+		if digest not in self._rows:
+			self.misses += 1
+			return False, None
+		self.hits += 1
+		return True, self._rows[digest]
+
+	def store(self, digest: str, error: Optional[str]) -> None:
+		self._conn.execute(
+			"INSERT OR REPLACE INTO results (digest, contract, error) VALUES (?, ?, ?)",
+			(digest, self.contract, error),
+		)
+
+	def close(self) -> None:
+		self._conn.execute("DELETE FROM results WHERE contract != ?", (self.contract,))
+		stale = [(digest,) for digest in self._rows if digest not in self._seen]
+		if stale:
+			self._conn.executemany("DELETE FROM results WHERE digest = ?", stale)
+		self._conn.commit()
+		self._conn.close()
 
 
-def validate_image(path: Path) -> None:
-	image = read_png_rgba(path)
-	if (image.width, image.height) != EXPECTED_SIZE:
-		raise BaselineError(f"Expected 1280x720 image, found {image.width}x{image.height}.")
-	assert_toast_empty(image)
-	assert_safe_area(image)
-	assert_slot_rects_within_safe_area()
+def write_report(path: Path, results: Sequence[ImageResult], seconds: float) -> None:
+	"""Write a JUnit XML report for ``.xml`` paths and a JSON report otherwise."""
+	results = sorted(results, key=lambda result: result.name)
+	failures = sum(1 for result in results if not result.ok)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	if path.suffix.lower() == ".xml":
+		suite = ET.Element(
+			"testsuite",
+			name="ui_assert_baseline",
+			tests=str(len(results)),
+			failures=str(failures),
+			errors="0",
+			time=f"{seconds:.3f}",
+		)
+		for result in results:
+			case = ET.SubElement(
+				suite, "testcase", classname="ui_assert_baseline", name=result.name, time=f"{result.seconds:.3f}"
+			)
+			if not result.ok:
+				ET.SubElement(case, "failure", message=result.error).text = result.error
+		ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+		return
+	payload = {
+		"images": len(results),
+		"failures": failures,
+		"seconds": round(seconds, 3),
+		"results": [
+			{
+				"name": result.name,
+				"ok": result.ok,
+				"error": result.error,
+				"seconds": round(result.seconds, 4),
+				"cached": result.cached,
+			}
+			for result in results
+		],
+	}
+	path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
 
 
 def parse_args(argv: Sequence[str]) -> argparse.Namespace:
@@ -186,6 +643,34 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
 		default="dev/screenshots/ui_baseline",
 		help="Directory containing baseline PNGs (default: %(default)s).",
 	)
+	parser.add_argument(
+		"--reference-decoder",
+		action="store_true",
+		help="Decode with the pure-Python reference unfilter instead of NumPy.",
+	)
+	parser.add_argument(
+		"--jobs",
+		type=int,
+		default=1,
+		help="Worker processes for validation (0 = all cores, default: 1).",
+	)
+	parser.add_argument(
+		"--report",
+		type=Path,
+		help="Write per-image results with timings: JUnit XML for *.xml, JSON otherwise.",
+	)
+	parser.add_argument(
+		"--cache",
+		type=Path,
+		help=f"Validation cache path (default: <images>/{CACHE_NAME}).",
+	)
+	parser.add_argument("--no-cache", action="store_true", help="Validate every PNG without the cache.")
+	parser.add_argument(
+		"--contract",
+		type=Path,
+		default=DEFAULT_CONTRACT,
+		help="Layout contract JSON (default: contracts/ui_layout.json).",
+	)
 	return parser.parse_args(argv)
 
 
@@ -199,15 +684,49 @@ def main(argv: Sequence[str]) -> int:
 	if not pngs:
 		print(f"[ui_assert] No PNGs found in {root}", file=sys.stderr)
 		return 1
-	failed = False
+	contract_path = args.contract.expanduser().resolve()
+	try:
+		contract = load_contract(contract_path)
+	except ContractError as exc:
+		print(f"[ui_assert] {exc}", file=sys.stderr)
+		return 1
+	start = time.perf_counter()
+	results: List[ImageResult] = []
+
+	def emit(result: ImageResult) -> None:
+		results.append(result)
+		if result.ok:
+			print(f"[ui_assert] OK {result.name}", flush=True)
+		else:
+			print(f"[ui_assert] {result.name}: {result.error}", file=sys.stderr, flush=True)
+
+	cache = None if args.no_cache else ValidationCache((args.cache or root / CACHE_NAME).expanduser(), contract)
+	digests = {}
+	pending = []
 	for png in pngs:
-		try:
-			validate_image(png)
-			print(f"[ui_assert] OK {png.name}")
-		except BaselineError as exc:
-			failed = True
-			print(f"[ui_assert] {png.name}: {exc}", file=sys.stderr)
-	return 1 if failed else 0
+		if cache is None:
+			pending.append(png)
+			continue
+		digest = cache.digest(png)
+		hit, error = cache.lookup(digest)
+		if hit:
+			emit(ImageResult(png.name, error, 0.0, cached=True))
+		else:
+			digests[png.name] = digest
+			pending.append(png)
+	try:
+		for result in iter_results(pending, args.jobs, args.reference_decoder, contract_path):
+			emit(result)
+			if cache is not None:
+				cache.store(digests[result.name], result.error)
+	finally:
+		if cache is not None:
+			cache.close()
+	if cache is not None:
+		print(f"[ui_assert] Cache {cache.path}: {cache.hits} cached, {cache.misses} validated")
+	if args.report:
+		write_report(args.report.expanduser(), results, time.perf_counter() - start)
+	return 0 if all(result.ok for result in results) else 1
 
 
 if __name__ == "__main__":
@@ -34,7 +34,7 @@ mkdir -p "${BASELINE_DIR}"
 echo "[ui_baseline] generating baseline into ${BASELINE_DIR}"
 
 if [[ "${UI_BASELINE_PLACEHOLDER}" == "1" ]]; then
-	python3 "${SCRIPT_DIR}/ui_generate_baseline.py" --output "${BASELINE_DIR}"
+	python3 "${SCRIPT_DIR}/ui_generate_baseline.py" --output "${BASELINE_DIR}" --clean
 	exit 0
 fi
 
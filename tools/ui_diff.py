@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Compare HUD screenshots against the golden baselines pixel by pixel.
+
+A pixel differs when any RGBA channel moves by more than the tolerance. A
+differing pixel is treated as anti-aliasing, and reported but not failed,
+when each image's value lies within the 3x3 neighbourhood range of the other
+image: an edge that moved by a sub-pixel amount. The image is compared in
+square tiles. Identical images return after one buffer comparison, and
+unchanged rows and tiles are skipped by comparing packed bytes. Only changed
+tiles are examined per pixel (vectorised when NumPy is installed).
+
+Failing images get a heatmap PNG: the golden dimmed to grey, differing
+pixels red, anti-aliased pixels yellow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from ui_assert_baseline import BaselineError, ImageData, read_png_rgba
+from ui_generate_baseline import write_png
+
+try:
+	import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+	np = None
+
+TILE_SIZE = 64
+DEFAULT_TOLERANCE = 2
+DIFF_COLOR = b"\xff\x17\x44\xff"
+AA_COLOR = b"\xff\xb3\x00\xff"
+# Heatmap background: every channel of the golden mapped into 24..87.
+_DIM_TABLE = bytes(24 + value // 4 for value in range(256))
+
+Point = Tuple[int, int]
+
+
+@dataclass
+class DiffResult:
+	name: str
+	tiles: int = 0
+	tiles_changed: int = 0
+	changed: List[Point] = field(default_factory=list)
+	antialiased: List[Point] = field(default_factory=list)
+	error: Optional[str] = None
+	heatmap: Optional[Path] = None
+
+	def ok(self, max_pixels: int = 0) -> bool:
+		return self.error is None and len(self.changed) <= max_pixels
+
+
+def _tile_rects(width: int, height: int, tile: int) -> List[Tuple[int, int, int, int]]:
+	return [
+		(x, y, min(x + tile, width), min(y + tile, height))
+		for y in range(0, height, tile)
+		for x in range(0, width, tile)
+	]
+
+
+def _changed_tiles(golden: ImageData, candidate: ImageData, tile: int) -> List[Tuple[int, int, int, int]]:
+	"""Tiles (x0, y0, x1, y1) whose bytes differ; equal rows rule out a whole band at once."""
+	width = golden.width
+	changed = []
+	for y0 in range(0, golden.height, tile):
+		y1 = min(y0 + tile, golden.height)
+		rows = [y for y in range(y0, y1) if golden.span(y, 0, width) != candidate.span(y, 0, width)]
+		if not rows:
+			continue
+		for x0 in range(0, width, tile):
+			x1 = min(x0 + tile, width)
+			if any(golden.span(y, x0, x1) != candidate.span(y, x0, x1) for y in rows):
+				changed.append((x0, y0, x1, y1))
+	return changed
+
+
+def _neighbourhood_range(image: ImageData, x: int, y: int) -> Tuple[List[int], List[int]]:
+	low = [255] * 4
+	high = [0] * 4
+	for yy in range(max(0, y - 1), min(image.height, y + 2)):
+		span = image.span(yy, max(0, x - 1), min(image.width, x + 2))
+		for offset in range(0, len(span), 4):
+			for channel in range(4):
+				value = span[offset + channel]
+				if value < low[channel]:
+					low[channel] = value
+				if value > high[channel]:
+					high[channel] = value
+	return low, high
+
+
+def _within(pixel: Sequence[int], low: Sequence[int], high: Sequence[int], tolerance: int) -> bool:
+	return all(low[c] - tolerance <= pixel[c] <= high[c] + tolerance for c in range(4))
+
+
+def _diff_tile_python(
+	golden: ImageData,
+	candidate: ImageData,
+	rect: Tuple[int, int, int, int],
+	tolerance: int,
+	antialias: bool,
+	result: DiffResult,
+) -> None:
+	x0, y0, x1, y1 = rect
+	for y in range(y0, y1):
+		expected = golden.span(y, x0, x1)
+		actual = candidate.span(y, x0, x1)
+		if expected == actual:
+			continue
+		for offset in range(0, len(expected), 4):
+			g = expected[offset:offset + 4]
+			c = actual[offset:offset + 4]
+			if all(abs(g[ch] - c[ch]) <= tolerance for ch in range(4)):
+				continue
+			point = (x0 + offset // 4, y)
+			if antialias:
+				g_low, g_high = _neighbourhood_range(golden, *point)
+				c_low, c_high = _neighbourhood_range(candidate, *point)
+				if _within(c, g_low, g_high, tolerance) and _within(g, c_low, c_high, tolerance):
+					result.antialiased.append(point)
+					continue
+			result.changed.append(point)
+
+
+def _as_array(image: ImageData) -> "np.ndarray":
+	return np.frombuffer(image.pixels, dtype=np.uint8).reshape(image.height, image.width, 4).astype(np.int16)
+
+
+def _window_range(padded: "np.ndarray", y0: int, y1: int, x0: int, x1: int) -> Tuple["np.ndarray", "np.ndarray"]:
+	# ``padded`` has a one-pixel edge-replicated border, so window (y, x) is padded[y:y+3, x:x+3].
+	shifts = [padded[y0 + dy:y1 + dy, x0 + dx:x1 + dx] for dy in range(3) for dx in range(3)]
+	return np.minimum.reduce(shifts), np.maximum.reduce(shifts)
+
+
+def _diff_tiles_numpy(
+	golden: ImageData,
+	candidate: ImageData,
+	rects: Sequence[Tuple[int, int, int, int]],
+	tolerance: int,
+	antialias: bool,
+	result: DiffResult,
+) -> None:
+	g = _as_array(golden)
+	c = _as_array(candidate)
+	if antialias:
+		g_pad = np.pad(g, ((1, 1), (1, 1), (0, 0)), mode="edge")
+		c_pad = np.pad(c, ((1, 1), (1, 1), (0, 0)), mode="edge")
+	for x0, y0, x1, y1 in rects:
+		gt = g[y0:y1, x0:x1]
+		ct = c[y0:y1, x0:x1]
+		over = (np.abs(gt - ct) > tolerance).any(axis=2)
+		aa = np.zeros_like(over)
+		if antialias and over.any():
+			g_low, g_high = _window_range(g_pad, y0, y1, x0, x1)
+			c_low, c_high = _window_range(c_pad, y0, y1, x0, x1)
+			aa = (
+				over
+				& ((g_low - tolerance <= ct) & (ct <= g_high + tolerance)).all(axis=2)
+				& ((c_low - tolerance <= gt) & (gt <= c_high + tolerance)).all(axis=2)
+			)
+		for mask, points in ((over & ~aa, result.changed), (aa, result.antialiased)):
+			ys, xs = np.nonzero(mask)
+			points.extend(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+
+def diff_images(
+	golden: ImageData,
+	candidate: ImageData,
+	tolerance: int = DEFAULT_TOLERANCE,
+	antialias: bool = True,
+	tile: int = TILE_SIZE,
+	name: str = "",
+) -> DiffResult:
+	"""Diff ``candidate`` against ``golden``; points are (x, y) in tile order, row-major within a tile."""
+	result = DiffResult(name)
+	if (golden.width, golden.height) != (candidate.width, candidate.height):
+		result.error = (
+			f"size mismatch: golden {golden.width}x{golden.height}, candidate {candidate.width}x{candidate.height}"
+		)
+		return result
+	result.tiles = len(_tile_rects(golden.width, golden.height, tile))
+	if golden.pixels == candidate.pixels:
+		return result
+	rects = _changed_tiles(golden, candidate, tile)
+	result.tiles_changed = len(rects)
+	if np is not None:
+		_diff_tiles_numpy(golden, candidate, rects, tolerance, antialias, result)
+	else:
+		for rect in rects:
+			_diff_tile_python(golden, candidate, rect, tolerance, antialias, result)
+	return result
+
+
+def render_heatmap(golden: ImageData, result: DiffResult) -> bytearray:
+	pixels = bytearray(golden.pixels.translate(_DIM_TABLE))
+	pixels[3::4] = b"\xff" * (golden.width * golden.height)
+	for points, color in ((result.antialiased, AA_COLOR), (result.changed, DIFF_COLOR)):
+		for x, y in points:
+			idx = (y * golden.width + x) * 4
+			pixels[idx:idx + 4] = color
+	return pixels
+
+
+def compare_dirs(
+	golden_dir: Path,
+	candidate_dir: Path,
+	tolerance: int = DEFAULT_TOLERANCE,
+	antialias: bool = True,
+	tile: int = TILE_SIZE,
+	max_pixels: int = 0,
+	heatmap_dir: Optional[Path] = None,
+	fail_fast: bool = False,
+) -> List[DiffResult]:
+	results = []
+	for golden_path in sorted(golden_dir.glob("*.png")):
+		candidate_path = candidate_dir / golden_path.name
+		if not candidate_path.exists():
+			results.append(DiffResult(golden_path.name, error="missing in candidate set"))
+		else:
+			try:
+				golden = read_png_rgba(golden_path)
+				candidate = read_png_rgba(candidate_path)
+			except BaselineError as exc:
+				results.append(DiffResult(golden_path.name, error=str(exc)))
+			else:
+				result = diff_images(golden, candidate, tolerance, antialias, tile, golden_path.name)
+				if heatmap_dir is not None and result.error is None and not result.ok(max_pixels):
+					heatmap_dir.mkdir(parents=True, exist_ok=True)
+					result.heatmap = heatmap_dir / f"{golden_path.stem}_diff.png"
+					write_png(result.heatmap, render_heatmap(golden, result), golden.width, golden.height)
+				results.append(result)
+		if fail_fast and not results[-1].ok(max_pixels):
+			break
+	return results
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="Diff HUD screenshots against golden baseline PNGs.")
+	parser.add_argument(
+		"--golden",
+		default="dev/screenshots/ui_baseline",
+		help="Directory containing golden PNGs (default: %(default)s).",
+	)
+	parser.add_argument(
+		"--candidate",
+		default="dev/screenshots/ui_current",
+		help="Directory containing captured PNGs with the same names (default: %(default)s).",
+	)
+	parser.add_argument(
+		"--tolerance",
+		type=int,
+		default=DEFAULT_TOLERANCE,
+		help="Allowed per-channel difference (default: %(default)s).",
+	)
+	parser.add_argument(
+		"--max-pixels",
+		type=int,
+		default=0,
+		help="Changed pixels allowed per image before it fails (default: %(default)s).",
+	)
+	parser.add_argument("--no-antialias", action="store_true", help="Count anti-aliased edge shifts as changes.")
+	parser.add_argument("--tile", type=int, default=TILE_SIZE, help="Tile edge in pixels (default: %(default)s).")
+	parser.add_argument("--heatmaps", help="Write <name>_diff.png heatmaps for failing images into this directory.")
+	parser.add_argument("--fail-fast", action="store_true", help="Stop at the first failing image.")
+	args = parser.parse_args(argv)
+	if args.tolerance < 0 or args.max_pixels < 0:
+		parser.error("--tolerance and --max-pixels must be >= 0.")
+	if args.tile < 1:
+		parser.error("--tile must be >= 1.")
+	return args
+
+
+def main(argv: Sequence[str]) -> int:
+	args = parse_args(argv)
+	golden_dir = Path(args.golden).expanduser()
+	candidate_dir = Path(args.candidate).expanduser()
+	for root in (golden_dir, candidate_dir):
+		if not root.is_dir():
+			print(f"[ui_diff] Missing directory: {root}", file=sys.stderr)
+			return 1
+	results = compare_dirs(
+		golden_dir,
+		candidate_dir,
+		tolerance=args.tolerance,
+		antialias=not args.no_antialias,
+		tile=args.tile,
+		max_pixels=args.max_pixels,
+		heatmap_dir=Path(args.heatmaps).expanduser() if args.heatmaps else None,
+		fail_fast=args.fail_fast,
+	)
+	if not results:
+		print(f"[ui_diff] No PNGs found in {golden_dir}", file=sys.stderr)
+		return 1
+	failed = 0
+	for result in results:
+		if result.error is not None:
+			failed += 1
+			print(f"[ui_diff] FAIL {result.name}: {result.error}", file=sys.stderr)
+			continue
+		summary = (
+			f"{len(result.changed)} px changed, {len(result.antialiased)} px anti-aliased, "
+			f"{result.tiles_changed}/{result.tiles} tiles touched"
+		)
+		if result.ok(args.max_pixels):
+			print(f"[ui_diff] OK   {result.name}: {summary}")
+		else:
+			failed += 1
+			where = f" -> {result.heatmap}" if result.heatmap else ""
+			print(f"[ui_diff] FAIL {result.name}: {summary}{where}", file=sys.stderr)
+	return 1 if failed else 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main(sys.argv[1:]))
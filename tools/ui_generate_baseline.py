@@ -2,27 +2,56 @@
 """
 Generate placeholder HUD baseline PNGs that match the documentation spec.
 
-The generator writes four deterministic 1280x720 RGBA images:
+Images are listed in a scenario manifest (default:
+contracts/ui_baseline_scenarios.json). Each scenario names the PNG, the HUD
+slots it fills (outline or block, accent colour, active state) and the
+contract resolutions to render. The default manifest writes four
+deterministic RGBA images:
   - hud_blank_reference.png
   - hud_power_normal.png
   - hud_power_warning.png
   - hud_power_critical.png
 
-Each image renders safe-area guides and slot blocks for the HUD dock.
+Each image renders safe-area guides and slot blocks for the HUD dock. Dock and
+slot rects come from contracts/ui_layout.json; ``--layout`` overrides the
+manifest resolutions. Non-reference layouts get their name as a suffix, e.g.
+hud_power_normal_1080p.png.
+
+Generation is incremental: .ui_baseline_index.json in the output directory
+records a digest of each image's inputs and of the written file, and only
+scenarios whose digest changed are rendered again.
+
+Rects are filled one row slice at a time, the dock canvas is rendered once per
+layout and copied for each variant, and ``--jobs`` renders and encodes the
+images on worker processes.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
 import struct
 import zlib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ui_layout import ROOT, ContractError, Layout, LayoutContract, load_contract
 
 WIDTH = 1280
 HEIGHT = 720
+DEFAULT_MANIFEST = ROOT / "contracts" / "ui_baseline_scenarios.json"
+INDEX_NAME = ".ui_baseline_index.json"
+INDEX_VERSION = 1
+GENERATOR_VERSION = 1  # bump when drawing code changes the pixels of existing scenarios
+SLOT_STYLES = {"outline": "#2F363FFF", "block": "#FFFFFFFF"}  # style -> default accent
+
+
+class ManifestError(Exception):
+	"""Raised when the scenario manifest is malformed."""
 
 
 @dataclass(frozen=True)
@@ -41,6 +70,27 @@ class Rect:
 		return self.y + self.h
 
 
+@dataclass(frozen=True)
+class SlotSpec:
+	key: str
+	style: str
+	accent: str
+	active: bool = True
+
+
+@dataclass(frozen=True)
+class Scenario:
+	name: str
+	slots: Tuple[SlotSpec, ...]
+	resolutions: Tuple[str, ...] = ()  # empty: the manifest default
+
+
+class Task(NamedTuple):
+	path: Path
+	layout: Layout
+	scenario: Scenario
+
+
 def hex_rgba(value: str) -> Tuple[int, int, int, int]:
 	value = value.strip()
 	if value.startswith("#") and len(value) in (7, 9):
@@ -61,25 +111,25 @@ def hex_rgba(value: str) -> Tuple[int, int, int, int]:
 	return r, g, b, a
 
 
-def draw_rect(pixels: bytearray, rect: Rect, color: Tuple[int, int, int, int]) -> None:
-	r, g, b, a = color
-	for yy in range(rect.y, rect.y1):
-		row_offset = (yy * WIDTH + rect.x) * 4
-		for xx in range(rect.w):
-			idx = row_offset + xx * 4
-			pixels[idx] = r
-			pixels[idx + 1] = g
-			pixels[idx + 2] = b
-			pixels[idx + 3] = a
+def draw_rect(pixels: bytearray, rect: Rect, color: Tuple[int, int, int, int], width: int = WIDTH) -> None:
+	if rect.w <= 0 or rect.h <= 0:
+		return
+	span = bytes(color) * rect.w
+	stride = width * 4
+	start = (rect.y * width + rect.x) * 4
+	for offset in range(start, start + rect.h * stride, stride):
+		pixels[offset:offset + len(span)] = span
 
 
-def draw_border(pixels: bytearray, rect: Rect, color: Tuple[int, int, int, int], thickness: int = 1) -> None:
+def draw_border(
+	pixels: bytearray, rect: Rect, color: Tuple[int, int, int, int], thickness: int = 1, width: int = WIDTH
+) -> None:
 	top = Rect(rect.x, rect.y, rect.w, thickness)
 	bottom = Rect(rect.x, rect.y1 - thickness, rect.w, thickness)
 	left = Rect(rect.x, rect.y, thickness, rect.h)
 	right = Rect(rect.x1 - thickness, rect.y, thickness, rect.h)
 	for band in (top, bottom, left, right):
-		draw_rect(pixels, band, color)
+		draw_rect(pixels, band, color, width)
 
 
 def blend_color(base: Tuple[int, int, int, int], mix: Tuple[int, int, int, int], weight: float) -> Tuple[int, int, int, int]:
@@ -90,92 +140,281 @@ def blend_color(base: Tuple[int, int, int, int], mix: Tuple[int, int, int, int],
 	return r, g, b, a
 
 
-def write_png(path: Path, pixels: bytearray) -> None:
+def write_png(path: Path, pixels: bytearray, width: int = WIDTH, height: int = HEIGHT) -> None:
 	def chunk(tag: bytes, data: bytes) -> bytes:
 		return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
 
-	raw = bytearray()
-	for row in range(HEIGHT):
-		raw.append(0)  # filter type 0
-		offset = row * WIDTH * 4
-		raw.extend(pixels[offset:offset + WIDTH * 4])
+	# Rows are streamed into the compressor, so the filtered image is never
+	# copied as a whole.
+	stride = width * 4
+	view = memoryview(pixels)
+	compressor = zlib.compressobj(9)
+	parts = []
+	for offset in range(0, height * stride, stride):
+		parts.append(compressor.compress(b"\x00"))  # filter type 0
+		parts.append(compressor.compress(view[offset:offset + stride]))
+	parts.append(compressor.flush())
 
 	with path.open("wb") as handle:
 		handle.write(b"\x89PNG\r\n\x1a\n")
-		handle.write(chunk(b"IHDR", struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 6, 0, 0, 0)))
-		handle.write(chunk(b"IDAT", zlib.compress(bytes(raw), level=9)))
+		handle.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+		handle.write(chunk(b"IDAT", b"".join(parts)))
 		handle.write(chunk(b"IEND", b""))
 
 
-def base_canvas() -> bytearray:
-	bg = hex_rgba("#14181F")
-	pixels = bytearray([bg[0], bg[1], bg[2], bg[3]] * WIDTH * HEIGHT)
+def scaled(layout: Layout, value: int) -> int:
+	return max(1, int(value * layout.scale + 0.5))
 
-	hud_dock = Rect(928, 24, 288, 128)
-	draw_border(pixels, hud_dock, hex_rgba("#2A3038FF"), thickness=1)
 
-	return pixels
+_BASE_CANVASES: Dict[Tuple[str, int, int], bytes] = {}
 
 
-def draw_slot_block(pixels: bytearray, rect: Rect, accent: Tuple[int, int, int, int], active: bool) -> None:
+def base_canvas(layout: Layout) -> bytearray:
+	"""Fresh copy of the background and dock outline, rendered once per layout."""
+	key = (layout.name, layout.width, layout.height)
+	cached = _BASE_CANVASES.get(key)
+	if cached is None:
+		bg = hex_rgba("#14181F")
+		pixels = bytearray(bytes(bg) * layout.width * layout.height)
+
+		hud_dock = Rect(*layout.regions["hud_dock"])
+		draw_border(pixels, hud_dock, hex_rgba("#2A3038FF"), thickness=scaled(layout, 1), width=layout.width)
+
+		cached = _BASE_CANVASES[key] = bytes(pixels)
+	return bytearray(cached)
+
+
+def draw_slot_block(
+	pixels: bytearray, layout: Layout, rect: Rect, accent: Tuple[int, int, int, int], active: bool
+) -> None:
+	width = layout.width
 	fill = blend_color(hex_rgba("#1D222AFF"), accent, 0.08 if active else 0.0)
 	border = blend_color(accent, hex_rgba("#0F1318FF"), 0.6)
-	draw_rect(pixels, rect, fill)
-	draw_border(pixels, rect, border, thickness=1)
+	draw_rect(pixels, rect, fill, width)
+	draw_border(pixels, rect, border, thickness=scaled(layout, 1), width=width)
 
-	icon_size = rect.h - 12
-	icon_rect = Rect(rect.x + 10, rect.y + 6, icon_size, icon_size)
+	icon_size = rect.h - scaled(layout, 12)
+	icon_rect = Rect(rect.x + scaled(layout, 10), rect.y + scaled(layout, 6), icon_size, icon_size)
 	icon_color = blend_color(accent, hex_rgba("#0F1318FF"), 0.3)
-	draw_rect(pixels, icon_rect, icon_color)
-
-	text_bar_rect = Rect(rect.x + icon_size + 16, rect.y + rect.h - 6, rect.w - icon_size - 24, 4)
+	draw_rect(pixels, icon_rect, icon_color, width)
+
+	text_bar_rect = Rect(
+		rect.x + icon_size + scaled(layout, 16),
+		rect.y + rect.h - scaled(layout, 6),
+		rect.w - icon_size - scaled(layout, 24),
+		scaled(layout, 4),
+	)
 	text_color = blend_color(accent, hex_rgba("#FFFFFF80"), 0.5)
-	draw_rect(pixels, text_bar_rect, text_color)
+	draw_rect(pixels, text_bar_rect, text_color, width)
 
 
-def create_blank_reference() -> bytearray:
-	pixels = base_canvas()
-	slot_outline = hex_rgba("#2F363FFF")
-	for rect in SLOT_RECTS:
-		draw_border(pixels, rect, slot_outline, thickness=1)
+def render_scenario(layout: Layout, scenario: Scenario) -> bytearray:
+	pixels = base_canvas(layout)
+	for slot in scenario.slots:
+		rect = Rect(*layout.slots[slot.key])
+		if slot.style == "outline":
+			draw_border(pixels, rect, hex_rgba(slot.accent), thickness=scaled(layout, 1), width=layout.width)
+		else:
+			draw_slot_block(pixels, layout, rect, hex_rgba(slot.accent), slot.active)
 	return pixels
 
 
-def create_power_variant(accent: Tuple[int, int, int, int]) -> bytearray:
-	pixels = base_canvas()
-	normal = hex_rgba("#FFFFFFFF")
-	for rect in SLOT_RECTS[1:]:
-		draw_slot_block(pixels, rect, normal, active=True)
-	draw_slot_block(pixels, SLOT_RECTS[0], accent, active=True)
-	return pixels
-
-
-SLOT_RECTS = [
-	Rect(992, 24, 224, 32),   # A: power
-	Rect(992, 64, 224, 32),   # B: economy
-	Rect(992, 104, 224, 32),  # C: population
-]
-
-
-def generate(output_dir: Path) -> None:
-	output_dir.mkdir(parents=True, exist_ok=True)
-	for png in output_dir.glob("*.png"):
-		png.unlink()
-
-	images = {
-		"hud_blank_reference.png": create_blank_reference(),
-		"hud_power_normal.png": create_power_variant(hex_rgba("#FFFFFFFF")),
-		"hud_power_warning.png": create_power_variant(hex_rgba("#FFB300FF")),
-		"hud_power_critical.png": create_power_variant(hex_rgba("#FF1744FF")),
+def input_digest(layout: Layout, scenario: Scenario) -> str:
+	"""Hash of everything that determines the rendered pixels of one image."""
+	inputs = {
+		"generator": GENERATOR_VERSION,
+		"size": layout.size,
+		"scale": layout.scale,
+		"hud_dock": layout.regions["hud_dock"],
+		"slots": [
+			[slot.key, slot.style, slot.accent, slot.active, layout.slots[slot.key]] for slot in scenario.slots
+		],
 	}
-
-	for name, pixels in images.items():
-		write_png(output_dir / name, pixels)
+	return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+	return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def write_scenario(path: Path, layout: Layout, scenario: Scenario) -> Tuple[str, str]:
+	write_png(path, render_scenario(layout, scenario), layout.width, layout.height)
+	return path.name, file_digest(path)
+
+
+def load_manifest(path: Path) -> Tuple[Tuple[str, ...], Tuple[Scenario, ...]]:
+	"""Parse a scenario manifest into its default resolutions and scenarios."""
+	try:
+		data = json.loads(Path(path).read_text(encoding="utf-8"))
+	except (OSError, ValueError) as exc:
+		raise ManifestError(f"Cannot read scenario manifest {path}: {exc}") from exc
+	if not isinstance(data, dict) or not isinstance(data.get("scenarios"), list):
+		raise ManifestError("Manifest must define a 'scenarios' list.")
+	resolutions = _names(data.get("resolutions", ["720p"]), "resolutions")
+	scenarios = []
+	for index, entry in enumerate(data["scenarios"]):
+		where = f"scenarios[{index}]"
+		if not isinstance(entry, dict) or not isinstance(entry.get("name"), str) or not entry["name"]:
+			raise ManifestError(f"{where} must be an object with a 'name'.")
+		specs = entry.get("slots", {})
+		if not isinstance(specs, dict):
+			raise ManifestError(f"{where}.slots must be an object keyed by slot id.")
+		slots = []
+		for key, spec in specs.items():
+			spec = spec or {}
+			style = spec.get("style", "block")
+			if style not in SLOT_STYLES:
+				raise ManifestError(f"{where}.slots.{key}: style must be one of {', '.join(SLOT_STYLES)}.")
+			accent = spec.get("accent", SLOT_STYLES[style])
+			try:
+				hex_rgba(accent)
+			except (AttributeError, TypeError, ValueError) as exc:
+				raise ManifestError(f"{where}.slots.{key}: bad accent {accent!r}.") from exc
+			slots.append(SlotSpec(key, style, accent, bool(spec.get("active", True))))
+		own = entry.get("resolutions")
+		scenarios.append(
+			Scenario(entry["name"], tuple(slots), _names(own, f"{where}.resolutions") if own is not None else ())
+		)
+	return resolutions, tuple(scenarios)
+
+
+def _names(value: object, where: str) -> Tuple[str, ...]:
+	if isinstance(value, str):
+		value = [value]
+	if not isinstance(value, list) or not value or not all(isinstance(item, str) for item in value):
+		raise ManifestError(f"{where} must be a resolution name or a non-empty list of names.")
+	return tuple(value)
+
+
+def plan_tasks(
+	output_dir: Path,
+	contract: LayoutContract,
+	resolutions: Sequence[str],
+	scenarios: Sequence[Scenario],
+	override: Optional[Sequence[str]] = None,
+) -> List[Task]:
+	"""Expand scenarios over their resolutions; ``override`` replaces every resolution list."""
+	tasks: List[Task] = []
+	names: Dict[str, str] = {}
+	for scenario in scenarios:
+		wanted = override or scenario.resolutions or resolutions
+		layouts = contract.layouts if "all" in wanted else tuple(contract.named(name) for name in wanted)
+		for layout in layouts:
+			suffix = "" if layout == contract.reference else f"_{layout.name}"
+			filename = f"{scenario.name}{suffix}.png"
+			if filename in names:
+				raise ManifestError(f"Scenario '{scenario.name}' writes {filename} twice.")
+			names[filename] = scenario.name
+			missing = [slot.key for slot in scenario.slots if slot.key not in layout.slots]
+			if missing:
+				raise ManifestError(f"Scenario '{scenario.name}' uses unknown slot(s) {', '.join(missing)}.")
+			tasks.append(Task(output_dir / filename, layout, scenario))
+	return tasks
+
+
+@dataclass
+class GenerateStats:
+	rendered: int = 0
+	unchanged: int = 0
+	removed: int = 0
+
+
+def generate(output_dir: Path, tasks: Sequence[Task], jobs: int = 1, force: bool = False, clean: bool = False) -> GenerateStats:
+	"""Render only the images whose inputs changed since the last run.
+
+	The index in ``output_dir`` maps each PNG to the digest of its inputs and
+	of the written file, so an image is rendered again when its scenario,
+	resolved layout or generator version changes, or when the file on disk
+	was edited or removed. PNGs the index tracks but the plan no longer
+	lists are deleted; ``clean`` also deletes untracked PNGs.
+	"""
+	output_dir.mkdir(parents=True, exist_ok=True)
+	index_path = output_dir / INDEX_NAME
+	index = _read_index(index_path)
+	stats = GenerateStats()
+	entries: Dict[str, Dict[str, str]] = {}
+	pending: List[Task] = []
+	for task in tasks:
+		key = input_digest(task.layout, task.scenario)
+		entries[task.path.name] = {"inputs": key}
+		known = index.get(task.path.name)
+		if (
+			not force
+			and known is not None
+			and known.get("inputs") == key
+			and task.path.is_file()
+			and file_digest(task.path) == known.get("sha256")
+		):
+			entries[task.path.name]["sha256"] = known["sha256"]
+			stats.unchanged += 1
+		else:
+			pending.append(task)
+
+	for name, digest in _run_tasks(pending, jobs):
+		entries[name]["sha256"] = digest
+		stats.rendered += 1
+
+	stale = set(index) - set(entries)
+	if clean:
+		stale |= {png.name for png in output_dir.glob("*.png")} - set(entries)
+	for name in sorted(stale):
+		path = output_dir / name
+		if path.is_file():
+			path.unlink()
+			stats.removed += 1
+
+	payload = {"version": INDEX_VERSION, "images": dict(sorted(entries.items()))}
+	scratch = index_path.with_suffix(".tmp")
+	scratch.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+	scratch.replace(index_path)
+	return stats
+
+
+def _read_index(path: Path) -> Dict[str, Dict[str, str]]:
+	try:
+		data = json.loads(path.read_text(encoding="utf-8"))
+	except (OSError, ValueError):
+		return {}
+	if not isinstance(data, dict) or data.get("version") != INDEX_VERSION or not isinstance(data.get("images"), dict):
+		return {}
+	return data["images"]
+
+
+def _run_tasks(tasks: Sequence[Task], jobs: int) -> List[Tuple[str, str]]:
+	"""Render and encode ``tasks`` on ``jobs`` processes (0 = all cores)."""
+	jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+	jobs = min(jobs, len(tasks))
+	if jobs <= 1:
+		return [write_scenario(*task) for task in tasks]
+	# Workers receive the layout rather than rendered pixels, so each one
+	# keeps its own base canvas cache and no image buffer is pickled.
+	with ProcessPoolExecutor(max_workers=jobs) as pool:
+		return list(pool.map(write_scenario, *zip(*tasks)))
 
 
 def parse_args(argv: Iterable[str]) -> argparse.Namespace:
 	parser = argparse.ArgumentParser(description="Generate placeholder HUD baseline PNGs.")
 	parser.add_argument("--output", "-o", required=True, help="Directory to populate with baseline PNGs.")
+	parser.add_argument(
+		"--manifest",
+		type=Path,
+		default=DEFAULT_MANIFEST,
+		help="Scenario manifest JSON (default: contracts/ui_baseline_scenarios.json).",
+	)
+	parser.add_argument(
+		"--layout",
+		action="append",
+		help="Contract resolution to render (repeatable, 'all' for every one); overrides the manifest resolutions.",
+	)
+	parser.add_argument("--contract", type=Path, help="Layout contract JSON (default: contracts/ui_layout.json).")
+	parser.add_argument(
+		"--jobs",
+		type=int,
+		default=1,
+		help="Worker processes for rendering and encoding (0 = all cores, default: 1).",
+	)
+	parser.add_argument("--force", action="store_true", help="Render every scenario, ignoring the index.")
+	parser.add_argument("--clean", action="store_true", help="Also delete PNGs in the output the manifest does not list.")
 	return parser.parse_args(argv)
 
 
@@ -184,7 +423,18 @@ def main() -> int:
 	output_path = Path(args.output).expanduser()
 	if not output_path.is_absolute():
 		output_path = (Path.cwd() / output_path).resolve()
-	generate(output_path)
+	try:
+		contract = load_contract(args.contract.expanduser().resolve()) if args.contract else load_contract()
+		resolutions, scenarios = load_manifest(args.manifest.expanduser())
+		tasks = plan_tasks(output_path, contract, resolutions, scenarios, args.layout)
+	except (ContractError, ManifestError) as exc:
+		print(f"[ui_generate_baseline] {exc}", file=os.sys.stderr)
+		return 1
+	stats = generate(output_path, tasks, args.jobs, args.force, args.clean)
+	print(
+		f"[ui_generate_baseline] {output_path}: {stats.rendered} rendered, "
+		f"{stats.unchanged} unchanged, {stats.removed} removed"
+	)
 	return 0
 
 
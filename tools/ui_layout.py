@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Shared HUD layout contract (contracts/ui_layout.json).
+
+Regions and slots are defined once at the reference viewport, each with an
+anchor, mirroring docs/ui_baselines/ui_matrix.md. Every entry under
+``resolutions`` resolves them. Sizes scale with the viewport height. Positions
+keep their distance to the anchored edge:
+  - tl: top-left
+  - tr: top-right
+  - bc: bottom-centre
+  - cc: centre
+  - stretch: all four margins scale
+
+Safe-area margins scale the same way. Each resolved layout is compiled once
+into row-span masks, so pixel checks cost one comparison per row span.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONTRACT = ROOT / "contracts" / "ui_layout.json"
+ANCHORS = ("tl", "tr", "bc", "cc", "stretch")
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+Bounds = Tuple[int, int, int, int]  # left, top, right, bottom (exclusive)
+Span = Tuple[int, int, int]  # y, x0, x1 (exclusive)
+
+
+class ContractError(Exception):
+	"""Raised when the layout contract file is malformed."""
+
+
+@dataclass(frozen=True)
+class SpanMask:
+	spans: Tuple[Span, ...]
+
+	@property
+	def area(self) -> int:
+		return sum(x1 - x0 for _, x0, x1 in self.spans)
+
+	@classmethod
+	def from_rect(cls, rect: Rect) -> "SpanMask":
+		x, y, w, h = rect
+		return cls(tuple((yy, x, x + w) for yy in range(y, y + h)))
+
+	@classmethod
+	def outside(cls, bounds: Bounds, width: int, height: int) -> "SpanMask":
+		"""Every pixel of a ``width`` x ``height`` viewport outside ``bounds``."""
+		left, top, right, bottom = bounds
+		spans: List[Span] = []
+		for y in range(height):
+			if y < top or y >= bottom:
+				spans.append((y, 0, width))
+				continue
+			if left > 0:
+				spans.append((y, 0, left))
+			if right < width:
+				spans.append((y, right, width))
+		return cls(tuple(spans))
+
+
+@dataclass(frozen=True)
+class Layout:
+	name: str
+	width: int
+	height: int
+	scale: float
+	safe_area: Bounds
+	regions: Dict[str, Rect]
+	slots: Dict[str, Rect]
+	toast_mask: SpanMask
+	outside_safe_mask: SpanMask
+
+	@property
+	def size(self) -> Tuple[int, int]:
+		return self.width, self.height
+
+
+@dataclass(frozen=True)
+class LayoutContract:
+	path: Path
+	digest: str
+	reference: Layout
+	layouts: Tuple[Layout, ...]
+
+	def for_size(self, width: int, height: int) -> Optional[Layout]:
+		for layout in self.layouts:
+			if layout.size == (width, height):
+				return layout
+		return None
+
+	def named(self, name: str) -> Layout:
+		for layout in self.layouts:
+			if layout.name == name:
+				return layout
+		known = ", ".join(layout.name for layout in self.layouts)
+		raise ContractError(f"Unknown layout '{name}' (known: {known}).")
+
+	def sizes(self) -> str:
+		return ", ".join(f"{layout.width}x{layout.height}" for layout in self.layouts)
+
+
+def _px(value: float) -> int:
+	return int(value + 0.5) if value >= 0 else -int(-value + 0.5)
+
+
+def _int_field(spec: dict, key: str, where: str) -> int:
+	if not isinstance(spec, dict):
+		raise ContractError(f"{where} must be an object.")
+	value = spec.get(key)
+	if not isinstance(value, int) or isinstance(value, bool):
+		raise ContractError(f"{where}: '{key}' must be an integer.")
+	return value
+
+
+def resolve_rect(spec: dict, where: str, reference: Tuple[int, int], size: Tuple[int, int]) -> Rect:
+	ref_w, ref_h = reference
+	width, height = size
+	x, y, w, h = (_int_field(spec, key, where) for key in ("x", "y", "w", "h"))
+	anchor = spec.get("anchor", "tl")
+	if anchor not in ANCHORS:
+		raise ContractError(f"{where}: anchor must be one of {', '.join(ANCHORS)}.")
+	scale = height / ref_h
+	if anchor == "stretch":
+		left, top = x * scale, y * scale
+		right = width - (ref_w - x - w) * scale
+		bottom = height - (ref_h - y - h) * scale
+	else:
+		if anchor == "tl":
+			left, top = x * scale, y * scale
+		elif anchor == "tr":
+			left, top = width - (ref_w - x) * scale, y * scale
+		elif anchor == "bc":
+			left, top = width / 2 - (ref_w / 2 - x) * scale, height - (ref_h - y) * scale
+		else:
+			left, top = width / 2 - (ref_w / 2 - x) * scale, height / 2 - (ref_h / 2 - y) * scale
+		right, bottom = left + w * scale, top + h * scale
+	x0, y0 = _px(left), _px(top)
+	return x0, y0, _px(right) - x0, _px(bottom) - y0
+
+
+def _compile_layout(name: str, reference: dict, size: Tuple[int, int]) -> Layout:
+	viewport = reference.get("viewport") or {}
+	ref_size = (_int_field(viewport, "w", "reference.viewport"), _int_field(viewport, "h", "reference.viewport"))
+	width, height = size
+	scale = height / ref_size[1]
+	safe = reference.get("safe_area") or {}
+	left, top, right, bottom = (_int_field(safe, key, "reference.safe_area") for key in ("left", "top", "right", "bottom"))
+	safe_area = (
+		_px(left * scale),
+		_px(top * scale),
+		width - _px((ref_size[0] - right) * scale),
+		height - _px((ref_size[1] - bottom) * scale),
+	)
+	groups: Dict[str, Dict[str, Rect]] = {}
+	for group in ("regions", "slots"):
+		specs = reference.get(group)
+		if not isinstance(specs, dict):
+			raise ContractError(f"reference.{group} must be an object.")
+		groups[group] = {
+			key: resolve_rect(spec, f"reference.{group}.{key}", ref_size, size) for key, spec in specs.items()
+		}
+	if "toast" not in groups["regions"]:
+		raise ContractError("reference.regions must define 'toast'.")
+	return Layout(
+		name=name,
+		width=width,
+		height=height,
+		scale=scale,
+		safe_area=safe_area,
+		regions=groups["regions"],
+		slots=groups["slots"],
+		toast_mask=SpanMask.from_rect(groups["regions"]["toast"]),
+		outside_safe_mask=SpanMask.outside(safe_area, width, height),
+	)
+
+
+@lru_cache(maxsize=None)
+def load_contract(path: Path = DEFAULT_CONTRACT) -> LayoutContract:
+	"""Parse and compile the contract; cached per path, so each process compiles it once."""
+	try:
+		raw = Path(path).read_bytes()
+		data = json.loads(raw)
+	except (OSError, ValueError) as exc:
+		raise ContractError(f"Cannot read layout contract {path}: {exc}") from exc
+	reference = data.get("reference") if isinstance(data, dict) else None
+	if not isinstance(reference, dict):
+		raise ContractError("Contract must define a 'reference' layout.")
+	viewport = reference.get("viewport") or {}
+	ref_size = (_int_field(viewport, "w", "reference.viewport"), _int_field(viewport, "h", "reference.viewport"))
+	layouts = []
+	for index, entry in enumerate(data.get("resolutions") or []):
+		where = f"resolutions[{index}]"
+		size = (_int_field(entry, "w", where), _int_field(entry, "h", where))
+		layouts.append(_compile_layout(str(entry.get("name") or f"{size[0]}x{size[1]}"), reference, size))
+	if len({layout.size for layout in layouts}) != len(layouts):
+		raise ContractError("Contract lists the same resolution twice.")
+	reference_layout = next((layout for layout in layouts if layout.size == ref_size), None)
+	if reference_layout is None:
+		reference_layout = _compile_layout("reference", reference, ref_size)
+		layouts.insert(0, reference_layout)
+	return LayoutContract(
+		path=Path(path),
+		digest=hashlib.sha256(raw).hexdigest(),
+		reference=reference_layout,
+		layouts=tuple(layouts),
+	)
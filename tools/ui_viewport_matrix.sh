@@ -123,7 +123,7 @@ PY
 )"
 	fi
 	echo "[ui_viewport_matrix] generating placeholder HUD matrix at ${OUTPUT_DIR}"
-	python3 "${SCRIPT_DIR}/ui_generate_baseline.py" --output "${OUTPUT_DIR}"
+	python3 "${SCRIPT_DIR}/ui_generate_baseline.py" --output "${OUTPUT_DIR}" --clean
 	exit 0
 fi
 
@@ -3,15 +3,33 @@
 Lightweight TSV validator for Yolkless upgrade/research data.
 
 Checks column headers, empty cells, id/tier uniqueness, and dependency cycles.
+data/balance.tsv is sectioned and goes through balance_tables instead.
 Writes validation output to logs/validation/YYYYMMDD.log and exits non-zero on failure.
+
+Results are cached per table in logs/validation/.validate_tables_cache.sqlite,
+keyed by the file's SHA-256 and a digest of this script, so unchanged tables
+are not parsed again. --watch keeps the results in memory and re-validates a
+table only when its file changes.
 """
 
 import argparse
 import collections
 import datetime
+import hashlib
+import json
+import operator
+import os
 import pathlib
+import sqlite3
 import sys
-from typing import Dict, List, Set, Tuple
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import balance_tables
+import tsv_loader
+from tsv_loader import Column, Table, TableSchema, parse_table
+
+CACHE_PATH = pathlib.Path("logs/validation/.validate_tables_cache.sqlite")
 
 
 def parse_args() -> argparse.Namespace:
@@ -26,12 +44,35 @@ def parse_args() -> argparse.Namespace:
         required=False,
         help="Optional reference doc path for logging context.",
     )
+    parser.add_argument(
+        "--cache",
+        type=pathlib.Path,
+        default=CACHE_PATH,
+        help="Validation cache path (default: %(default)s).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Validate every table without the cache.")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-validate each table when its file changes.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between file checks in --watch mode (default: %(default)s).",
+    )
     return parser.parse_args()
 
 
 def load_tsv(path: pathlib.Path) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Dict-per-row view for ad-hoc scripts; the validators use tsv_loader tables."""
+    return parse_tsv(path.read_text(encoding="utf-8"))
+
+
+def parse_tsv(source: str) -> Tuple[List[str], List[Dict[str, str]]]:
     rows: List[Dict[str, str]] = []
-    text = path.read_text(encoding="utf-8").strip().splitlines()
+    text = source.strip().splitlines()
     headers = [h.strip() for h in text[0].split("\t")]
     for line in text[1:]:
         if not line or line.startswith("#"):
@@ -56,33 +97,42 @@ def check_headers(headers: List[str]) -> List[str]:
     return errors
 
 
-def check_empty_cells(rows: List[Dict[str, str]], critical_fields: Set[str]) -> List[str]:
+def check_empty_cells(table: Table, critical_fields: Set[str]) -> List[str]:
     errors: List[str] = []
-    for idx, row in enumerate(rows):
+    empty = {
+        field: {idx for idx, value in enumerate(table.text(field)) if value == ""}
+        for field in critical_fields
+        if field in table.columns and "" in table.text(field)
+    }
+    for idx in sorted(set().union(*empty.values())):
         for field in critical_fields:
-            if field in row and row[field] == "":
+            if idx in empty.get(field, ()):
                 errors.append(f"Row {idx + 2}: field '{field}' is empty.")
     return errors
 
 
-def check_unique(rows: List[Dict[str, str]], key_fields: Tuple[str, ...]) -> List[str]:
+def check_unique(table: Table, key_fields: Tuple[str, ...]) -> List[str]:
     errors: List[str] = []
+    if len(key_fields) == 1:
+        column = table.text(key_fields[0])
+        if len(set(column)) == len(column):
+            return errors
+    keys = list(zip(*(table.text(field) for field in key_fields)))
+    if len(set(keys)) == len(keys):
+        return errors
     seen: Set[Tuple[str, ...]] = set()
-    for idx, row in enumerate(rows):
-        key = tuple(row.get(field, "") for field in key_fields)
+    for idx, key in enumerate(keys):
         if key in seen:
             errors.append(f"Row {idx + 2}: duplicate key {key}.")
         seen.add(key)
     return errors
 
 
-def build_dependency_graph(rows: List[Dict[str, str]], id_field: str, requires_field: str) -> Dict[str, Set[str]]:
+def build_dependency_graph(table: Table, id_field: str, requires_field: str) -> Dict[str, Set[str]]:
     graph: Dict[str, Set[str]] = collections.defaultdict(set)
-    for row in rows:
-        node = row.get(id_field, "")
+    for node, requires in zip(table.text(id_field), table.text(requires_field)):
         if not node:
             continue
-        requires = row.get(requires_field, "")
         if not requires or requires == "-":
             continue
         for dep in requires.split(","):
@@ -119,81 +169,101 @@ def detect_cycle(graph: Dict[str, Set[str]]) -> Tuple[bool, List[str]]:
     return False, []
 
 
-def validate_environment_profiles(headers: List[str], rows: List[Dict[str, str]]) -> List[str]:
+UNIT_FIELDS = (
+    "humidity_mean",
+    "humidity_swing",
+    "light_mean",
+    "light_swing",
+    "air_mean",
+    "air_swing",
+    "wind_mean",
+)
+ENVIRONMENT_PROFILES = TableSchema(
+    [
+        Column("profile_id", "id"),
+        Column("label"),
+        Column("daylen", "float"),
+        Column("temp_min", "float", min=0.0, max=1.0),
+        Column("temp_max", "float", min=0.0, max=1.0),
+        *(Column(field, "float", min=0.0, max=1.0) for field in UNIT_FIELDS),
+        Column("theme"),
+        Column("tier_min", "int"),
+    ]
+)
+SCHEMAS = {"environment_profiles.tsv": ENVIRONMENT_PROFILES}
+
+
+def validate_environment_profiles(table: Table) -> List[str]:
+    """Range and ordering checks, evaluated per column.
+
+    Findings are collected check by check as (data index, message) and then
+    stably sorted by row, which reproduces the row-major message order.
+    """
     errors: List[str] = []
-    required_columns = {
-        "profile_id",
-        "label",
-        "daylen",
-        "temp_min",
-        "temp_max",
-        "humidity_mean",
-        "humidity_swing",
-        "light_mean",
-        "light_swing",
-        "air_mean",
-        "air_swing",
-        "wind_mean",
-        "theme",
-        "tier_min",
-    }
-    missing = required_columns.difference(headers)
+    missing = table.missing()
     if missing:
-        errors.append("missing columns: %s" % ", ".join(sorted(missing)))
+        errors.append("missing columns: %s" % ", ".join(missing))
         return errors
 
+    columns = table.columns
+    found: List[Tuple[int, str]] = []
+    # A row whose temperatures do not parse is reported once and skips every other check.
+    skipped = set(table.invalid.get("temp_min", ())) | set(table.invalid.get("temp_max", ()))
+    found.extend((idx, "temp_min/temp_max must be numeric") for idx in skipped)
+
+    def unit_range(field: str) -> None:
+        values = columns[field]
+        found.extend(
+            (idx, f"{field} {values[idx]} outside 0-1 range") for idx in table.out_of_range(field) if idx not in skipped
+        )
+
+    unit_range("temp_min")
+    unit_range("temp_max")
+    temp_min, temp_max = columns["temp_min"], columns["temp_max"]
+    if len(table) and not all(map(operator.le, temp_min, temp_max)):
+        found.extend(
+            (idx, f"temp_min {low} exceeds temp_max {high}")
+            for idx, (low, high) in enumerate(zip(temp_min, temp_max))
+            if low > high and idx not in skipped
+        )
+
+    for field in UNIT_FIELDS:
+        found.extend((idx, f"{field} must be numeric") for idx in table.invalid.get(field, ()) if idx not in skipped)
+        unit_range(field)
+
+    daylen = columns["daylen"]  # unparseable cells hold 0.0, which fails the minimum
+    if len(table) and not min(daylen) >= 120.0:
+        found.extend(
+            (idx, f"daylen {value} below minimum 120s")
+            for idx, value in enumerate(daylen)
+            if value < 120.0 and idx not in skipped
+        )
+
+    found.extend(_tier_order(table, skipped))
+    found.sort(key=lambda item: item[0])
+    errors.extend(f"Row {idx + 2}: {message}" for idx, message in found)
+    return errors
+
+
+def _tier_order(table: Table, skipped: Set[int]) -> List[Tuple[int, str]]:
+    tiers = table.columns["tier_min"]
+    invalid = set(table.invalid.get("tier_min", ()))
+    if not skipped and not invalid and (not tiers or (min(tiers) >= 0 and all(map(operator.le, tiers, tiers[1:])))):
+        return []
+    found: List[Tuple[int, str]] = []
     previous_tier = -1
-    for idx, row in enumerate(rows):
-        row_num = idx + 2
-        try:
-            temp_min = float(row.get("temp_min", "0"))
-            temp_max = float(row.get("temp_max", "0"))
-        except ValueError:
-            errors.append(f"Row {row_num}: temp_min/temp_max must be numeric")
+    for idx, tier_min in enumerate(tiers):
+        if idx in skipped:
             continue
-        if not 0.0 <= temp_min <= 1.0:
-            errors.append(f"Row {row_num}: temp_min {temp_min} outside 0-1 range")
-        if not 0.0 <= temp_max <= 1.0:
-            errors.append(f"Row {row_num}: temp_max {temp_max} outside 0-1 range")
-        if temp_min > temp_max:
-            errors.append(f"Row {row_num}: temp_min {temp_min} exceeds temp_max {temp_max}")
-
-        for field in [
-            "humidity_mean",
-            "humidity_swing",
-            "light_mean",
-            "light_swing",
-            "air_mean",
-            "air_swing",
-            "wind_mean",
-        ]:
-            try:
-                value = float(row.get(field, "0"))
-            except ValueError:
-                errors.append(f"Row {row_num}: {field} must be numeric")
-                continue
-            if not 0.0 <= value <= 1.0:
-                errors.append(f"Row {row_num}: {field} {value} outside 0-1 range")
-
-        try:
-            daylen = float(row.get("daylen", "0"))
-        except ValueError:
-            daylen = 0.0
-        if daylen < 120.0:
-            errors.append(f"Row {row_num}: daylen {daylen} below minimum 120s")
-
-        try:
-            tier_min = int(row.get("tier_min", "0"))
-        except ValueError:
-            errors.append(f"Row {row_num}: tier_min must be integer")
+        if idx in invalid:
+            found.append((idx, "tier_min must be integer"))
             tier_min = previous_tier
         if tier_min < 0:
-            errors.append(f"Row {row_num}: tier_min {tier_min} must be non-negative")
+            found.append((idx, f"tier_min {tier_min} must be non-negative"))
         if previous_tier != -1 and tier_min < previous_tier:
-            errors.append(f"Row {row_num}: tier_min {tier_min} lower than previous {previous_tier}")
+            found.append((idx, f"tier_min {tier_min} lower than previous {previous_tier}"))
         previous_tier = tier_min
-
-    return errors
+    return found
 
 
 def write_log(lines: List[str]) -> None:
@@ -205,62 +275,172 @@ def write_log(lines: List[str]) -> None:
         handle.write("\n".join(lines) + "\n")
 
 
+def validate_table(name: str, table: Table) -> List[str]:
+    headers = table.headers
+    errors: List[str] = []
+    errors += check_headers(headers)
+
+    critical_fields: Set[str] = set()
+    if "id" in headers:
+        critical_fields.add("id")
+        key_fields: Tuple[str, ...] = ("id",)
+    elif "profile_id" in headers:
+        critical_fields.add("profile_id")
+        key_fields = ("profile_id",)
+    elif "material_id" in headers:
+        critical_fields.add("material_id")
+        key_fields = ("material_id",)
+    else:
+        key_fields = ("id",)
+
+    if "tier" in headers:
+        critical_fields.add("tier")
+        if "tier" not in key_fields:
+            key_fields = key_fields + ("tier",)
+    errors += check_empty_cells(table, critical_fields)
+    errors += check_unique(table, key_fields)
+
+    if "requires" in headers:
+        graph = build_dependency_graph(table, key_fields[0], "requires")
+        has_cycle, cycle_path = detect_cycle(graph)
+        if has_cycle:
+            errors.append(f"Dependency cycle detected: {' -> '.join(cycle_path)}")
+
+    if name == "environment_profiles.tsv":
+        errors += validate_environment_profiles(table)
+    return errors
+
+
+def report_lines(table: pathlib.Path, errors: List[str]) -> List[str]:
+    if errors:
+        return [f"[{table}] validation errors:"] + [f"  - {err}" for err in errors]
+    return [f"[{table}] ✅ No schema issues found."]
+
+
+def validator_digest() -> str:
+    """Version key for cached results; changes whenever this script or a parser it uses changes."""
+    digest = hashlib.sha256()
+    for source in (__file__, tsv_loader.__file__, balance_tables.__file__):
+        digest.update(pathlib.Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """SQLite cache holding the last result of each table path.
+
+    A row is reused only when both the table's SHA-256 and the validator
+    digest match, so a hit returns exactly what a cold run would report.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.validator = validator_digest()
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "path TEXT PRIMARY KEY, digest TEXT NOT NULL, validator TEXT NOT NULL, errors TEXT NOT NULL)"
+        )
+
+    def lookup(self, table: pathlib.Path, digest: str) -> Optional[List[str]]:
+        row = self._conn.execute(
+            "SELECT errors FROM results WHERE path = ? AND digest = ? AND validator = ?",
+            (str(table), digest, self.validator),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, table: pathlib.Path, digest: str, errors: List[str]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (path, digest, validator, errors) VALUES (?, ?, ?, ?)",
+            (str(table), digest, self.validator, json.dumps(errors)),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.execute("DELETE FROM results WHERE validator != ?", (self.validator,))
+        self._conn.commit()
+        self._conn.close()
+
+
+def check_table(table: pathlib.Path, cache: Optional[ValidationCache] = None) -> List[str]:
+    """Report lines for one table, reusing the cached result when its bytes are unchanged."""
+    try:
+        data = table.read_bytes()
+    except FileNotFoundError:
+        return [f"[{table}] missing file."]
+    digest = hashlib.sha256(data).hexdigest()
+    errors = cache.lookup(table, digest) if cache is not None else None
+    if errors is None:
+        text = data.decode("utf-8")
+        if table.name == balance_tables.BALANCE_PATH.name:
+            sections, errors = balance_tables.parse_balance(text.splitlines())
+            errors += balance_tables.validate_balance(sections)
+        else:
+            errors = validate_table(table.name, parse_table(text, SCHEMAS.get(table.name)))
+        if cache is not None:
+            cache.store(table, digest, errors)
+    return report_lines(table, errors)
+
+
+def has_failures(lines: List[str]) -> bool:
+    return any("validation errors" in line for line in lines)
+
+
+class TableState(NamedTuple):
+    signature: Optional[Tuple[int, int]]
+    lines: List[str]
+
+
+def _signature(table: pathlib.Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(table)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot(table: pathlib.Path, cache: Optional[ValidationCache]) -> TableState:
+    # Stat before reading, so an edit that lands mid-read is picked up next poll.
+    signature = _signature(table)
+    return TableState(signature, check_table(table, cache))
+
+
+def watch(
+    tables: List[pathlib.Path], states: Dict[pathlib.Path, TableState], cache: Optional[ValidationCache], interval: float
+) -> int:
+    """Poll ``tables`` and re-validate only the ones whose size or mtime changed."""
+    print(f"[validate_tables] watching {len(tables)} table(s); Ctrl+C to stop.", flush=True)
+    try:
+        while True:
+            time.sleep(interval)
+            for table in tables:
+                if _signature(table) == states[table].signature:
+                    continue
+                states[table] = snapshot(table, cache)
+                write_log(states[table].lines)
+                for line in states[table].lines:
+                    print(line, flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 1 if any(has_failures(state.lines) for state in states.values()) else 0
+
+
 def main() -> int:
     args = parse_args()
     tables = [pathlib.Path(table.strip()) for table in args.tables.split(",") if table.strip()]
-    overall_errors: List[str] = []
-
-    for table in tables:
-        if not table.exists():
-            overall_errors.append(f"[{table}] missing file.")
-            continue
-        headers, rows = load_tsv(table)
-        errors: List[str] = []
-        errors += check_headers(headers)
-
-        critical_fields: Set[str] = set()
-        if "id" in headers:
-            critical_fields.add("id")
-            key_fields: Tuple[str, ...] = ("id",)
-        elif "profile_id" in headers:
-            critical_fields.add("profile_id")
-            key_fields = ("profile_id",)
-        elif "material_id" in headers:
-            critical_fields.add("material_id")
-            key_fields = ("material_id",)
-        else:
-            key_fields = ("id",)
-
-        if "tier" in headers:
-            critical_fields.add("tier")
-            if "tier" not in key_fields:
-                key_fields = key_fields + ("tier",)
-        errors += check_empty_cells(rows, critical_fields)
-        errors += check_unique(rows, key_fields)
-
-        if "requires" in headers:
-            graph = build_dependency_graph(rows, key_fields[0], "requires")
-            has_cycle, cycle_path = detect_cycle(graph)
-            if has_cycle:
-                errors.append(f"Dependency cycle detected: {' -> '.join(cycle_path)}")
-
-        if table.name == "environment_profiles.tsv":
-            errors += validate_environment_profiles(headers, rows)
-
-        if errors:
-            overall_errors.append(f"[{table}] validation errors:")
-            overall_errors.extend(f"  - {err}" for err in errors)
-        else:
-            overall_errors.append(f"[{table}] ✅ No schema issues found.")
+    cache = None if args.no_cache else ValidationCache(args.cache)
+    try:
+        states = {table: snapshot(table, cache) for table in tables}
+        overall_errors = [line for table in tables for line in states[table].lines]
 
-    write_log(overall_errors)
-    if any("validation errors" in line for line in overall_errors):
+        write_log(overall_errors)
         for line in overall_errors:
             print(line)
-        return 1
-    for line in overall_errors:
-        print(line)
-    return 0
+        if args.watch:
+            return watch(tables, states, cache, args.interval)
+        return 1 if has_failures(overall_errors) else 0
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":